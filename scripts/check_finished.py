@@ -1,28 +1,16 @@
 import os
 import sys
+from thermof.read import scan_run_status
 
 
 def check_finished(sim_dir, file_name='lammps_out.txt'):
-    dir_list = os.listdir(sim_dir)
-    if file_name in dir_list:
-        with open(os.path.join(sim_dir, file_name), 'r') as lout:
-            lammps_lines = lout.readlines()
-        if len(lammps_lines) > 0:
-            if 'Total wall time' in lammps_lines[-1]:
-                walltime = lammps_lines[-1].split()[-1]
-                print('%-20s -> finished in %s' % (os.path.basename(sim_dir), walltime))
-            elif any(['log' in f for f in dir_list]):
-                print('%-20s -> running' % os.path.basename(sim_dir))
-            else:
-                print('%-20s -> ERROR' % os.path.basename(sim_dir))
+    for status in scan_run_status(sim_dir, file_name=file_name):
+        if status['status'] == 'finished':
+            print('%-20s -> finished in %i:%02i:%02i' % (status['name'], *status['walltime']))
+        elif status['status'] == 'not found':
+            print('%-20s -> Lammps out file not found' % status['name'])
         else:
-            print('%-20s -> NOT started' % os.path.basename(sim_dir))
-    elif all([os.path.isdir(os.path.join(sim_dir, f)) for f in dir_list]):
-        print('########## %s ##########' % sim_dir)
-        for sdir in dir_list:
-            check_finished(os.path.join(sim_dir, sdir))
-    else:
-        print('%-20s -> Lammps out file not found' % os.path.basename(sim_dir))
+            print('%-20s -> %s' % (status['name'], status['status']))
 
 
 check_finished(sys.argv[-1])
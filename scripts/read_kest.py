@@ -5,15 +5,19 @@ import os
 import yaml
 from thermof.parameters import k_parameters
 from thermof.read import read_run_info, read_trial
+from thermof.store import ResultsStore, store_trial
 
 # --------------------------------------------------------------------------------------------------
 main = ''                                                           # Directory of trials
 results_file = '%s-kest-results.yaml' % os.path.basename(main)      # Name of results file
+results_dir = '%s-results' % os.path.basename(main)                 # Results store directory
 # --------------------------------------------------------------------------------------------------
 
 trial_list = [os.path.join(main, i) for i in os.listdir(main) if os.path.isdir(os.path.join(main, i))]
 results = dict(k=[], max=[], min=[], std=[], sigma=[], epsilon=[], trial=[])
 k_par = k_parameters.copy()
+k_par['read_info'] = True
+store = ResultsStore(results_dir)
 
 for trial_index, trial in enumerate(trial_list, start=1):
     trial_name = os.path.basename(trial)
@@ -26,7 +30,8 @@ for trial_index, trial in enumerate(trial_list, start=1):
 
     if trial_name not in ['S6.00-E0.80', 'S6.00-E1.00']:
         # sim = Simulation(read=trial, setup='trial', parameters=k_par)
-        trial = read_trial(trial, k_par=k_par, t0=5, t1=10, verbose=False)
+        trial = read_trial(os.path.join(main, trial_name), k_par=k_par, verbose=False)
+        store_trial(store, trial, os.path.join(main, trial_name))
         results['k'].append(trial['avg']['k_est']['iso'])
         results['max'].append(trial['avg']['k_est']['stats']['iso']['max'])
         results['min'].append(trial['avg']['k_est']['stats']['iso']['min'])
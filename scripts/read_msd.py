@@ -5,6 +5,7 @@ import os
 import yaml
 from thermof.trajectory import Trajectory
 from thermof.read import read_run_info
+from thermof.store import ResultsStore
 # --------------------------------------------------------------------------------------------------
 main = ''
 """
@@ -28,9 +29,11 @@ box2_atoms = [3818, 3882, 3810, 3874, 3817, 3881, 3809, 3873]
 ipbox_atoms = box1_atoms + box2_atoms
 
 results_file = '%s-MSD-results.yaml' % os.path.basename(main)
+results_dir = '%s-MSD-results' % os.path.basename(main)     # Results store directory
 # --------------------------------------------------------------------------------------------------
 trial_list = [os.path.join(main, i) for i in os.listdir(main) if os.path.isdir(os.path.join(main, i))]
 results = dict(msd1=[], msd2=[], msd=[], md1=[], md2=[], md=[], sigma=[], epsilon=[], trial=[])
+store = ResultsStore(results_dir)
 
 for trial_index, trial in enumerate(trial_list, start=1):
     trial_name = os.path.basename(trial)
@@ -87,6 +90,8 @@ for trial_index, trial in enumerate(trial_list, start=1):
     results['sigma'].append(run_info['sigma'])
     results['epsilon'].append(run_info['epsilon'])
     results['trial'].append(os.path.basename(trial))
+    row = {var: values[-1] for var, values in results.items() if var != 'trial'}
+    store.append([dict(row, path=os.path.abspath(trial), level='trial', name=trial_name)], overwrite=True)
 
 with open(results_file, 'w') as rfile:
     yaml.dump(results, rfile)
@@ -6,14 +6,17 @@ import yaml
 import numpy as np
 from thermof.parameters import k_parameters
 from thermof.read import read_run_info, read_thermo, read_log
+from thermof.store import ResultsStore
 
 # --------------------------------------------------------------------------------------------------
 main = ''                                                           # Directory of trials
 results_file = '%s-kest-results.yaml' % os.path.basename(main)      # Name of results file
+results_dir = '%s-thermo-results' % os.path.basename(main)          # Results store directory
 # --------------------------------------------------------------------------------------------------
 trial_list = [os.path.join(main, i) for i in os.listdir(main) if os.path.isdir(os.path.join(main, i))]
 results = dict(temp=[], press=[], e_pair=[], e_mol=[], tot_eng=[], epsilon=[], sigma=[], trial=[])
 k_par = k_parameters.copy()
+store = ResultsStore(results_dir)
 fix_list = ['NVE1', 'NVE2', 'NVT']
 var_list = ['e_pair', 'temp', 'e_mol', 'tot_eng', 'press']
 
@@ -51,6 +54,8 @@ for trial_index, trial in enumerate(trial_list, start=1):
     else:
         for var in var_list:
             results[var].append(None)
+    row = {var: values[-1] for var, values in results.items() if var != 'trial'}
+    store.append([dict(row, path=os.path.abspath(trial), level='trial', name=trial_name)], overwrite=True)
 
 with open(results_file, 'w') as rfile:
     yaml.dump(results, rfile)
@@ -19,6 +19,7 @@ setup(
         'console_scripts': [
             'thermof-read=thermof.cli.thermof_read:main',
             'thermof-write=thermof.cli.thermof_write:main',
+            'thermof-status=thermof.cli.thermof_status:main',
         ]
     }
 )
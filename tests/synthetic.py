@@ -0,0 +1,86 @@
+"""
+Synthetic Lammps output files for tests that do not depend on sample simulation data
+"""
+import os
+import numpy as np
+
+
+def write_correlation_file(file_path, n_blocks=3, n_rows=50, seed=0):
+    """Write a thermal flux autocorrelation file in Lammps fix ave/correlate format
+
+    Returns:
+        - int: Index of the first data line of the last block
+    """
+    rng = np.random.RandomState(seed)
+    with open(file_path, 'w') as f:
+        f.write('# Time-correlated data for fix JJTx\n# Timestep Number-of-time-windows\n')
+        f.write('# Index TimeDelta Ncount v_Jx*v_Jx\n')
+        for block in range(1, n_blocks + 1):
+            f.write('%i %i\n' % (block * n_rows * 5, n_rows))
+            decay = np.exp(-np.arange(n_rows) / (n_rows / 10))
+            for row in range(n_rows):
+                f.write('%i %i %i %.6e\n' % (row + 1, row * 5, block * 100, (decay[row] + 0.05 * rng.normal()) * 1e-11))
+    return 3 + (n_blocks - 1) * (n_rows + 1) + 1
+
+
+def write_run(run_dir, directions=['x', 'y', 'z'], n_blocks=2, n_rows=2500, seed=0):
+    """Write a Lammps run directory with thermal flux autocorrelation files for given directions"""
+    os.makedirs(run_dir)
+    for i, direction in enumerate(directions):
+        write_correlation_file(os.path.join(run_dir, 'J0Jt_t%s.dat' % direction),
+                               n_blocks=n_blocks, n_rows=n_rows, seed=seed * 10 + i)
+
+
+def write_flux_series(file_path, n_samples=2000, seed=0, sample_interval=5):
+    """Write raw heat flux time series in Lammps fix ave/time format (AR(1) process in each direction)
+
+    Returns:
+        - ndarray: Heat flux with shape (n_samples, 3)
+    """
+    rng = np.random.RandomState(seed)
+    noise = rng.normal(size=(n_samples, 3)) * 1e-6
+    flux = np.zeros((n_samples, 3))
+    for i in range(1, n_samples):
+        flux[i] = 0.9 * flux[i - 1] + noise[i]
+    with open(file_path, 'w') as f:
+        f.write('# Time-averaged data for fix JT\n# TimeStep v_Jx v_Jy v_Jz\n')
+        for i, j in enumerate(flux):
+            f.write('%i %.10e %.10e %.10e\n' % (i * sample_interval, j[0], j[1], j[2]))
+    return np.loadtxt(file_path, usecols=(1, 2, 3))
+
+
+def write_trial(trial_dir, n_runs=4, seed=0, **kwargs):
+    """Write a Lammps trial directory with multiple runs named Run1, Run2, ..."""
+    for run in range(1, n_runs + 1):
+        write_run(os.path.join(trial_dir, 'Run%i' % run), seed=seed * 100 + run, **kwargs)
+
+
+def write_xyz(traj_path, n_frames=10, n_atoms=20, cell=[20, 20, 20], atoms=None, seed=0):
+    """Write a Lammps xyz trajectory with atoms vibrating around random positions in an orthorhombic cell
+
+    Returns:
+        - numpy.ndarray: Coordinates with shape (n_frames, n_atoms, 3) as written to the file
+    """
+    rng = np.random.RandomState(seed)
+    if atoms is None:
+        atoms = [str(i % 2 + 1) for i in range(n_atoms)]
+    positions = rng.uniform(0, 1, size=(n_atoms, 3)) * cell
+    coordinates = (positions + rng.normal(scale=0.5, size=(n_frames, n_atoms, 3))) % cell
+    coordinates = np.round(coordinates, 4)
+    with open(traj_path, 'w') as traj:
+        for frame in range(n_frames):
+            traj.write('%i\nAtoms. Timestep: %i\n' % (n_atoms, frame * 100))
+            for atom, coor in zip(atoms, coordinates[frame]):
+                traj.write('%s %.4f %.4f %.4f\n' % (atom, coor[0], coor[1], coor[2]))
+    return coordinates
+
+
+def write_log(file_path, volume=512000, n_lines=5, seed=0):
+    """Write a Lammps log file with a single thermo block (Step Temp Volume) ending with the given volume"""
+    rng = np.random.RandomState(seed)
+    with open(file_path, 'w') as f:
+        f.write('LAMMPS (5 Sep 2017)\nStep Temp Volume \n')
+        for i in range(n_lines):
+            vol = volume if i == n_lines - 1 else volume * (1 + 0.01 * rng.normal())
+            f.write('%i %.4f %.4f \n' % (i * 100, 300 + rng.normal(), vol))
+        f.write('Loop time of 1.5 on 1 procs for %i steps with 10 atoms\n\n' % ((n_lines - 1) * 100))
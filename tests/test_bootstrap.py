@@ -0,0 +1,56 @@
+"""
+Tests bootstrap confidence intervals for trial thermal conductivity estimates
+"""
+import os
+import numpy as np
+from thermof.stats import bootstrap_runs, block_bootstrap, normal_quantile
+from thermof.read import read_trial
+from thermof.parameters import k_parameters
+from .synthetic import write_flux_series
+
+
+def test_normal_quantile():
+    """ Test standard normal quantiles used for confidence bands """
+    assert np.isclose(normal_quantile(0.975), 1.959963984540054)
+    assert np.isclose(normal_quantile(0.995), 2.5758293035489)
+    assert np.isclose(normal_quantile(0.01), -2.326347874040841)
+    assert abs(normal_quantile(0.5)) < 1e-12
+
+
+def test_bootstrap_runs_matches_loop():
+    """ Test batched bootstrap over runs against resampling runs one at a time """
+    k_est = np.random.RandomState(3).normal(loc=1.0, scale=0.2, size=(10, 4))
+    boot = bootstrap_runs(k_est, n_resamples=500, confidence=0.9, seed=7)
+    counts = np.random.RandomState(7).multinomial(10, np.full(10, 0.1), size=500)
+    resampled = np.array([np.mean(np.repeat(k_est, c, axis=0), axis=0) for c in counts])
+    assert np.allclose(boot['mean'], np.mean(k_est, axis=0))
+    assert np.allclose(boot['se'], np.std(resampled, axis=0, ddof=1))
+    assert np.allclose(boot['ci_low'], np.percentile(resampled, 5, axis=0))
+    assert np.allclose(boot['ci_high'], np.percentile(resampled, 95, axis=0))
+    assert np.all(boot['ci_low'] < boot['mean']) and np.all(boot['mean'] < boot['ci_high'])
+
+
+def test_block_bootstrap_is_stratified_by_run():
+    """ Test blocks are only resampled within runs (no spread for identical blocks in each run) """
+    k_est_blocks = np.repeat(np.array([1.0, 2.0, 3.0])[:, np.newaxis, np.newaxis], 5, axis=1)
+    boot = block_bootstrap(k_est_blocks, n_resamples=200, seed=0)
+    assert np.allclose(boot['mean'], [2.0]) and np.allclose(boot['se'], [0.0])
+    assert np.allclose(boot['ci_low'], [2.0]) and np.allclose(boot['ci_high'], [2.0])
+
+
+def test_read_trial_with_bootstrap(tmpdir):
+    """ Test trial uncertainty from runs and HCACF blocks of flux series """
+    trial_dir = tmpdir.mkdir('Trial')
+    for run in range(1, 4):
+        run_dir = trial_dir.mkdir('Run%i' % run).strpath
+        write_flux_series(os.path.join(run_dir, 'J_t.dat'), n_samples=8000, seed=run)
+    k_par = dict(k_parameters, flux_series='J_t.dat', correlation_length=2001, n_blocks=4, bootstrap=True, t1=8,
+                 n_resamples=1000, bootstrap_seed=0)
+    trial = read_trial(trial_dir.strpath, k_par=k_par, verbose=False)
+    assert len(trial['data']['Run1']['k_est_blocks']['iso']) == 4
+    uncertainty = trial['uncertainty']
+    assert sorted(uncertainty['runs'].keys()) == ['iso', 'x', 'y', 'z']
+    for level in ['runs', 'blocks']:
+        iso = uncertainty[level]['iso']
+        assert np.isclose(iso['mean'], trial['avg']['k_est']['iso'])
+        assert iso['ci_low'] <= iso['mean'] <= iso['ci_high']
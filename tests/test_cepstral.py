@@ -0,0 +1,47 @@
+"""
+Tests cepstral analysis of heat flux power spectrum
+"""
+import os
+import math
+import numpy as np
+from thermof.cepstral import digamma, trigamma, cepstral_flux
+from thermof.read import read_run
+from thermof.parameters import k_parameters
+from .synthetic import write_flux_series
+
+
+def test_polygamma_closed_form():
+    """ Test digamma and trigamma for integers and half-integers against known values """
+    assert np.isclose(digamma(1), -0.5772156649015329)
+    assert np.isclose(digamma(0.5), -1.9635100260214235)
+    assert np.isclose(digamma(1.5), 0.03648997397857652)
+    assert np.isclose(trigamma(1), math.pi ** 2 / 6)
+    assert np.isclose(trigamma(1.5), 0.9348022005446793)
+    assert np.isclose(trigamma(3), 0.3949340668482264)
+
+
+def test_cepstral_ar1_spectrum():
+    """ Test zero frequency spectrum of AR(1) flux series (1 / (1 - phi)^2) within statistical error """
+    rng = np.random.RandomState(0)
+    noise = rng.normal(size=(20000, 3))
+    flux = np.zeros(noise.shape)
+    for i in range(1, len(flux)):
+        flux[i] = 0.9 * flux[i - 1] + noise[i]
+    cepstral = cepstral_flux(flux, cutoff=0.2)
+    assert cepstral['s0'].shape == (4, )
+    assert np.all(np.abs(cepstral['s0'] - 100) < 4 * cepstral['s0_err'])
+    assert cepstral['s0_err'][3] < np.min(cepstral['s0_err'][:3])
+
+
+def test_read_run_cepstral(tmpdir):
+    """ Test cepstral k estimate with statistical error from flux series of a run """
+    write_flux_series(os.path.join(tmpdir.strpath, 'J_t.dat'), n_samples=20000, seed=1)
+    k_par = dict(k_parameters, flux_series='J_t.dat', correlation_length=501, k_est_method='cepstral',
+                 cepstral_cutoff=0.2)
+    run_data = read_run(tmpdir.strpath, k_par=k_par, verbose=False)
+    scale = k_par['volume'] * k_par['dt'] / (k_par['kb'] * math.pow(k_par['temp'], 2)) * k_par['conv'] / 2
+    k_true = 1e-12 / (1 - 0.9) ** 2 * scale
+    for direction in ['x', 'y', 'z', 'iso']:
+        assert abs(run_data['k_est'][direction] - k_true) < 4 * run_data['k_err'][direction]
+        assert run_data['n_cepstral'][direction] >= 1
+    assert len(run_data['k']['iso']) == 501
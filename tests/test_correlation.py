@@ -0,0 +1,77 @@
+"""
+Tests calculating heat current autocorrelation from raw heat flux time series
+"""
+import os
+import numpy as np
+from thermof.correlation import autocorrelation, block_autocorrelation, cross_correlation
+from thermof.read import calculate_hcacf, read_run, calculate_k
+from thermof.parameters import k_parameters
+from .synthetic import write_flux_series
+
+
+def direct_autocorrelation(x, n_lags):
+    """ Running average of x(t) * x(t + m) over all time origins """
+    return np.array([np.mean(x[:len(x) - m] * x[m:]) for m in range(n_lags)])
+
+
+def test_autocorrelation_matches_direct_calculation():
+    """ Test FFT autocorrelation is equal to averaging over time origins for 1D and 2D series """
+    x = np.random.RandomState(0).normal(size=(301, 3))
+    assert np.allclose(autocorrelation(x[:, 0], 50), direct_autocorrelation(x[:, 0], 50))
+    acf = autocorrelation(x)
+    assert acf.shape == (301, 3)
+    assert np.allclose(acf[:, 2], direct_autocorrelation(x[:, 2], 301))
+
+
+def test_block_autocorrelation():
+    """ Test block averaged autocorrelation and standard error """
+    x = np.random.RandomState(1).normal(size=400)
+    mean, error = block_autocorrelation(x, n_lags=20, n_blocks=4)
+    blocks = [direct_autocorrelation(x[i * 100:(i + 1) * 100], 20) for i in range(4)]
+    assert np.allclose(mean, np.mean(blocks, axis=0))
+    assert np.allclose(error, np.std(blocks, axis=0, ddof=1) / 2)
+    mean, error = block_autocorrelation(x)
+    assert len(mean) == 400 and np.all(error == 0)
+
+
+def test_read_run_from_flux_series(tmpdir):
+    """ Test reading run with raw heat flux time series instead of autocorrelation files """
+    run_dir = tmpdir.mkdir('Run1').strpath
+    flux = write_flux_series(os.path.join(run_dir, 'J_t.dat'), n_samples=6000)
+    k_par = dict(k_parameters, flux_series='J_t.dat', correlation_length=2001, n_blocks=2)
+    run_data = read_run(run_dir, k_par=k_par, verbose=False)
+    assert run_data['directions'] == ['x', 'y', 'z']
+    assert len(run_data['time']) == 2001 and run_data['time'][1] == k_par['dt'] / 1000
+    hcacf, hcacf_err, time = calculate_hcacf(os.path.join(run_dir, 'J_t.dat'), correlation_length=2001, n_blocks=2)
+    assert run_data['hcacf']['y'] == hcacf['y'] and run_data['hcacf_err'] == hcacf_err
+    expected = (direct_autocorrelation(flux[:3000, 0], 2001) + direct_autocorrelation(flux[3000:, 0], 2001)) / 2
+    assert np.allclose(run_data['hcacf']['x'], expected)
+    assert run_data['k']['x'] == calculate_k(hcacf['x'], k_par=k_par)
+    assert 'iso' in run_data['k_est']
+
+
+def test_cross_correlation_matches_direct_calculation():
+    """ Test FFT cross-correlation of all pairs of time series against direct calculation """
+    x = np.random.RandomState(4).normal(size=(300, 3))
+    ccf = cross_correlation(x, n_lags=50)
+    assert ccf.shape == (50, 3, 3)
+    direct = np.array([np.mean(x[:300 - m, 0] * x[m:, 2]) for m in range(50)])
+    assert np.allclose(ccf[:, 0, 2], direct)
+    assert np.allclose(ccf[:, 1, 1], autocorrelation(x[:, 1], n_lags=50))
+
+
+def test_read_run_k_tensor(tmpdir):
+    """ Test thermal conductivity tensor and principal directions of anisotropic flux rotated around z """
+    run_dir = tmpdir.mkdir('Run1').strpath
+    flux = write_flux_series(os.path.join(run_dir, 'J_t.dat'), n_samples=20000, seed=5) * [1.0, 3.0, 1.0]
+    angle = np.pi / 6
+    rotation = np.array([[np.cos(angle), -np.sin(angle), 0], [np.sin(angle), np.cos(angle), 0], [0, 0, 1]])
+    rotated = flux @ rotation.T
+    np.savetxt(os.path.join(run_dir, 'J_t.dat'), np.column_stack([np.arange(20000) * 5, rotated]))
+    k_par = dict(k_parameters, flux_series='J_t.dat', correlation_length=2001, k_tensor=True, t0=1, t1=5)
+    run_data = read_run(run_dir, k_par=k_par, verbose=False)
+    k_tensor = run_data['k_tensor']
+    k_est = np.array(k_tensor['k_est'])
+    assert np.allclose(np.diag(k_est), [run_data['k_est'][d] for d in ['x', 'y', 'z']])
+    assert np.isclose(sum(k_tensor['eigenvalues']), np.trace(k_est))
+    assert abs(np.dot(k_tensor['principal_directions'][-1], rotation[:, 1])) > 0.95
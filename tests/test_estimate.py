@@ -0,0 +1,114 @@
+"""
+Tests automatic plateau detection for thermal conductivity estimation
+"""
+import pytest
+import numpy as np
+from thermof.estimate import time_window, first_dip, running_slope, estimate_plateau, PlateauMethodError
+from thermof.estimate import prefix_sums, window_average, window_scan
+from thermof.read import estimate_k, read_trial, estimate_trial_k, estimate_window_k, scan_trial_k
+from thermof.parameters import k_parameters
+from .synthetic import write_trial
+
+
+time = (np.arange(4000) * 0.005).tolist()
+
+
+def test_time_window_with_floating_point_times():
+    """ Test window lookup with inexact floating point times """
+    assert time_window(time, 5, 10) == (1000, 2000)
+    assert time_window([t * (1 + 1e-12) for t in time], 5, 10) == (1000, 2000)
+    k = np.random.RandomState(0).normal(size=4000).tolist()
+    assert estimate_k(k, time, t0=5, t1=10) == sum(k[1000:2000]) / 1000
+
+
+def test_time_window_out_of_range():
+    """ Test window times that are not simulation times are rejected """
+    k = np.ones(4000).tolist()
+    for t0, t1 in [(5, 25), (21, 30), (-1, 10), (5, 10.002)]:
+        with pytest.raises(ValueError):
+            time_window(time, t0, t1)
+        with pytest.raises(ValueError):
+            estimate_k(k, time, t0=t0, t1=t1)
+    assert time_window(time, 0, 19.995) == (0, 3999)
+
+
+def test_near_miss_window_times():
+    """ Test times between simulation samples are rejected by estimate and scan paths """
+    k = np.ones(4000)
+    for t0, t1 in [(5, 10.0001), (4.9999, 10)]:
+        with pytest.raises(ValueError):
+            estimate_k(k.tolist(), time, t0=t0, t1=t1)
+        with pytest.raises(ValueError):
+            window_scan(prefix_sums(k), time, [0, t0], [t1, 15])
+    assert np.allclose(window_scan(prefix_sums(k), time, [0, 5], [10, 15]), 1)
+
+
+def test_running_slope():
+    """ Test running mean and slope with prefix sums against least squares fit """
+    k = np.random.RandomState(1).normal(size=(2, 100))
+    t = np.arange(100) * 0.1
+    mean, slope = running_slope(k, t, 10)
+    assert mean.shape == (2, 91)
+    assert np.allclose(mean[1, 30], np.mean(k[1, 30:40]))
+    assert np.isclose(slope[0, 50], np.polyfit(t[50:60], k[0, 50:60], 1)[0])
+
+
+def test_estimate_plateau_for_multiple_runs():
+    """ Test plateau is detected for a saturating k curve for all series at once """
+    t = np.array(time)
+    plateau = np.array([[1.0], [2.0], [0.5]])
+    k = plateau * (1 - np.exp(-t / 1.5)) + 1e-4 * np.random.RandomState(2).normal(size=(3, len(t)))
+    k_est, window = estimate_plateau(k, time, method='slope', window=1.0, tol=0.01)
+    assert np.allclose(k_est, plateau[:, 0], rtol=0.02)
+    assert window.shape == (3, 2) and np.allclose(window[:, 1] - window[:, 0], 1.0)
+    k_single, window_single = estimate_plateau(k[1], time, method='slope', window=1.0, tol=0.01)
+    assert k_single == k_est[1] and np.array_equal(window_single, window[1])
+    k_dip = np.concatenate([np.linspace(0, 1, 50), np.linspace(1, 0.8, 50)])
+    assert first_dip(k_dip) == 49
+    k_est, window = estimate_plateau(k_dip, time[:100], method='first_dip')
+    assert k_est == 1 and window[0] == time[49]
+    with pytest.raises(PlateauMethodError):
+        estimate_plateau(k_dip, time[:100], method='fit')
+
+
+def test_read_trial_with_plateau_detection(tmpdir):
+    """ Test reading trial with automatic k estimation reports the selected window """
+    trial_dir = tmpdir.join('Trial').strpath
+    write_trial(trial_dir, n_runs=3)
+    k_par = dict(k_parameters, isotropic=True, k_est_method='slope')
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    run = trial['data']['Run1']
+    assert sorted(run['k_window'].keys()) == sorted(run['k_est'].keys())
+    estimates = estimate_trial_k(trial, method='slope')
+    i = estimates['directions'].index('iso')
+    assert np.isclose(estimates['k_est'][0, i], run['k_est']['iso'])
+    assert np.allclose(estimates['window'][0, i], run['k_window']['iso'])
+
+
+def test_window_scan_with_prefix_sums():
+    """ Test constant time window averages and window scan match estimate_k """
+    k = np.random.RandomState(2).normal(size=(2, 4000))
+    k_prefix = prefix_sums(k)
+    assert k_prefix.shape == (2, 4001)
+    assert np.allclose(window_average(k_prefix, time, 5, 10), [estimate_k(k[i].tolist(), time, 5, 10) for i in range(2)])
+    t0, t1 = [2, 5, 12], [4, 10, 15, 19]
+    k_scan = window_scan(k_prefix, time, t0, t1)
+    assert k_scan.shape == (2, 3, 4)
+    assert np.isclose(k_scan[1, 1, 2], estimate_k(k[1].tolist(), time, 5, 15))
+    assert np.isnan(k_scan[0, 2, 0]) and np.isnan(k_scan[0, 2, 1])
+
+
+def test_scan_trial_k(tmpdir):
+    """ Test scanning averaging windows for all runs of a trial with stored prefix sums """
+    trial_dir = tmpdir.join('Trial').strpath
+    write_trial(trial_dir, n_runs=3)
+    k_par = dict(k_parameters, isotropic=True, prefix_sums=True)
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    run = trial['data']['Run2']
+    assert sorted(run['k_prefix'].keys()) == sorted(run['k'].keys())
+    assert np.isclose(estimate_window_k(run, 5, 10, direction='iso'), run['k_est']['iso'])
+    k_scan = scan_trial_k(trial, [0, 5], [10, 12])
+    assert k_scan['k_est'].shape == (3, len(k_scan['directions']), 2, 2)
+    i = k_scan['directions'].index('x')
+    assert np.isclose(k_scan['k_est'][1, i, 1, 0], run['k_est']['x'])
+    assert np.allclose(scan_trial_k(read_trial(trial_dir, verbose=False), [0, 5], [10, 12])['k_est'], k_scan['k_est'])
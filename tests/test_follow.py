@@ -0,0 +1,59 @@
+"""
+Tests following running Lammps simulations
+"""
+import os
+import numpy as np
+from thermof.follow import FileTail, RunFollower
+from thermof.read import read_run, parse_log
+from thermof.parameters import k_parameters
+from .synthetic import write_correlation_file
+
+
+def test_file_tail_partial_lines(tmpdir):
+    """ Test only complete appended lines are returned and truncated files are read again """
+    file_path = tmpdir.join('log.lammps').strpath
+    tail = FileTail(file_path)
+    assert tail.read_lines() == ([], False)
+    with open(file_path, 'w') as f:
+        f.write('line 1\nline')
+    assert tail.read_lines() == (['line 1\n'], False)
+    with open(file_path, 'a') as f:
+        f.write(' 2\n')
+    assert tail.read_lines() == (['line 2\n'], False)
+    with open(file_path, 'w') as f:
+        f.write('new\n')
+    assert tail.read_lines() == (['new\n'], True)
+
+
+def test_run_follower(tmpdir):
+    """ Test following a run while log and thermal flux files are written """
+    run_dir = tmpdir.mkdir('Run1').strpath
+    full_flux = tmpdir.join('J0Jt_tx.dat').strpath
+    write_correlation_file(full_flux, n_blocks=2, n_rows=2500)
+    with open(full_flux, 'r') as f:
+        flux_lines = f.readlines()
+    log_lines = ['LAMMPS\n', 'Step Temp E_pair E_mol TotEng Press \n'] + \
+                ['%i %i 0 1 2 3\n' % (i * 10, 300 + i) for i in range(20)] + \
+                ['Loop time of 1.5 on 2 procs for 190 steps with 5 atoms\n']
+    k_par = dict(k_parameters, fix=['NVT', 'NVE'], log_file='log.lammps', isotropic=True)
+    follower = RunFollower(run_dir, k_par=k_par)
+    with open(os.path.join(run_dir, 'log.lammps'), 'w') as log, open(os.path.join(run_dir, 'J0Jt_tx.dat'), 'w') as flux:
+        log.writelines(log_lines[:12])
+        log.write('100 310 0')
+        flux.writelines(flux_lines[:2504 + 100])            # First block and part of the second
+        log.flush(), flux.flush()
+        run_data = follower.poll()
+        assert run_data['thermo']['NVT']['temp'].tolist() == list(range(300, 310)) and not run_data['finished']
+        first_block = run_data['k']['x']
+        assert len(first_block) == 2500 and run_data['k']['iso'] == first_block
+        log.write(' 1 2 3\n')
+        log.writelines(log_lines[13:] + log_lines[1:5] + log_lines[-1:] + ['Total wall time: 0:00:02\n'])
+        flux.writelines(flux_lines[2504 + 100:])
+    run_data = follower.poll()
+    assert run_data['finished'] and run_data['walltime'] == [0, 0, 2]
+    assert run_data['thermo']['NVT']['temp'].tolist() == list(range(300, 320))
+    assert run_data['thermo']['NVE']['step'].tolist() == [0, 10, 20]
+    complete = read_run(run_dir, k_par=k_par, verbose=False)
+    assert run_data['k']['x'] == complete['k']['x'] != first_block
+    assert np.isclose(run_data['k_est']['iso'], complete['k_est']['iso'])
+    assert len(list(follower.follow(interval=0))) == 1
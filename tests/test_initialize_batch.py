@@ -0,0 +1,64 @@
+"""
+Tests parallel batch initialization of Lammps simulations
+"""
+import os
+import json
+import shutil
+import pytest
+from thermof.initialize.batch import batch_initialize
+from thermof.sample import mof5_file
+
+
+def test_batch_initialize_reuses_typed_files(tmpdir):
+    """ Test simulations that only differ in thermof parameters reuse cached lammps_interface files """
+    cif_dir = tmpdir.mkdir('cifs')
+    shutil.copy(mof5_file, cif_dir.strpath)
+    simdir = tmpdir.join('sims').strpath
+    manifest = batch_initialize(os.path.join(cif_dir.strpath, '*.cif'), simdir, grid={'thermof.seed': [1, 2]},
+                                workers=1, verbose=False)
+    assert [s['status'] for s in manifest] == ['initialized', 'initialized']
+    assert [s['cached'] for s in manifest] == [False, True]
+    assert [os.path.basename(s['simdir']) for s in manifest] == ['MOF5-1', 'MOF5-2']
+    with open(os.path.join(simdir, 'manifest.json'), 'r') as f:
+        assert json.load(f) == manifest
+    data_files = [open(os.path.join(simdir, sim, 'data.MOF5')).read() for sim in ['MOF5-1', 'MOF5-2']]
+    assert data_files[0] == data_files[1]
+    inputs = [open(os.path.join(simdir, sim, 'in.MOF5')).read() for sim in ['MOF5-1', 'MOF5-2']]
+    assert 'seed equal 1\n' in inputs[0] and 'seed equal 2\n' in inputs[1]
+    manifest = batch_initialize([os.path.join(cif_dir.strpath, 'missing.cif')], simdir, verbose=False)
+    assert manifest[0]['status'] == 'error'
+
+
+def test_initialize_runs_share_data_file(tmpdir):
+    """ Test runs share a single data file with hard links or relative read_data path """
+    from thermof.simulation import Simulation
+    from thermof.parameters import Parameters
+    cache_dir = tmpdir.join('cache').strpath
+    for share_data in ['link', 'relative']:
+        sim = Simulation(mof=mof5_file, parameters=Parameters())
+        sim.verbose = False
+        sim.simdir = tmpdir.join(share_data).strpath
+        sim.initialize_runs(2, cache_dir=cache_dir, share_data=share_data)
+        inputs = [open(os.path.join(sim.simdir, run, 'in.MOF5')).read() for run in ['1', '2']]
+        assert 'seed equal 123457\n' in inputs[0] and 'seed equal 123458\n' in inputs[1]
+        if share_data == 'link':
+            assert sorted(os.listdir(sim.simdir)) == ['1', '2']
+            assert os.stat(os.path.join(sim.simdir, '1', 'data.MOF5')).st_nlink == 2
+            assert 'read_data       data.MOF5\n' in inputs[0]
+        else:
+            assert sorted(os.listdir(sim.simdir)) == ['1', '2', 'data.MOF5']
+            assert not os.path.exists(os.path.join(sim.simdir, '1', 'data.MOF5'))
+            assert 'read_data       ../data.MOF5\n' in inputs[0]
+
+
+def test_share_data_file_slurm_scratch(tmpdir):
+    """ Test relative data file is rejected for slurm-scratch jobs and hard links keep a data file in the run """
+    from thermof.initialize.lammps import share_data_file, ShareDataError
+    data_file = tmpdir.join('data.MOF5')
+    data_file.write('data')
+    run_dir = tmpdir.mkdir('1').strpath
+    with pytest.raises(ShareDataError):
+        share_data_file(data_file.strpath, run_dir, share_data='relative', scheduler='slurm-scratch')
+    assert share_data_file(data_file.strpath, run_dir, share_data='relative', scheduler='slurm') == data_file.strpath
+    run_data_file = share_data_file(data_file.strpath, run_dir, share_data='link', scheduler='slurm-scratch')
+    assert run_data_file == os.path.join(run_dir, 'data.MOF5') and open(run_data_file).read() == 'data'
@@ -0,0 +1,90 @@
+"""
+Tests caching parsed run data on disk
+"""
+import os
+import numpy as np
+import thermof.read
+from thermof.read import read_run, read_trial
+from thermof.cache import RunCache, flatten, unflatten
+from thermof.parameters import k_parameters
+from .synthetic import write_run, write_trial, write_correlation_file, write_log
+
+
+def test_flatten_unflatten_nested_dictionary():
+    """Tests nested dictionaries are restored after flattening to arrays"""
+    data = dict(name='Run1', k=dict(x=[0.1, 0.2], iso=np.arange(3.0)), walltime=[1, 2, 3], empty={},
+                thermo={0: dict(step=[0.0, 10.0])}, directions=['x', 'y'], k_est=dict(x=0.5), none=None)
+    restored = unflatten(flatten(data))
+    assert restored['name'] == 'Run1' and restored['walltime'] == [1, 2, 3]
+    assert restored['k']['x'] == [0.1, 0.2] and np.allclose(restored['k']['iso'], np.arange(3.0))
+    assert restored['thermo'] == {0: dict(step=[0.0, 10.0])}
+    assert restored['directions'] == ['x', 'y'] and restored['k_est'] == dict(x=0.5)
+    assert restored['empty'] == {} and restored['none'] is None
+
+
+def test_flatten_object_values(tmpdir):
+    """Tests values that would be pickled by numpy are stored as json and load without pickle"""
+    data = dict(info=dict(runs=[dict(seed=1, T=300.0), dict(seed=2)], mixed=[1, 'a'], ragged=[[1, 2], [3]]))
+    assert all([a.dtype != object for a in flatten(data).values()])
+    cache = RunCache(tmpdir.join('cache').strpath)
+    cache.save('run', data)
+    assert cache.load('run') == data
+
+
+def test_read_run_cache(tmpdir, monkeypatch):
+    """Tests reading a run from cache and invalidating the cache when files change"""
+    run_dir = tmpdir.join('Run1').strpath
+    write_run(run_dir)
+    k_par = k_parameters.copy()
+    k_par['cache'] = tmpdir.join('cache').strpath
+    run_data = read_run(run_dir, k_par=k_par, verbose=False)
+    assert len(RunCache(k_par['cache'])) == 1
+
+    def read_thermal_flux_error(*args, **kwargs):
+        raise AssertionError('Flux file parsed for cached run')
+    with monkeypatch.context() as m:
+        m.setattr(thermof.read, 'read_thermal_flux', read_thermal_flux_error)
+        assert read_run(run_dir, k_par=k_par, verbose=False) == run_data
+
+    write_correlation_file(os.path.join(run_dir, 'J0Jt_tx.dat'), n_blocks=2, n_rows=2500, seed=42)
+    new_run_data = read_run(run_dir, k_par=k_par, verbose=False)
+    assert new_run_data['k']['x'] != run_data['k']['x']
+    assert new_run_data['k']['y'] == run_data['k']['y']
+    k_par['t1'] = 8
+    assert read_run(run_dir, k_par=k_par, verbose=False)['k_est']['x'] != new_run_data['k_est']['x']
+    assert len(RunCache(k_par['cache'])) == 3
+
+
+def test_run_cache_size_limit(tmpdir):
+    """Tests least recently used entries are removed when the cache is full"""
+    trial_dir = tmpdir.join('trial').strpath
+    write_trial(trial_dir, n_runs=3)
+    k_par = k_parameters.copy()
+    k_par['cache'] = tmpdir.join('cache').strpath
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    cache = RunCache(k_par['cache'])
+    entry_size = max([os.path.getsize(f) for f in cache.entries()]) / 1e6
+    cache.max_size = entry_size * 2.5
+    cache.evict()
+    assert len(cache) == 2
+    assert read_trial(trial_dir, k_par=k_par, verbose=False) == trial
+
+
+def test_read_trial_cache_with_volume(tmpdir, monkeypatch):
+    """Tests cache keys do not depend on volume updated from log files of previously read runs"""
+    trial_dir = tmpdir.join('trial').strpath
+    write_trial(trial_dir, n_runs=3)
+    for run in range(1, 4):
+        write_log(os.path.join(trial_dir, 'Run%i' % run, 'log.lammps'), volume=500000 + run * 1000, seed=run)
+    k_par = dict(k_parameters, cache=tmpdir.join('cache').strpath, read_thermo=True, fix=None,
+                 thermo_style=['step', 'temp', 'vol'])
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    assert trial['data']['Run3']['thermo'][0]['vol'][-1] == 503000
+
+    def read_thermal_flux_error(*args, **kwargs):
+        raise AssertionError('Flux file parsed for cached run')
+    with monkeypatch.context() as m:
+        m.setattr(thermof.read, 'read_thermal_flux', read_thermal_flux_error)
+        assert read_trial(trial_dir, k_par=k_par, verbose=False) == trial
+    read_trial(trial_dir, k_par=dict(k_par, fix=None, volume=k_parameters['volume']), verbose=False, workers=2)
+    assert len(RunCache(k_par['cache'])) == 3
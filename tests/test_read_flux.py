@@ -5,9 +5,10 @@ import os
 import pytest
 import yaml
 import numpy as np
-from thermof.read import read_thermal_flux, calculate_k, estimate_k, average_k, get_flux_directions
+from thermof.read import read_thermal_flux, calculate_k, estimate_k, average_k, get_flux_directions, find_last_block
 from thermof.read import FluxFileNotFoundError, TimestepsMismatchError
 from thermof.parameters import k_parameters
+from .synthetic import write_correlation_file
 
 
 flux_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'thermal-flux.dat')
@@ -70,3 +71,36 @@ def test_average_k_exception():
     k_runs = [k_ref, k_ref[:10], k_ref[5:]]
     with pytest.raises(TimestepsMismatchError):
         average_k(k_runs)
+
+
+def test_read_thermal_flux_array_matches_list(tmpdir):
+    """Tests numpy arrays and lists returned by read_thermal_flux and calculate_k are identical"""
+    flux_path = tmpdir.join('J0Jt_tx.dat').strpath
+    start = write_correlation_file(flux_path)
+    flux, time = read_thermal_flux(flux_path, start=start)
+    flux_arr, time_arr = read_thermal_flux(flux_path, start=start, array=True)
+    assert isinstance(flux_arr, np.ndarray) and isinstance(time_arr, np.ndarray)
+    assert flux == flux_arr.tolist() and time == time_arr.tolist()
+    assert len(flux) == 50 and time[1] == 0.005
+    k_par = k_parameters.copy()
+    k_prefactor = k_par['volume'] * k_par['dt'] / (k_par['kb'] * k_par['temp'] ** 2) * k_par['conv']
+    k_ref = [flux[0] / 2 * k_par['volume'] * k_par['dt'] / (k_par['kb'] * k_par['temp'] ** 2) * k_par['conv']]
+    for J in flux[1:]:
+        k_ref.append(k_ref[-1] + J * k_par['volume'] * k_par['dt'] / (k_par['kb'] * k_par['temp'] ** 2) * k_par['conv'])
+    assert calculate_k(flux, k_par=k_par) == k_ref
+    assert calculate_k(flux_arr, k_par=k_par, array=True).tolist() == k_ref
+    assert np.isclose(k_ref[-1], k_prefactor * (sum(flux) - flux[0] / 2))
+
+
+def test_read_thermal_flux_last_block(tmpdir):
+    """Tests reading the last correlation block without a starting line index"""
+    flux_path = tmpdir.join('J0Jt_tx.dat').strpath
+    start = write_correlation_file(flux_path, n_blocks=4, n_rows=120, seed=1)
+    flux_ref, time_ref = read_thermal_flux(flux_path, start=start)
+    flux, time = read_thermal_flux(flux_path)
+    assert flux == flux_ref and time == time_ref
+    for chunk_size in [7, 64, 1000, 100000]:
+        offset, n_rows = find_last_block(flux_path, chunk_size=chunk_size)
+        assert n_rows == 120
+        with open(flux_path, 'r') as f:
+            assert len(f.read()[:offset].split('\n')) - 1 == start
@@ -0,0 +1,67 @@
+"""
+Tests reading Lammps log files
+"""
+import os
+import shutil
+import yaml
+import numpy as np
+from thermof.read import read_log, read_thermo, parse_log, LogParser, read_run
+from thermof.parameters import k_parameters
+from .synthetic import write_run
+
+
+trial_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'ideal-mof-trial')
+log_file = os.path.join(trial_dir, 'Run1', 'log.lammps')
+thermo_ref_file = os.path.join(trial_dir, 'Run1', 'thermo.yaml')
+thermo_style = ['step', 'temp', 'epair', 'emol', 'etotal', 'press']
+
+
+def test_parse_log_matches_read_thermo():
+    """Tests streaming log parser gives the same thermo data as read_log and read_thermo"""
+    fix = ['NVT', 'NVE1', 'NVE2']
+    thermo_ref = read_thermo(read_log(log_file), headers=thermo_style, fix=fix)
+    for chunk_size in [7, 10000]:
+        log_data = parse_log(log_file, thermo_style=thermo_style, fix=fix, chunk_size=chunk_size)
+        assert set(log_data['thermo'].keys()) == set(fix)
+        for f in fix:
+            for h in thermo_style:
+                assert isinstance(log_data['thermo'][f][h], np.ndarray)
+                assert log_data['thermo'][f][h].tolist() == thermo_ref[f][h]
+    with open(thermo_ref_file, 'r') as tref:
+        thermo_yaml = yaml.load(tref)
+    assert log_data['thermo']['NVT']['temp'].tolist() == thermo_yaml['NVT']['temp']
+    assert log_data['loop']['time'] == [73.0042, 70.3212, 479.041]
+    assert log_data['loop']['steps'] == [300000, 300000, 1000000]
+    assert log_data['loop']['procs'] == [8, 8, 8] and log_data['loop']['atoms'] == [3584] * 3
+    assert log_data['walltime'] is None
+
+
+def test_log_parser_running_simulation():
+    """Tests parsing walltime, performance and an unfinished thermo block"""
+    log_parser = LogParser(headers='Step Temp E_pair E_mol TotEng Press')
+    lines = ['Step Temp E_pair E_mol TotEng Press \n', '0 300 0 1 2 3\n', 'WARNING: Something\n', '10 301 0 1 2 3\n']
+    for line in lines:
+        log_parser.feed(line)
+    assert log_parser.result()['thermo'] == {}
+    assert log_parser.result(running=True)['thermo'][0]['temp'].tolist() == [300, 301]
+    for line in ['Loop time of 1.5 on 2 procs for 10 steps with 5 atoms\n',
+                 'Performance: 0.864 ns/day, 27.778 hours/ns, 10.000 timesteps/s\n',
+                 'Total wall time: 1:02:03\n']:
+        log_parser.feed(line)
+    log_data = log_parser.result(fix=['NVE'])
+    assert log_data['thermo']['NVE']['step'].tolist() == [0, 10]
+    assert log_data['walltime'] == [1, 2, 3]
+    assert log_data['performance'] == ['0.864 ns/day, 27.778 hours/ns, 10.000 timesteps/s']
+
+
+def test_read_run_thermo_with_log_parser(tmpdir):
+    """Tests thermo data read by read_run is returned as lists"""
+    run_dir = tmpdir.join('Run1').strpath
+    write_run(run_dir, directions=['x'])
+    shutil.copy(log_file, run_dir)
+    k_par = k_parameters.copy()
+    k_par['read_thermo'] = True
+    run_data = read_run(run_dir, k_par=k_par, verbose=False)
+    with open(thermo_ref_file, 'r') as tref:
+        thermo_yaml = yaml.load(tref)
+    assert run_data['thermo'] == thermo_yaml
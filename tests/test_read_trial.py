@@ -2,10 +2,14 @@
 Tests reading thermal flux and calculating thermal conductivity for trials with multiple runs
 """
 import os
+import json
+import shutil
 import yaml
 import numpy as np
-from thermof.read import read_trial
+from thermof.read import read_trial, read_trial_set
 from thermof.parameters import k_parameters
+from thermof.cache import RunCache
+from .synthetic import write_trial, write_log
 
 
 k_ref_file = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'thermal-conductivity.yaml')
@@ -34,3 +38,111 @@ def test_read_trial():
     assert np.isclose(trial['avg']['k_est']['stats']['iso']['std'], np.std(k_est_iso_ref))
     assert np.isclose(trial['avg']['k_est']['stats']['iso']['max'], max(k_est_iso_ref))
     assert np.isclose(trial['avg']['k_est']['stats']['iso']['min'], min(k_est_iso_ref))
+
+
+def test_read_trial_parallel(tmpdir):
+    """Test reading runs of a trial in parallel gives the same results as reading serially"""
+    trial_path = tmpdir.join('trial').strpath
+    write_trial(trial_path, n_runs=4)
+    k_par = k_parameters.copy()
+    trial = read_trial(trial_path, k_par=k_par, verbose=False)
+    trial_parallel = read_trial(trial_path, k_par=k_par, verbose=False, workers=2)
+    assert trial_parallel['errors'] == {}
+    assert trial_parallel['runs'] == trial['runs']
+    assert trial_parallel['data'] == trial['data']
+    assert trial_parallel['avg'] == trial['avg']
+
+
+def test_read_trial_set_parallel_captures_errors(tmpdir):
+    """Test a broken run does not stop reading a trial set in parallel"""
+    for t in range(2):
+        write_trial(tmpdir.join('trial%i' % t).strpath, n_runs=3, seed=t)
+    os.makedirs(tmpdir.join('trial1', 'Run4').strpath)
+    k_par = k_parameters.copy()
+    trial_set = read_trial_set(tmpdir.strpath, k_par=k_par, verbose=False, workers=3)
+    assert sorted(trial_set['trials']) == ['trial0', 'trial1']
+    assert trial_set['data']['trial0']['errors'] == {}
+    assert list(trial_set['data']['trial1']['errors'].keys()) == ['Run4']
+    assert 'FluxFileNotFoundError' in trial_set['data']['trial1']['errors']['Run4']
+    assert sorted(trial_set['data']['trial1']['runs']) == ['Run1', 'Run2', 'Run3']
+    serial_trial = read_trial(tmpdir.join('trial0').strpath, k_par=k_par, verbose=False)
+    assert trial_set['data']['trial0']['data'] == serial_trial['data']
+
+
+def test_trial_batch_statistics(tmpdir):
+    """Test batch statistics and averages across runs are equal to per timestep calculation"""
+    trial_dir = tmpdir.join('Trial').strpath
+    write_trial(trial_dir, n_runs=5)
+    k_par = dict(k_parameters, isotropic=True, average=True, batch_stats=True)
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    stats = trial['stats']
+    assert sorted(stats['directions'][:3]) == ['x', 'y', 'z'] and stats['directions'][3] == 'iso'
+    assert len(stats['runs']) == 5
+    for i, direction in enumerate(stats['directions']):
+        k_runs = [trial['data'][run]['k'][direction] for run in trial['runs']]
+        avg_k = [sum([k[t] for k in k_runs]) / len(k_runs) for t in range(len(k_runs[0]))]
+        assert trial['avg']['k'][direction] == avg_k
+        assert np.array_equal(stats['mean'][i], avg_k)
+        assert np.allclose(stats['std'][i], np.std(k_runs, axis=0))
+        assert np.array_equal(stats['max'][i], np.max(k_runs, axis=0))
+        assert np.allclose(stats['sem'][i], np.std(k_runs, axis=0, ddof=1) / np.sqrt(5))
+        assert np.allclose(stats['ci_high'][i] - stats['mean'][i], 1.959964 * stats['sem'][i])
+
+
+def test_read_trial_set_incremental(tmpdir, capsys):
+    """Test incremental read only parses new or modified runs and gives the same results as a full read"""
+    for t in range(2):
+        write_trial(tmpdir.join('trial%i' % t).strpath, n_runs=2, seed=t)
+    k_par = k_parameters.copy()
+    trial_set = read_trial_set(tmpdir.strpath, k_par=k_par, verbose=True, incremental=True)
+    assert 'new: 4 | modified: 0 | unchanged: 0 | removed: 0' in capsys.readouterr().out
+    assert os.path.exists(tmpdir.join('.thermof-cache', 'manifest.json').strpath)
+    write_trial(tmpdir.join('trial2').strpath, n_runs=1, seed=2)
+    with open(tmpdir.join('trial0', 'Run1', 'J0Jt_tx.dat').strpath, 'a') as f:
+        f.write('\n')
+    shutil.rmtree(tmpdir.join('trial1', 'Run2').strpath)
+    trial_set = read_trial_set(tmpdir.strpath, k_par=k_par, verbose=True, incremental=True)
+    output = capsys.readouterr().out
+    assert 'new: 1 | modified: 1 | unchanged: 2 | removed: 1' in output
+    assert output.count('Read from cache') == 2
+    assert trial_set['trials'] == ['trial0', 'trial1', 'trial2']
+    full_read = read_trial_set(tmpdir.strpath, k_par=k_par, verbose=False)
+    assert full_read['trials'] == trial_set['trials']
+    for trial in full_read['trials']:
+        assert full_read['data'][trial]['data'] == trial_set['data'][trial]['data']
+        assert full_read['data'][trial]['avg'] == trial_set['data'][trial]['avg']
+
+
+def test_read_trial_incremental_with_volume(tmpdir, capsys):
+    """Test incremental read with volume read from log files keeps one cache entry for each run"""
+    trial_dir = tmpdir.join('trial').strpath
+    write_trial(trial_dir, n_runs=3)
+    for run in range(1, 4):
+        write_log(os.path.join(trial_dir, 'Run%i' % run, 'log.lammps'), volume=500000 + run * 1000, seed=run)
+    k_par = dict(k_parameters, read_thermo=True, fix=None, thermo_style=['step', 'temp', 'vol'])
+    read_trial(trial_dir, k_par=k_par, verbose=True, incremental=True)
+    assert 'new: 3 | modified: 0 | unchanged: 0' in capsys.readouterr().out
+    read_trial(trial_dir, k_par=k_par, verbose=True, incremental=True)
+    assert 'new: 0 | modified: 0 | unchanged: 3' in capsys.readouterr().out
+    write_log(os.path.join(trial_dir, 'Run2', 'log.lammps'), volume=510000, seed=5)
+    read_trial(trial_dir, k_par=k_par, verbose=True, incremental=True)
+    assert 'new: 0 | modified: 1 | unchanged: 2' in capsys.readouterr().out
+    cache = RunCache(os.path.join(trial_dir, '.thermof-cache'))
+    with open(os.path.join(cache.cache_dir, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    assert sorted([cache.path(key) for key in manifest.values()]) == sorted(cache.entries())
+
+
+def test_read_trial_parallel_updates_volume(tmpdir):
+    """Test reading runs in parallel updates volume in calculation parameters the same way as a serial read"""
+    trial_dir = tmpdir.join('trial').strpath
+    write_trial(trial_dir, n_runs=3)
+    for run in range(1, 4):
+        write_log(os.path.join(trial_dir, 'Run%i' % run, 'log.lammps'), volume=500000 + run * 1000, seed=run)
+    k_par_serial = dict(k_parameters, read_thermo=True, fix=None, thermo_style=['step', 'temp', 'vol'])
+    k_par_parallel = dict(k_par_serial)
+    serial = read_trial(trial_dir, k_par=k_par_serial, verbose=False)
+    parallel = read_trial(trial_dir, k_par=k_par_parallel, verbose=False, workers=2)
+    assert k_par_parallel == k_par_serial and k_par_serial['volume'] == 503000
+    assert serial['data'] == parallel['data']
+    assert [serial['data']['Run%i' % run]['volume'] for run in range(1, 4)] == [501000, 502000, 503000]
@@ -0,0 +1,79 @@
+"""
+Tests columnar results store for screening simulations
+"""
+import os
+import yaml
+import shutil
+import numpy as np
+from thermof.read import read_trial, read_run_info
+from thermof.store import ResultsStore, store_trial
+from thermof.parameters import k_parameters
+from .synthetic import write_trial, write_run
+
+
+def write_run_info(run_dir, sigma, epsilon):
+    with open(os.path.join(run_dir, 'run_info.yaml'), 'w') as f:
+        yaml.dump(dict(sigma=sigma, epsilon=epsilon, info='synthetic', seed=1), f)
+
+
+def test_results_store_append_and_query(tmpdir):
+    """ Test appending trials and runs, skipping stored rows and querying columns """
+    trial_dir = tmpdir.join('S4.00-E0.20').strpath
+    write_trial(trial_dir, n_runs=3)
+    for run in os.listdir(trial_dir):
+        write_run_info(os.path.join(trial_dir, run), 4.0, 0.2)
+    assert read_run_info(os.path.join(trial_dir, 'Run1'))['sigma'] == 4.0
+    k_par = dict(k_parameters, read_info=True)
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    store = ResultsStore(tmpdir.join('results').strpath)
+    assert store_trial(store, trial, trial_dir) == 4
+    assert store_trial(store, trial, trial_dir) == 0
+    # Newly finished run is appended incrementally
+    write_run(os.path.join(trial_dir, 'Run4'), seed=4)
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    assert store_trial(store, trial, trial_dir) == 2
+    store = ResultsStore(tmpdir.join('results').strpath)
+    assert len(store) == 5 and len(store.index['segments']) == 2
+    runs = store.query(['name', 'k_est_iso', 'info_sigma'], where={'level': 'run'})
+    assert sorted(runs['name']) == ['Run1', 'Run2', 'Run3', 'Run4']
+    k_est = dict(zip(runs['name'], runs['k_est_iso']))
+    assert all([k_est[run] == trial['data'][run]['k_est']['iso'] for run in trial['runs']])
+    assert np.isnan(runs['info_sigma'][list(runs['name']).index('Run4')])
+    trials = store.query(['k_est_iso', 'info_epsilon', 'n_runs'], where={'level': 'trial'})
+    assert len(trials['n_runs']) == 1 and trials['info_epsilon'][0] == 0.2 and trials['n_runs'][0] == 4
+    assert trials['k_est_iso'][0] == trial['avg']['k_est']['iso']
+    store.compact()
+    assert len(store.index['segments']) == 1 and len(store) == 5 and store.index['deleted'] == []
+    assert np.array_equal(store.query(['k_est_iso'], where={'level': 'run'})['k_est_iso'], runs['k_est_iso'])
+
+
+def test_results_store_overwrite(tmpdir):
+    """ Test overwriting rows replaces stored rows with the same key """
+    store = ResultsStore(tmpdir.join('results').strpath)
+    assert store.append([dict(path='a', k=1.0), dict(path='b', k=2.0)]) == 2
+    assert store.append([dict(path='a', k=3.0), dict(path='a', k=4.0), dict(path='c', k=5.0)], overwrite=True) == 2
+    assert len(store) == 3 and 'a' in store
+    data = store.query(['path', 'k'])
+    assert dict(zip(data['path'], data['k'])) == dict(a=4.0, b=2.0, c=5.0) and len(data['path']) == 3
+    assert list(store.query(['k'], where={'path': 'a'})['k']) == [4.0]
+    store.compact()
+    assert ResultsStore(store.store_dir).index['keys'] == ['b', 'a', 'c']
+
+
+def test_store_trial_changed_run(tmpdir):
+    """ Test rows of runs with changed results and their trial are replaced """
+    trial_dir = tmpdir.join('S4.00-E0.20').strpath
+    write_trial(trial_dir, n_runs=3)
+    trial = read_trial(trial_dir, k_par=k_parameters, verbose=False)
+    store = ResultsStore(tmpdir.join('results').strpath)
+    assert store_trial(store, trial, trial_dir) == 4
+    # Run2 is rerun with different results
+    shutil.rmtree(os.path.join(trial_dir, 'Run2'))
+    write_run(os.path.join(trial_dir, 'Run2'), seed=12)
+    trial = read_trial(trial_dir, k_par=k_parameters, verbose=False)
+    assert store_trial(store, trial, trial_dir) == 2
+    assert store_trial(store, trial, trial_dir) == 0
+    assert len(store) == 4
+    runs = store.query(['name', 'k_est_iso'], where={'level': 'run'})
+    assert dict(zip(runs['name'], runs['k_est_iso'])) == {run: trial['data'][run]['k_est']['iso'] for run in trial['runs']}
+    assert list(store.query(['k_est_iso'], where={'level': 'trial'})['k_est_iso']) == [trial['avg']['k_est']['iso']]
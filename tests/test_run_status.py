@@ -0,0 +1,45 @@
+"""
+Tests checking status of Lammps simulations from the end of output files
+"""
+import os
+import pytest
+from thermof.read import read_tail, read_walltime, read_run_status, scan_run_status, WallTimeNotFoundError
+
+
+def write_output(run_dir, lines, file_name='lammps_out.txt'):
+    """Write Lammps output file with given lines"""
+    os.makedirs(run_dir, exist_ok=True)
+    with open(os.path.join(run_dir, file_name), 'w') as f:
+        f.write(''.join(lines))
+
+
+def test_read_tail_and_walltime(tmpdir):
+    """Tests reading last lines of a file and wall time of a finished simulation"""
+    lines = ['%i 300.0 1.0 2.0\n' % i for i in range(5000)] + ['Total wall time: 12:05:09\n']
+    write_output(tmpdir.strpath, lines, file_name='log.lammps')
+    log_file = tmpdir.join('log.lammps').strpath
+    assert read_tail(log_file, size=100) == lines[-len(read_tail(log_file, size=100)):]
+    assert read_tail(log_file, size=10 ** 6) == lines
+    assert read_walltime(log_file) == [12, 5, 9]
+    write_output(tmpdir.strpath, lines[:-1], file_name='log.lammps')
+    with pytest.raises(WallTimeNotFoundError):
+        read_walltime(log_file)
+
+
+def test_run_status(tmpdir):
+    """Tests status for finished, running, not started, error and missing simulations"""
+    write_output(tmpdir.join('set', 'finished').strpath, ['Step\n'] * 1000 + ['Total wall time: 1:02:03\n'])
+    write_output(tmpdir.join('set', 'running').strpath, ['Step\n'] * 1000)
+    write_output(tmpdir.join('set', 'running').strpath, ['Step\n'], file_name='log.lammps')
+    write_output(tmpdir.join('set', 'not-started').strpath, [])
+    write_output(tmpdir.join('set', 'error').strpath, ['ERROR: Lost atoms\n'])
+    write_output(tmpdir.join('set', 'missing').strpath, [], file_name='in.MOF5')
+    write_output(tmpdir.join('set', 'missing').strpath, [], file_name='job.MOF5')
+    os.makedirs(tmpdir.join('set', 'plots').strpath)
+    write_output(tmpdir.join('set', 'results').strpath, ['k: 1.0\n'], file_name='kest.yaml')
+    status = read_run_status(tmpdir.join('set', 'finished').strpath)
+    assert status['status'] == 'finished' and status['walltime'] == [1, 2, 3]
+    assert status['last_line'] == 'Total wall time: 1:02:03'
+    status_list = scan_run_status(tmpdir.join('set').strpath, workers=2)
+    assert [s['name'] for s in status_list] == ['error', 'finished', 'missing', 'not-started', 'running']
+    assert [s['status'] for s in status_list] == ['error', 'finished', 'not found', 'not started', 'running']
@@ -60,3 +60,11 @@ def test_simulation_read_trial_set():
     assert trial_set == sim.trial_set
     assert len(sim) == 4
     assert str(sim) == 'ideal-mof-trial-set'
+
+
+def test_simulation_statistics_run_setup():
+    """Test statistics and spectrum are not available for a single run"""
+    sim = Simulation(parameters=Parameters())
+    sim.setup = 'run'
+    assert sim.statistics() is None
+    assert sim.spectrum() is None
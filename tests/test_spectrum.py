@@ -0,0 +1,57 @@
+"""
+Tests frequency resolved thermal conductivity from HCACF spectra
+"""
+import os
+import pytest
+import numpy as np
+from thermof.spectrum import hcacf_spectrum, cumulative_spectrum, SpectrumError
+from thermof.read import calculate_k, read_trial
+from thermof.parameters import k_parameters
+from .synthetic import write_trial, write_log
+
+
+def test_hcacf_spectrum():
+    """ Test k(0) against integrated k, batched spectra against single curves and peak frequency """
+    time = np.arange(2000) * 0.005
+    hcacf = np.array([np.exp(-time / tau) * np.cos(2 * np.pi * f * time) for tau, f in [(1.0, 5.0), (2.0, 12.0)]])
+    k_par = dict(k_parameters)
+    scale = k_par['volume'] * k_par['dt'] / (k_par['kb'] * k_par['temp'] ** 2) * k_par['conv']
+    frequency, k_omega = hcacf_spectrum(hcacf, 0.005, scale=scale, window='rectangular', padding=2)
+    assert k_omega.shape == (2, len(frequency)) and np.isclose(frequency[-1], 100.0)
+    assert np.allclose(k_omega[:, 0], [calculate_k(h, k_par=k_par)[-1] for h in hcacf])
+    for curve, k in zip(hcacf, k_omega):
+        assert np.allclose(hcacf_spectrum(curve, 0.005, scale=scale, window='rectangular', padding=2)[1], k)
+    assert np.allclose(frequency[np.argmax(k_omega, axis=1)], [5.0, 12.0], atol=0.1)
+    cumulative = cumulative_spectrum(*hcacf_spectrum(hcacf, 0.005, window='hann'))
+    assert np.allclose(cumulative[:, 0], 0) and np.allclose(cumulative[:, -1], 1)
+    with pytest.raises(SpectrumError):
+        hcacf_spectrum(hcacf, 0.005, window='gaussian')
+
+
+def test_read_trial_with_spectrum(tmpdir):
+    """ Test k(w) of all runs and directions of a trial averaged across runs """
+    trial_dir = os.path.join(tmpdir.strpath, 'Trial')
+    write_trial(trial_dir, n_runs=3)
+    k_par = dict(k_parameters, spectrum=True, spectrum_window='hamming', spectrum_padding=2, isotropic=True)
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False)
+    spectrum = trial['spectrum']
+    assert sorted(spectrum['directions'][:3]) == ['x', 'y', 'z'] and spectrum['directions'][3] == 'iso'
+    assert spectrum['k_omega'].shape == (3, 4, len(spectrum['frequency']))
+    assert np.allclose(spectrum['mean']['k_omega'], np.mean(spectrum['k_omega'], axis=0))
+    assert np.allclose(spectrum['mean']['cumulative'][:, -1], 1)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_read_trial_spectrum_run_volume(tmpdir, workers):
+    """ Test k(0) of each run is scaled with the volume of that run (serial and parallel read) """
+    trial_dir = os.path.join(tmpdir.strpath, 'Trial')
+    write_trial(trial_dir, n_runs=3)
+    for run in range(1, 4):
+        write_log(os.path.join(trial_dir, 'Run%i' % run, 'log.lammps'), volume=500000 + run * 10000, seed=run)
+    k_par = dict(k_parameters, spectrum=True, spectrum_window='rectangular', read_thermo=True, fix=None,
+                 thermo_style=['step', 'temp', 'vol'])
+    trial = read_trial(trial_dir, k_par=k_par, verbose=False, workers=workers)
+    spectrum = trial['spectrum']
+    for run_idx, run in enumerate(spectrum['runs']):
+        k_end = [trial['data'][run]['k'][d][-1] for d in spectrum['directions']]
+        assert np.allclose(spectrum['k_omega'][run_idx, :, 0], k_end)
@@ -0,0 +1,43 @@
+"""
+Tests rendering Lammps input templates
+"""
+import pytest
+from copy import deepcopy
+from thermof.initialize.template import Template, TemplateSyntaxError, TemplateKeyError
+from thermof.initialize.lammps import get_nve_lines, get_min_lines, render_input_lines
+from thermof.parameters import Parameters
+
+
+def test_template_render():
+    """ Test rendering placeholders, nested values, lists and conditional blocks """
+    template = Template('run {{nve.steps:%i}}\nthermo_style custom {{style}}\n#@if restart\nwrite_restart r.nve\n#@endif\n'
+                        '#@if not restart\nunfix NVE\n#@endif\nT equal {{T:%.1f}}')
+    context = dict(nve=dict(steps=1000.0), style=['step', 'temp'], restart=False, T=300)
+    assert template.render(context) == ['run 1000\n', 'thermo_style custom step temp\n', 'unfix NVE\n', 'T equal 300.0']
+    renders = template.render_all([context, dict(context, restart=True)])
+    assert renders[1][2] == 'write_restart r.nve\n'
+    assert len(renders[1]) == 4
+    with pytest.raises(TemplateKeyError):
+        template.render(dict(context, nve={}))
+    with pytest.raises(TemplateSyntaxError):
+        Template('#@if restart\nrun 10\n')
+    with pytest.raises(TemplateSyntaxError):
+        Template('run 10\n#@endif\n')
+
+
+def test_render_lammps_fix_lines():
+    """ Test rendering Lammps fix templates without equilibration and with restart """
+    simpar = deepcopy(Parameters().thermof)
+    simpar['atom_list'] = ['C', 'H', 'O', 'Zn']
+    simpar['mof'] = dict(name='MOF5')
+    simpar['nve'].update(equilibration=-1, steps=2000)
+    simpar['min']['restart'] = True
+    nve_lines = get_nve_lines(simpar)
+    assert nve_lines[0] == '### Thermal flux calculation in NVE ###\n'
+    assert nve_lines[-1] == 'run             2000\n'
+    min_lines = get_min_lines(simpar)
+    assert min_lines[-1] == 'write_restart   restart.min\n'
+    assert 'file MOF5.min.csv' in min_lines[2]
+    simpar_list = [dict(simpar, seed=seed) for seed in [1, 2, 3]]
+    input_lines = render_input_lines(simpar_list)
+    assert ['variable        seed equal %i\n' % seed in lines for seed, lines in zip([1, 2, 3], input_lines)] == [True] * 3
@@ -0,0 +1,71 @@
+"""
+Tests converting xyz trajectories to binary format and reading with memory mapping.
+"""
+import pytest
+import numpy as np
+from thermof import Trajectory
+from thermof.trajectory import convert_trajectory
+from thermof.trajectory.trajectory import LazyTrajectoryError
+from .synthetic import write_xyz
+
+
+def test_convert_trajectory_to_binary(tmpdir):
+    """ Test binary trajectory has the same coordinates, atoms and timesteps with xyz trajectory """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    coordinates = write_xyz(traj_path, n_frames=12, n_atoms=15)
+    binary_path = convert_trajectory(traj_path, dtype='float64')
+    assert binary_path == traj_path + '.bin'
+    traj = Trajectory(read=traj_path)
+    traj_bin = Trajectory(read=binary_path)
+    assert isinstance(traj_bin.coordinates, np.memmap)
+    assert (traj_bin.n_frames, traj_bin.n_atoms, traj_bin.n_dimensions) == (12, 15, 3)
+    assert np.array_equal(traj_bin.coordinates, coordinates)
+    assert traj_bin.timestep == traj.timestep
+    assert traj_bin.atoms == traj.atoms and traj.atoms == traj_bin.atoms
+    assert traj_bin.atoms[3] == traj.atoms[3]
+    assert traj_bin == traj
+
+
+def test_trajectory_convert_method(tmpdir):
+    """ Test converting trajectory and writing xyz from binary trajectory """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    write_xyz(traj_path, n_frames=5, n_atoms=8)
+    traj = Trajectory(read=traj_path)
+    traj.convert(binary_path=tmpdir.join('traj-bin').strpath)
+    assert traj.coordinates.dtype == np.float32
+    assert not hasattr(traj, 'xyz')
+    assert np.allclose(traj.coordinates, Trajectory(read=traj_path).coordinates)
+    traj.write(tmpdir.join('traj-bin.xyz').strpath)
+    assert Trajectory(read=tmpdir.join('traj-bin.xyz').strpath) == traj
+
+
+def test_convert_trajectory_without_trailing_newline(tmpdir):
+    """ Test last frame is converted when the xyz file does not end with a newline """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    coordinates = write_xyz(traj_path, n_frames=4, n_atoms=6)
+    with open(traj_path, 'r') as traj:
+        lines = traj.read()
+    with open(traj_path, 'w') as traj:
+        traj.write(lines.rstrip('\n'))
+    traj_bin = Trajectory(read=convert_trajectory(traj_path, dtype='float64'))
+    assert traj_bin.n_frames == 4 and np.array_equal(traj_bin.coordinates, coordinates)
+    assert traj_bin.timestep[-1] == '300'
+
+
+def test_binary_trajectory_stretch_and_change_atoms(tmpdir):
+    """ Test stretching and changing atoms of memory mapped and lazy trajectories """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    write_xyz(traj_path, n_frames=5, n_atoms=8)
+    traj = Trajectory(read=traj_path)
+    traj_bin = Trajectory(read=convert_trajectory(traj_path, dtype='float64'))
+    traj_lazy = Trajectory(read=traj_path, lazy=True)
+    assert traj_bin == traj and traj_lazy == traj_bin
+    assert traj_lazy.stretch(2) == traj.stretch(2)
+    traj_bin.stretch(2, write=tmpdir.join('traj-stretch.xyz').strpath)
+    traj_stretch = Trajectory(read=tmpdir.join('traj-stretch.xyz').strpath)
+    assert traj_stretch == traj[[0, 0, 1, 1, 2, 2, 3, 3, 4, 4]]
+    traj.change_atoms({'1': 'C', '2': 'O'})
+    traj_bin.change_atoms({'1': 'C', '2': 'O'})
+    assert traj_bin.atoms == traj.atoms and traj_bin == traj
+    with pytest.raises(LazyTrajectoryError):
+        traj_lazy.change_atoms({'1': 'C', '2': 'O'})
@@ -54,3 +54,39 @@ def test_calculate_distances_with_trajectory_calculate_distances(max_dist=5):
     traj.calculate_distances()
     distances = calculate_distances(traj.coordinates, [80, 80, 80], reference_frame=0)
     assert np.allclose(traj.distances, distances)
+
+
+def loop_distances(coordinates, unit_cell, reference_frame=0):
+    """ Reference implementation wrapping each displacement component separately """
+    distances = np.zeros(np.shape(coordinates)[:2])
+    for frame_idx, frame in enumerate(coordinates):
+        for atom_idx, (atom, ref_atom) in enumerate(zip(frame, coordinates[reference_frame])):
+            d = [0, 0, 0]
+            for i in range(3):
+                d[i] = atom[i] - ref_atom[i]
+                if d[i] > unit_cell[i] * 0.5:
+                    d[i] = d[i] - unit_cell[i]
+                elif d[i] <= -unit_cell[i] * 0.5:
+                    d[i] = d[i] + unit_cell[i]
+            distances[frame_idx][atom_idx] = np.sqrt((d[0] ** 2 + d[1] ** 2 + d[2] ** 2))
+    return distances
+
+
+def test_calculate_distances_periodic_wrapping():
+    """ Test vectorized distances are identical to wrapping each component separately (with and without chunks) """
+    cell = [10, 12, 14]
+    coordinates = np.random.RandomState(0).uniform(0, 1, (20, 15, 3)) * cell
+    coordinates[1, 0] = coordinates[0, 0] + [5, -6, 7]        # Exactly half cell displacements
+    distances = loop_distances(coordinates, cell, reference_frame=2)
+    assert np.array_equal(calculate_distances(coordinates, cell, reference_frame=2), distances)
+    assert np.array_equal(calculate_distances(coordinates, cell, reference_frame=2, chunk_size=7), distances)
+    assert np.all(distances <= np.sqrt(np.sum(np.square(cell))) / 2)
+
+
+def test_calculate_distances_triclinic_cell():
+    """ Test triclinic distances for diagonal cell matrix and a sheared cell """
+    coordinates = np.random.RandomState(1).uniform(0, 10, (8, 6, 3)).tolist()
+    assert np.allclose(calculate_distances(coordinates, np.diag([10, 10, 10])), loop_distances(coordinates, [10, 10, 10]))
+    cell = np.array([[10, 0, 0], [5, 10, 0], [0, 0, 10]])
+    coordinates = [[[1, 1, 1]], [[1, 1, 1]], [[6, 11, 1]], [[2.5, 1, 1]]]
+    assert np.allclose(calculate_distances(coordinates, cell), [[0], [0], [0], [1.5]])
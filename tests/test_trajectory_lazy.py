@@ -0,0 +1,78 @@
+"""
+Tests lazy frame indexed reading of xyz trajectories.
+"""
+import os
+import pytest
+import numpy as np
+from thermof import Trajectory
+from thermof.trajectory.io import index_trajectory, read_frames
+from .synthetic import write_xyz
+
+
+def test_lazy_trajectory_slicing(tmpdir):
+    """ Test selecting frames of lazy trajectory gives the same result with reading the whole trajectory """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    coordinates = write_xyz(traj_path, n_frames=25, n_atoms=12)
+    traj = Trajectory(read=traj_path)
+    traj_lazy = Trajectory(read=traj_path, lazy=True)
+    assert not hasattr(traj_lazy, 'coordinates')
+    assert (traj_lazy.n_frames, traj_lazy.n_atoms, traj_lazy.n_dimensions) == (25, 12, 3)
+    assert np.allclose(traj_lazy[3], coordinates[3]) and np.allclose(traj_lazy[-1], coordinates[-1])
+    frames = list(range(2, 20, 3))
+    traj_div = traj_lazy[2:20:3]
+    assert traj_div == traj.subdivide(frames=frames)
+    assert traj_div.timestep == [traj.timestep[f] for f in frames]
+    assert traj_div.xyz == [traj.xyz[f] for f in frames]
+    atoms, dimensions = [0, 4, 7], [0, 2]
+    traj_div = traj_lazy.subdivide(frames=[1, 5], atoms=atoms, dimensions=dimensions)
+    assert traj_div == traj.subdivide(frames=[1, 5], atoms=atoms, dimensions=dimensions)
+    assert not hasattr(traj_div, 'xyz')
+    assert all([np.allclose(c, coordinates[i]) for i, c in enumerate(traj_lazy)])
+
+
+def test_trajectory_index_reused(tmpdir):
+    """ Test trajectory index is saved and invalidated when the trajectory is modified """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    write_xyz(traj_path, n_frames=6, n_atoms=5)
+    index = index_trajectory(traj_path, chunk_size=64)
+    assert os.path.exists(traj_path + '.idx.npz')
+    assert len(index['offsets']) == 7 and index['offsets'][-1] == os.path.getsize(traj_path)
+    assert np.array_equal(index_trajectory(traj_path)['offsets'], index['offsets'])
+    coordinates = write_xyz(traj_path, n_frames=9, n_atoms=5, seed=1)
+    os.utime(traj_path, ns=(0, 0))
+    index = index_trajectory(traj_path)
+    assert len(index['offsets']) == 10
+    assert np.allclose(read_frames(traj_path, [8], index=index)['coordinates'][0], coordinates[8])
+
+
+def test_lazy_trajectory_analysis(tmpdir):
+    """ Test analyses of lazy trajectory read frames on demand and match reading the whole trajectory """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    write_xyz(traj_path, n_frames=12, n_atoms=8, atoms=['C', 'O'] * 4)
+    traj = Trajectory(read=traj_path)
+    traj_lazy = Trajectory(read=traj_path, lazy=True)
+    for t in [traj, traj_lazy]:
+        t.set_cell([20, 20, 20])
+        t.calculate_com(chunk_size=5)
+        t.calculate_distances(reference_frame=2, chunk_size=5)
+        t.calculate_msd(groups={'a': [0, 3, 5], 'b': [7, 1]})
+    assert np.allclose(traj_lazy.com, traj.com)
+    assert np.allclose(traj_lazy.distances, traj.distances)
+    assert all([np.allclose(traj_lazy.msd[g], traj.msd[g]) for g in ['a', 'b']])
+    traj.calculate_msd()
+    traj_lazy.calculate_msd(chunk_size=3)
+    assert np.allclose(traj_lazy.msd, traj.msd)
+    traj_lazy.convert()
+    assert not traj_lazy.lazy
+    assert np.allclose(traj_lazy[1], traj[1]) and traj_lazy.subdivide(frames=[0, 3]).n_frames == 2
+
+
+def test_read_frames_atom_index(tmpdir):
+    """ Test negative atom indices count from the last atom and out of range atoms raise IndexError """
+    traj_path = tmpdir.join('traj.xyz').strpath
+    coordinates = write_xyz(traj_path, n_frames=3, n_atoms=6)
+    frames = read_frames(traj_path, [0, 2], atoms=[-1, 0, -6])
+    assert np.allclose(frames['coordinates'], coordinates[[0, 2]][:, [5, 0, 0]])
+    for atoms in [[6], [-7]]:
+        with pytest.raises(IndexError):
+            read_frames(traj_path, [0], atoms=atoms)
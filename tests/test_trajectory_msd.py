@@ -0,0 +1,37 @@
+"""
+Tests multiple time origin mean squared displacement calculation.
+"""
+import numpy as np
+from thermof import Trajectory
+from thermof.trajectory.tools import calculate_msd, unwrap_coordinates
+
+
+def direct_msd(coordinates):
+    """ Average squared displacement over all time origins and atoms for each time lag """
+    n_frames = len(coordinates)
+    return np.array([np.mean(np.sum((coordinates[m:] - coordinates[:n_frames - m]) ** 2, axis=2)) for m in range(n_frames)])
+
+
+def test_calculate_msd_matches_direct_calculation():
+    """ Test FFT MSD with atom chunks and groups is equal to direct average over time origins """
+    coordinates = np.cumsum(np.random.RandomState(0).normal(0, 0.3, (50, 7, 3)), axis=0)
+    msd = calculate_msd(coordinates, chunk_size=3)
+    assert np.allclose(msd, direct_msd(coordinates)) and np.isclose(msd[0], 0)
+    msd = calculate_msd(coordinates, groups={'a': [0, 2], 'b': [6, 1, 3]})
+    assert np.allclose(msd['a'], direct_msd(coordinates[:, [0, 2]]))
+    assert np.allclose(msd['b'], direct_msd(coordinates[:, [6, 1, 3]]))
+
+
+def test_trajectory_msd_unwraps_periodic_jumps():
+    """ Test MSD of atoms moving linearly across periodic boundaries of orthorhombic and triclinic cells """
+    n_frames, cell = 30, [10, 10, 10]
+    unwrapped = np.array([[[0.5 * i, 0.4 * i, 0.1]] for i in range(n_frames)])
+    traj = Trajectory()
+    traj.coordinates = np.mod(unwrapped, cell)
+    traj.n_frames, traj.n_atoms, traj.n_dimensions = n_frames, 1, 3
+    traj.set_cell(cell)
+    traj.calculate_msd()
+    assert np.allclose(traj.msd, 0.41 * np.arange(n_frames) ** 2)
+    tri_cell = np.array([[10, 0, 0], [3, 10, 0], [0, 0, 10]])
+    frac = np.mod(unwrapped @ np.linalg.inv(tri_cell), 1)
+    assert np.allclose(unwrap_coordinates(frac @ tri_cell, tri_cell), unwrapped)
@@ -24,3 +24,32 @@ def test_trajectory_subdivide_method_example_case():
     assert div_traj.atoms == [frame[10:20] for frame in traj.atoms[5:10]]
     assert np.allclose(div_traj.coordinates[0][0], traj.coordinates[5][10][1:])
     assert np.allclose(div_traj.coordinates[4][3], traj.coordinates[9][13][1:])
+
+
+def test_subdivide_coordinates_views_and_fancy_indexing():
+    """ Test subdivision returns views for evenly spaced selections and matches element-wise selection """
+    from thermof.trajectory.tools import subdivide_coordinates
+    coordinates = np.random.RandomState(0).uniform(0, 10, (12, 8, 3))
+    div_coor = subdivide_coordinates(coordinates, list(range(2, 10, 2)), list(range(1, 5)), None)
+    assert np.shares_memory(div_coor, coordinates)
+    assert np.array_equal(div_coor, coordinates[2:10:2, 1:5])
+    frames, atoms, dimensions = [7, 1, 1, 4], [5, 0, 2], [2, 0]
+    div_coor = subdivide_coordinates(coordinates.tolist(), frames, atoms, dimensions)
+    expected = [[[coordinates[f][a][d] for d in dimensions] for a in atoms] for f in frames]
+    assert np.array_equal(div_coor, expected)
+
+
+def test_trajectory_subdivide_frame_order(tmpdir):
+    """ Test timestep, xyz and atoms follow the order of selected frames """
+    from .synthetic import write_xyz
+    traj_path = tmpdir.join('traj.xyz').strpath
+    write_xyz(traj_path, n_frames=10, n_atoms=6)
+    traj = Trajectory(read=traj_path)
+    div_traj = traj.subdivide(frames=[8, 3, 5], atoms=[4, 1])
+    assert div_traj.timestep == [traj.timestep[i] for i in [8, 3, 5]]
+    assert div_traj.xyz[0] is traj.xyz[8]
+    assert div_traj.atoms == [[traj.atoms[i][4], traj.atoms[i][1]] for i in [8, 3, 5]]
+    assert np.array_equal(div_traj.coordinates[1], np.array(traj.coordinates)[3][[4, 1]])
+    traj.convert()
+    div_traj = traj.subdivide(frames=[8, 3, 5], atoms=[4, 1])
+    assert len(div_traj.atoms) == 3 and div_traj.atoms[0] == [traj.atoms[0][4], traj.atoms[0][1]]
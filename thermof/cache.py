@@ -0,0 +1,271 @@
+"""
+Persistent on-disk cache for parsed Lammps simulation results
+"""
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+
+class RunCache:
+    """
+    Stores parsed run data as .npz files in a cache directory.
+    Each entry is keyed by the run path, modification time and size of the files read for the run
+    and the calculation parameters. Least recently used entries are removed when the cache grows
+    larger than the given size limit.
+    """
+    def __init__(self, cache_dir, max_size=None):
+        """
+        Create a run cache.
+
+        Args:
+            - cache_dir (str): Directory to store cached run data
+            - max_size (float): Maximum size of the cache directory in MB (default: None -> no limit)
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __repr__(self):
+        return "<RunCache: %s | entries: %i>" % (self.cache_dir, len(self))
+
+    def __len__(self):
+        return len(self.entries())
+
+    def entries(self):
+        """
+        Returns list of cache files.
+        """
+        return [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith('.npz')]
+
+    def key(self, run_dir, k_par):
+        """
+        Cache key for a run directory with given calculation parameters.
+        """
+        return signature_key(run_signature(run_dir, k_par))
+
+    def path(self, key):
+        """
+        Returns cache file path for given key.
+        """
+        return os.path.join(self.cache_dir, '%s.npz' % key)
+
+    def load(self, key):
+        """
+        Load cached run data for given key.
+
+        Args:
+            - key (str): Cache key
+
+        Returns:
+            - dict: Run data (None if not found in the cache)
+        """
+        cache_file = self.path(key)
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            with np.load(cache_file, allow_pickle=False) as npz:
+                data = unflatten(npz)
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(cache_file)   # Mark entry as recently used
+        return data
+
+    def save(self, key, data):
+        """
+        Save run data for given key and remove least recently used entries if cache is full.
+
+        Args:
+            - key (str): Cache key
+            - data (dict): Run data read by read_run
+
+        Returns:
+            - None: Writes .npz file to cache directory
+        """
+        try:
+            arrays = flatten(data)
+        except TypeError as e:
+            print('WARNING!: Run data could not be cached (%s)' % e)
+            return None
+        fd, tmp_file = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, self.path(key))
+        if self.max_size is not None:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache is smaller than the size limit.
+        """
+        entries = []
+        for cache_file in self.entries():
+            try:
+                stat = os.stat(cache_file)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cache_file))
+        total_size = sum([e[1] for e in entries])
+        for mtime, size, cache_file in sorted(entries):
+            if total_size <= self.max_size * 1e6:
+                break
+            try:
+                os.remove(cache_file)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """
+        Remove all entries in the cache.
+        """
+        for cache_file in self.entries():
+            os.remove(cache_file)
+
+
+def get_run_cache(k_par):
+    """
+    Returns run cache defined in calculation parameters (None if caching is not selected).
+    """
+    if k_par.get('cache') is None:
+        return None
+    return RunCache(k_par['cache'], max_size=k_par.get('cache_size'))
+
+
+def run_files(run_dir, k_par):
+    """
+    Returns list of files in run directory that are read with given calculation parameters.
+    """
+    files = []
+    for f in sorted(os.listdir(run_dir)):
+        if k_par['prefix'] in f:
+            files.append(f)
+        elif k_par.get('read_thermo') and f == k_par['log_file']:
+            files.append(f)
+        elif k_par.get('read_walltime') and f == k_par['log_file']:
+            files.append(f)
+        elif k_par.get('read_thexp') and f == k_par['thexp_file']:
+            files.append(f)
+        elif f == k_par.get('flux_series'):
+            files.append(f)
+        elif k_par.get('read_info') and f == 'run_info.yaml':
+            files.append(f)
+    return files
+
+
+def run_signature(run_dir, k_par):
+    """
+    Signature of a run directory: path, name, modification time and size of files read and calculation parameters.
+    """
+    files = []
+    for f in run_files(run_dir, k_par):
+        stat = os.stat(os.path.join(run_dir, f))
+        files.append([f, stat.st_mtime_ns, stat.st_size])
+    return dict(run=os.path.abspath(run_dir), files=files, k_par=signature_parameters(k_par))
+
+
+def signature_parameters(k_par):
+    """
+    Calculation parameters that change results of a run. Parameters updated while reading runs (see read.update_volume)
+    are left out so that keys do not depend on the order runs are read in (or on reading in parallel).
+    """
+    ignore = ['cache', 'cache_size', 'initial_volume', 'deltaV']
+    if k_par.get('read_thermo') and 'vol' in k_par['thermo_style']:
+        ignore.append('volume')     # Volume is read from the log file which is in the signature
+    parameters = {par: k_par[par] for par in k_par if par not in ignore}
+    fix = parameters.get('fix')
+    if fix is not None and list(fix) == list(range(len(fix))):
+        parameters['fix'] = None    # Fixes are set to thermo block indices when not given (same thermo data)
+    return parameters
+
+
+def signature_key(signature):
+    """
+    Hash of a signature dictionary used as cache key.
+    """
+    return hashlib.sha1(json.dumps(signature, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def flatten(data):
+    """
+    Flatten nested dictionary of lists, arrays and scalars to a dictionary of arrays to be saved in .npz format.
+    The structure of the dictionary is stored as json in '__index__'. Values that can not be stored as numeric
+    or string arrays (ex: lists of dictionaries) are stored as json strings so that they load without pickle.
+    Raises TypeError for values that can not be stored as json either.
+    """
+    index, arrays = [], {}
+    for path, value in iterate_items(data):
+        if isinstance(value, dict):
+            kind = 'dict'
+            value = np.zeros(0)
+        elif value is None:
+            kind = 'none'
+            value = np.zeros(0)
+        elif isinstance(value, np.ndarray):
+            kind = 'array'
+        elif isinstance(value, (list, tuple)):
+            kind = 'list'
+        elif isinstance(value, str):
+            kind = 'str'
+        else:
+            kind = 'value'
+        array = to_array(value)
+        if array is None:
+            kind = 'json'
+            array = np.array(json.dumps(value.tolist() if isinstance(value, np.ndarray) else value))
+        arrays['arr_%i' % len(index)] = array
+        index.append([list(path), kind])
+    arrays['__index__'] = np.array(json.dumps(index))
+    return arrays
+
+
+def to_array(value):
+    """
+    Convert value to a numeric or string array (None if it would be an object array, which needs pickle to load).
+    """
+    try:
+        array = np.asarray(value)
+    except ValueError:          # Nested lists with different lengths
+        return None
+    if array.dtype == object:
+        return None
+    if array.dtype.kind in 'US' and isinstance(value, (list, tuple)) and not all([isinstance(v, str) for v in value]):
+        return None             # Mixed lists (ex: [1, 'a']) would be converted to strings
+    return array
+
+
+def iterate_items(data, path=()):
+    """
+    Iterate (path, value) pairs of a nested dictionary (empty dictionaries are returned as values).
+    """
+    for key, value in data.items():
+        if isinstance(value, dict) and len(value) > 0:
+            for item in iterate_items(value, path + (key, )):
+                yield item
+        else:
+            yield path + (key, ), value
+
+
+def unflatten(arrays):
+    """
+    Rebuild nested dictionary flattened by flatten method.
+    """
+    data = {}
+    for i, (path, kind) in enumerate(json.loads(str(arrays['__index__']))):
+        value = arrays['arr_%i' % i]
+        if kind == 'dict':
+            value = {}
+        elif kind == 'none':
+            value = None
+        elif kind == 'list':
+            value = value.tolist()
+        elif kind in ['str', 'value']:
+            value = value.item()
+        elif kind == 'json':
+            value = json.loads(str(value))
+        node = data
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return data
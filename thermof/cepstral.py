@@ -0,0 +1,141 @@
+"""
+Cepstral analysis of heat flux power spectrum for Green-Kubo thermal conductivity with statistical error
+(Ercole, Marcolongo, Baroni, Sci. Rep. 7, 15835 (2017))
+
+The zero frequency value of the heat flux power spectrum is estimated by keeping only the first P
+cepstral coefficients (Fourier coefficients of the log-periodogram), where P is selected with the Akaike
+information criterion. This gives converged estimates from much shorter trajectories than integrating
+the heat current autocorrelation function.
+"""
+import math
+import numpy as np
+
+
+EULER_GAMMA = 0.5772156649015329
+
+
+def digamma(x):
+    """
+    Digamma function for positive integers and half-integers (closed form).
+    """
+    n = int(math.floor(x))
+    if x == n:
+        return -EULER_GAMMA + sum([1.0 / k for k in range(1, n)])
+    elif x - n == 0.5:
+        return -EULER_GAMMA - 2 * math.log(2) + sum([2.0 / (2 * k - 1) for k in range(1, n + 1)])
+    raise CepstralError('Digamma is only available for integers and half-integers: %s' % x)
+
+
+def trigamma(x):
+    """
+    Trigamma function for positive integers and half-integers (closed form).
+    """
+    n = int(math.floor(x))
+    if x == n:
+        return math.pi ** 2 / 6 - sum([1.0 / k ** 2 for k in range(1, n)])
+    elif x - n == 0.5:
+        return math.pi ** 2 / 2 - sum([4.0 / (2 * k - 1) ** 2 for k in range(1, n + 1)])
+    raise CepstralError('Trigamma is only available for integers and half-integers: %s' % x)
+
+
+def periodogram(flux):
+    """
+    Periodogram of heat flux time series (|FFT|^2 / N) for non-negative frequencies.
+    The zero frequency value estimates the two-sided sum of the autocorrelation function.
+
+    Args:
+        - flux (ndarray): Heat flux with shape (samples, ...)
+
+    Returns:
+        - ndarray: Periodogram with shape (samples / 2 + 1, ...)
+    """
+    flux = np.asarray(flux, dtype=float)
+    return np.abs(np.fft.rfft(flux, axis=0)) ** 2 / len(flux)
+
+
+def log_spectrum_statistics(n_frequencies, n_components):
+    """
+    Mean and variance of the log of periodogram of n_components independent series divided by the spectrum.
+    The periodogram is distributed as chi-square with 2 x n_components degrees of freedom
+    (n_components at zero and Nyquist frequencies).
+
+    Args:
+        - n_frequencies (int): Number of frequencies
+        - n_components (int): Number of series averaged in the periodogram
+
+    Returns:
+        - ndarray: Mean of log-periodogram for each frequency
+        - ndarray: Variance of each cepstral coefficient
+    """
+    l = n_components
+    n_samples = 2 * (n_frequencies - 1)
+    mean = np.full(n_frequencies, digamma(l) - math.log(l))
+    mean[[0, -1]] = digamma(l / 2) - math.log(l / 2)
+    variance = np.full(n_frequencies, trigamma(l) / n_samples)
+    variance[[0, -1]] = 2 * trigamma(l) / n_samples
+    return mean, variance
+
+
+def cepstral_estimate(psd, n_components=1, max_coefficients=None):
+    """
+    Estimate zero frequency value of power spectra using cepstral analysis.
+    Multiple spectra (columns) are analyzed at once.
+
+    Args:
+        - psd (ndarray): Periodogram with shape (frequencies, ...) (see periodogram) averaged over n_components series
+        - n_components (int / list): Number of series averaged in the periodogram (one for each column)
+        - max_coefficients (int): Maximum number of cepstral coefficients to consider (default: None -> all)
+
+    Returns:
+        - dict: s0 (zero frequency spectrum), s0_err (statistical error), n_coefficients (selected by AIC)
+                and aic (for each number of coefficients)
+    """
+    psd = np.asarray(psd, dtype=float)
+    shape = np.shape(psd)[1:]
+    psd = psd.reshape((len(psd), -1))
+    n_frequencies, n_series = psd.shape
+    n_samples = 2 * (n_frequencies - 1)
+    components = np.broadcast_to(np.asarray(n_components), shape).reshape(-1)
+    mean, variance = np.zeros(psd.shape), np.zeros(psd.shape)
+    for l in set(components.tolist()):
+        mean[:, components == l], variance[:, components == l] = [s[:, np.newaxis] for s in log_spectrum_statistics(n_frequencies, l)]
+    log_psd = np.log(np.maximum(psd, np.finfo(float).tiny)) - mean
+    coefficients = np.fft.irfft(log_psd, n=n_samples, axis=0)[:n_frequencies]
+    weights = np.full((n_frequencies, 1), 2.0)
+    weights[[0, -1]] = 1.0
+    log_s0 = np.cumsum(weights * coefficients, axis=0)
+    log_s0_var = np.cumsum(weights ** 2 * variance, axis=0)
+    residual = np.cumsum((coefficients ** 2 / variance)[::-1], axis=0)[::-1]
+    aic = np.concatenate([residual[1:], np.zeros((1, n_series))]) + 2 * np.arange(1, n_frequencies + 1)[:, np.newaxis]
+    if max_coefficients is not None:
+        aic = aic[:max_coefficients]
+    selected = np.argmin(aic, axis=0)
+    s0 = np.exp(log_s0[selected, np.arange(n_series)])
+    s0_err = s0 * np.sqrt(log_s0_var[selected, np.arange(n_series)])
+    return dict(s0=s0.reshape(shape), s0_err=s0_err.reshape(shape), n_coefficients=(selected + 1).reshape(shape),
+                aic=aic.reshape((len(aic), ) + shape))
+
+
+def cepstral_flux(flux, cutoff=1.0, max_coefficients=None):
+    """
+    Cepstral analysis of heat flux in each direction and of all directions together (isotropic).
+
+    Args:
+        - flux (ndarray): Heat flux with shape (samples, directions)
+        - cutoff (float): Fraction of frequencies up to Nyquist frequency kept in the analysis
+                          (lower cutoff needs less cepstral coefficients for spectra with sharp high frequency features)
+        - max_coefficients (int): Maximum number of cepstral coefficients to consider (default: None -> all)
+
+    Returns:
+        - dict: s0, s0_err and n_coefficients arrays with one value for each direction followed by isotropic
+    """
+    flux = np.asarray(flux, dtype=float)
+    flux = flux[:len(flux) - len(flux) % 2]
+    psd = periodogram(flux)
+    psd = np.column_stack([psd, np.mean(psd, axis=1)])[:int(cutoff * (len(psd) - 1)) + 1]
+    n_components = [1] * np.shape(flux)[1] + [np.shape(flux)[1]]
+    return cepstral_estimate(psd, n_components=n_components, max_coefficients=max_coefficients)
+
+
+class CepstralError(Exception):
+    pass
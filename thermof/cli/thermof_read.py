@@ -44,8 +44,14 @@ def main():
                         help='Plot HCACF, k, and thermodynamic properties.')
     parser.add_argument('--kavg', '-k', nargs=2, default=[10, 20],
                         help='Average thermal conductivity btw. given time interval (ps).')
+    parser.add_argument('--kest', '-ke', default=None, type=str, metavar='',
+                        help='Thermal conductivity estimation method (window | first_dip | slope).')
     parser.add_argument('--write', '-w', action='store_true', default=False,
                         help='Write results to a file.')
+    parser.add_argument('--incremental', '-i', action='store_true', default=False,
+                        help='Only parse new or modified runs (parsed runs are cached in simulation directory).')
+    parser.add_argument('--workers', '-j', default=None, type=int, metavar='',
+                        help='Number of processes to read runs in parallel.')
 
     # Parse arguments
     args = parser.parse_args()
@@ -60,7 +66,9 @@ def main():
         sim.read_parameters()
     sim.parameters.thermof['kpar']['t0'] = int(args.kavg[0])
     sim.parameters.thermof['kpar']['t1'] = int(args.kavg[1])
-    sim.read(simdir, setup=args.setup)
+    if args.kest is not None:
+        sim.parameters.thermof['kpar']['k_est_method'] = args.kest
+    sim.read(simdir, setup=args.setup, workers=args.workers, incremental=args.incremental)
 
     # Plotting
     if len(args.plot) > 0:
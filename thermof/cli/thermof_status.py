@@ -0,0 +1,58 @@
+"""
+TherMOF command line interface.
+"""
+import os
+import argparse
+from thermof.read import scan_run_status
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""
+    ----------------------------------------------------------------------------
+    ████████╗██╗  ██╗███████╗██████╗ ███╗   ███╗ ██████╗ ███████╗
+    ╚══██╔══╝██║  ██║██╔════╝██╔══██╗████╗ ████║██╔═══██╗██╔════╝
+       ██║   ███████║█████╗  ██████╔╝██╔████╔██║██║   ██║█████╗
+       ██║   ██╔══██║██╔══╝  ██╔══██╗██║╚██╔╝██║██║   ██║██╔══╝
+       ██║   ██║  ██║███████╗██║  ██║██║ ╚═╝ ██║╚██████╔╝██║
+       ╚═╝   ╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═╝     ╚═╝ ╚═════╝ ╚═╝
+
+    TherMOF: Thermal transport in Metal-Organic Frameworks
+    -----------------------------------------------------------------------------
+        """,
+        epilog="""
+    Example:
+    python thermof_status.py IRMOF-1
+
+    would check the status of all Lammps simulations under IRMOF-1 directory by reading
+    only the end of the Lammps output file of each simulation.
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    # Positional arguments
+    parser.add_argument('simdir', type=str, help='Directory containing Lammps simulations.')
+
+    # Optional arguments
+    parser.add_argument('--file', '-f', default='lammps_out.txt', type=str, metavar='',
+                        help='Lammps output file name to check.')
+    parser.add_argument('--workers', '-j', default=16, type=int, metavar='',
+                        help='Number of threads to check simulations in parallel.')
+
+    # Parse arguments
+    args = parser.parse_args()
+
+    simdir = os.path.abspath(args.simdir)
+    status_list = scan_run_status(simdir, file_name=args.file, workers=args.workers)
+    summary = {}
+    for status in status_list:
+        run_name = os.path.relpath(status['path'], simdir)
+        if status['status'] == 'finished':
+            print('%-30s -> finished in %i:%02i:%02i' % (run_name, *status['walltime']))
+        else:
+            print('%-30s -> %s' % (run_name, status['status']))
+        summary[status['status']] = summary.get(status['status'], 0) + 1
+    print('\n' + ' | '.join(['%s: %i' % (s, n) for s, n in sorted(summary.items())]))
+
+
+if __name__ == '__main__':
+    main()
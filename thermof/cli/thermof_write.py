@@ -5,6 +5,7 @@ import os
 import argparse
 from thermof import Simulation
 from thermof import Parameters
+from thermof.initialize.batch import batch_initialize
 
 
 def main():
@@ -31,12 +32,16 @@ def main():
      >>> python thermof_write.py IRMOF-1.cif --forcefield UFF4MOF --fix MIN NPT NVT NVE --scheduler pbs
     would initialize Lammps simulation files with UFF4MOF force field for following procedure:
     Minimization, NPT, NVT, and NVE emsembles. It would also create a job submission script for pbs scheduler.
+
+     >>> python thermof_write.py cifs/*.cif --runs 5 --workers 8 --simdir screening
+    would initialize simulations for all cif files in parallel using 8 processes in screening directory.
+    Force field typed Lammps files are cached so that rerunning with different seeds skips typing.
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter)
 
     default_params = {}
     # Positional arguments
-    parser.add_argument('molecule', type=str, help='Molecule file to read (must be in .cif format).')
+    parser.add_argument('molecule', type=str, nargs='+', help='Molecule file(s) to read (must be in .cif format).')
 
     # Optional arguments
     parser.add_argument('--runs', '-r', default=1, type=int, metavar='',
@@ -47,15 +52,36 @@ def main():
                         help='Lammps fix types (MIN / NPT / NVT / NVE).')
     parser.add_argument('--scheduler', default='slurm', type=str, metavar='',
                         help='Job scheduler (pbs / [slurm] / slurm-scratch).')
+    parser.add_argument('--workers', '-j', default=None, type=int, metavar='',
+                        help='Number of processes to initialize multiple molecules in parallel.')
+    parser.add_argument('--simdir', default=None, type=str, metavar='',
+                        help='Directory to initialize multiple molecules in (default: current directory).')
+    parser.add_argument('--cache', default=None, type=str, metavar='',
+                        help='Directory to cache force field typed Lammps files (default: <simdir>/.lammps-cache).')
+    parser.add_argument('--share-data', default=None, type=str, choices=['link', 'relative'],
+                        help='Share a single data file between runs (hard link / read from simulation directory).')
 
     # Parse arguments
     args = parser.parse_args()
 
+    # Initialize multiple simulations in parallel
+    if len(args.molecule) > 1 or args.workers is not None:
+        simpar = Parameters()
+        simpar.lammps['force_field'] = args.forcefield
+        simpar.lammps['mol_ff'] = args.forcefield
+        simpar.thermof['fix'] = args.fix
+        simpar.job['scheduler'] = args.scheduler
+        simdir = args.simdir if args.simdir is not None else os.getcwd()
+        batch_initialize(args.molecule, simdir, parameters=simpar, n_runs=args.runs, workers=args.workers,
+                         cache_dir=args.cache, share_data=args.share_data)
+        return None
+
     # Initialize simulation
     simpar = Parameters()
-    sim = Simulation(mof=args.molecule, parameters=simpar)
-    mof_name = os.path.splitext(os.path.basename(args.molecule))[0]
-    sim.simdir = os.path.join(os.path.dirname(args.molecule), mof_name)
+    molecule = args.molecule[0]
+    sim = Simulation(mof=molecule, parameters=simpar)
+    mof_name = os.path.splitext(os.path.basename(molecule))[0]
+    sim.simdir = os.path.join(os.path.dirname(molecule), mof_name)
 
     sim.parameters.lammps['force_field'] = args.forcefield
     sim.parameters.lammps['mol_ff'] = args.forcefield
@@ -65,7 +91,7 @@ def main():
         if args.runs == 1:
             sim.initialize()
         elif args.runs > 1:
-            sim.initialize_runs(args.runs)
+            sim.initialize_runs(args.runs, share_data=args.share_data)
     except Exception as e:
         print(e)
 
@@ -0,0 +1,111 @@
+"""
+Heat current autocorrelation function (HCACF) calculation from raw heat flux time series using FFT
+"""
+import numpy as np
+
+
+def autocorrelation(x, n_lags=None):
+    """
+    Calculate autocorrelation of a time series averaged over all time origins using FFT.
+    Each lag is divided by the number of time origins contributing to it, which is the same
+    running average calculated by Lammps fix ave/correlate.
+
+    Args:
+        - x (ndarray): Time series (1D) or multiple time series (2D, time along the first axis)
+        - n_lags (int): Number of time lags to calculate (default: None -> length of the time series)
+
+    Returns:
+        - ndarray: Autocorrelation for each time lag
+    """
+    x = np.asarray(x, dtype=float)
+    n_samples = len(x)
+    if n_lags is None or n_lags > n_samples:
+        n_lags = n_samples
+    n_fft = 2 ** int(np.ceil(np.log2(2 * n_samples - 1))) if n_samples > 1 else 2
+    f = np.fft.rfft(x, n=n_fft, axis=0)
+    acf = np.fft.irfft(f * f.conjugate(), n=n_fft, axis=0)[:n_lags]
+    counts = (n_samples - np.arange(n_lags)).reshape((-1, ) + (1, ) * (x.ndim - 1))
+    return acf / counts
+
+
+def block_autocorrelation(x, n_lags=None, n_blocks=1, return_blocks=False):
+    """
+    Calculate autocorrelation for consecutive blocks of a time series and average over blocks.
+
+    Args:
+        - x (ndarray): Time series (1D) or multiple time series (2D, time along the first axis)
+        - n_lags (int): Number of time lags to calculate (default: None -> length of a block)
+        - n_blocks (int): Number of blocks to divide the time series into
+        - return_blocks (bool): Also return autocorrelation of each block
+
+    Returns:
+        - ndarray: Block averaged autocorrelation for each time lag
+        - ndarray: Standard error of the block average (zeros for a single block)
+        - ndarray: Autocorrelation of each block with shape (blocks, lags, ...) (only if return_blocks)
+    """
+    x = np.asarray(x, dtype=float)
+    block_size = int(len(x) / n_blocks)
+    if n_lags is None or n_lags > block_size:
+        n_lags = block_size
+    blocks = np.array([autocorrelation(x[i * block_size:(i + 1) * block_size], n_lags) for i in range(n_blocks)])
+    mean = np.mean(blocks, axis=0)
+    if n_blocks > 1:
+        error = np.std(blocks, axis=0, ddof=1) / np.sqrt(n_blocks)
+    else:
+        error = np.zeros(np.shape(mean))
+    if return_blocks:
+        return mean, error, blocks
+    return mean, error
+
+
+def cross_correlation(x, n_lags=None):
+    """
+    Calculate all cross-correlations <x_i(0) x_j(t)> of multiple time series averaged over all time origins
+    in one pass using FFT. Diagonal elements are the autocorrelations (see autocorrelation).
+
+    Args:
+        - x (ndarray): Multiple time series with shape (samples, series) (ex: heat flux with shape (N, 3))
+        - n_lags (int): Number of time lags to calculate (default: None -> length of the time series)
+
+    Returns:
+        - ndarray: Cross-correlation with shape (lags, series, series)
+    """
+    x = np.asarray(x, dtype=float)
+    n_samples = len(x)
+    if n_lags is None or n_lags > n_samples:
+        n_lags = n_samples
+    n_fft = 2 ** int(np.ceil(np.log2(2 * n_samples - 1))) if n_samples > 1 else 2
+    f = np.fft.rfft(x, n=n_fft, axis=0)
+    ccf = np.fft.irfft(f.conjugate()[:, :, np.newaxis] * f[:, np.newaxis, :], n=n_fft, axis=0)[:n_lags]
+    counts = (n_samples - np.arange(n_lags)).reshape((-1, 1, 1))
+    return ccf / counts
+
+
+def block_cross_correlation(x, n_lags=None, n_blocks=1, return_blocks=False):
+    """
+    Calculate cross-correlations for consecutive blocks of multiple time series and average over blocks.
+
+    Args:
+        - x (ndarray): Multiple time series with shape (samples, series)
+        - n_lags (int): Number of time lags to calculate (default: None -> length of a block)
+        - n_blocks (int): Number of blocks to divide the time series into
+        - return_blocks (bool): Also return cross-correlation of each block
+
+    Returns:
+        - ndarray: Block averaged cross-correlation with shape (lags, series, series)
+        - ndarray: Standard error of the block average (zeros for a single block)
+        - ndarray: Cross-correlation of each block with shape (blocks, lags, series, series) (only if return_blocks)
+    """
+    x = np.asarray(x, dtype=float)
+    block_size = int(len(x) / n_blocks)
+    if n_lags is None or n_lags > block_size:
+        n_lags = block_size
+    blocks = np.array([cross_correlation(x[i * block_size:(i + 1) * block_size], n_lags) for i in range(n_blocks)])
+    mean = np.mean(blocks, axis=0)
+    if n_blocks > 1:
+        error = np.std(blocks, axis=0, ddof=1) / np.sqrt(n_blocks)
+    else:
+        error = np.zeros(np.shape(mean))
+    if return_blocks:
+        return mean, error, blocks
+    return mean, error
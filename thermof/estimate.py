@@ -0,0 +1,206 @@
+"""
+Estimate thermal conductivity from the plateau of the running integral of heat current autocorrelation
+"""
+import numpy as np
+
+
+def time_window(time, t0, t1):
+    """
+    Find start and end indices of a time window using binary search.
+    Times are matched with a small tolerance so that floating point times (ex: 4.999999999) are found.
+    Raises ValueError if t0 or t1 is not a simulation time.
+
+    Args:
+        - time (list): Sorted simulation time
+        - t0 (float): Start time of the window
+        - t1 (float): End time of the window
+
+    Returns:
+        - int: Start index (time equal to t0)
+        - int: End index (time equal to t1)
+    """
+    start, end = sample_indices(time, [t0, t1])
+    return int(start), int(end)
+
+
+def sample_indices(time, times):
+    """
+    Find index of each given time in simulation time (see time_indices).
+    Raises ValueError if any time is not within tolerance of a simulation time (see time_tolerance).
+
+    Args:
+        - time (list): Sorted simulation time
+        - times (list): Times to search
+
+    Returns:
+        - ndarray: Index for each given time
+    """
+    indices = time_indices(time, times)
+    time, tol = np.asarray(time, dtype=float), time_tolerance(time)
+    for t, index in zip(np.atleast_1d(times), indices):
+        if index == len(time) or abs(time[index] - t) > tol:
+            raise ValueError('%s is not in simulation time (%s - %s ps)' % (t, time[0], time[-1]))
+    return indices
+
+
+def time_indices(time, times):
+    """
+    Find indices of first simulation time >= each given time (times between samples are not rejected,
+    see sample_indices).
+
+    Args:
+        - time (list): Sorted simulation time
+        - times (list): Times to search
+
+    Returns:
+        - ndarray: Index for each given time
+    """
+    time = np.asarray(time, dtype=float)
+    return np.searchsorted(time, np.asarray(times, dtype=float) - time_tolerance(time), side='left')
+
+
+def time_tolerance(time):
+    """
+    Tolerance for matching simulation times.
+    """
+    return 1e-9 * max(1.0, abs(float(time[-1])))
+
+
+def prefix_sums(k):
+    """
+    Cumulative sums of thermal conductivity starting with zero, so that the sum over any window is a single difference.
+
+    Args:
+        - k (ndarray): Thermal conductivity integral with shape (..., timesteps)
+
+    Returns:
+        - ndarray: Prefix sums with shape (..., timesteps + 1)
+    """
+    k = np.asarray(k, dtype=float)
+    return np.concatenate([np.zeros(np.shape(k)[:-1] + (1, )), np.cumsum(k, axis=-1)], axis=-1)
+
+
+def window_average(k_prefix, time, t0, t1):
+    """
+    Average thermal conductivity between t0 and t1 from prefix sums in constant time (same window as read.estimate_k).
+
+    Args:
+        - k_prefix (ndarray): Prefix sums of thermal conductivity with shape (..., timesteps + 1) (see prefix_sums)
+        - time (ndarray): Simulation time (ps)
+        - t0 (float): Start time of the window
+        - t1 (float): End time of the window
+
+    Returns:
+        - ndarray: Thermal conductivity estimate for each series
+    """
+    start, end = time_window(time, t0, t1)
+    k_prefix = np.asarray(k_prefix, dtype=float)
+    return (k_prefix[..., end] - k_prefix[..., start]) / (end - start)
+
+
+def window_scan(k_prefix, time, t0, t1):
+    """
+    Average thermal conductivity for every combination of window start and end times at once.
+    Raises ValueError if any start or end time is not a simulation time (see sample_indices).
+
+    Args:
+        - k_prefix (ndarray): Prefix sums of thermal conductivity with shape (..., timesteps + 1) (see prefix_sums)
+        - time (ndarray): Simulation time (ps)
+        - t0 (list): Window start times
+        - t1 (list): Window end times
+
+    Returns:
+        - ndarray: Thermal conductivity estimates with shape (..., len(t0), len(t1)) (nan for empty windows)
+    """
+    k_prefix = np.asarray(k_prefix, dtype=float)
+    starts, ends = sample_indices(time, t0), sample_indices(time, t1)
+    n_points = ends[np.newaxis, :] - starts[:, np.newaxis]
+    k_sum = k_prefix[..., np.newaxis, ends] - k_prefix[..., starts, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(n_points > 0, k_sum / n_points, np.nan)
+
+
+def first_dip(k):
+    """
+    Find the first maximum of thermal conductivity integral (where HCACF first drops to zero).
+
+    Args:
+        - k (ndarray): Thermal conductivity integral with shape (..., timesteps)
+
+    Returns:
+        - ndarray: Index of the first dip for each series (last index if HCACF never drops to zero)
+    """
+    dips = np.diff(k, axis=-1) <= 0
+    return np.where(np.any(dips, axis=-1), np.argmax(dips, axis=-1), np.shape(k)[-1] - 1)
+
+
+def running_slope(k, time, window):
+    """
+    Calculate mean and least squares slope of thermal conductivity in running windows using prefix sums.
+
+    Args:
+        - k (ndarray): Thermal conductivity integral with shape (..., timesteps)
+        - time (ndarray): Simulation time with shape (timesteps, )
+        - window (int): Number of points in each window
+
+    Returns:
+        - ndarray: Mean k for each window start with shape (..., timesteps - window + 1)
+        - ndarray: Slope of k for each window start with shape (..., timesteps - window + 1)
+    """
+    k, time = np.asarray(k, dtype=float), np.asarray(time, dtype=float)
+    t = time - time[0]
+
+    def window_sum(x):
+        cumsum = prefix_sums(x)
+        return cumsum[..., window:] - cumsum[..., :-window]
+
+    sum_t, sum_tt = window_sum(t), window_sum(t * t)
+    sum_k, sum_tk = window_sum(k), window_sum(t * k)
+    slope = (window * sum_tk - sum_t * sum_k) / (window * sum_tt - sum_t ** 2)
+    return sum_k / window, slope
+
+
+def estimate_plateau(k, time, method='slope', window=1.0, tol=0.01):
+    """
+    Estimate thermal conductivity by detecting the plateau of thermal conductivity integral.
+    Works on a single series or on arrays of series (ex: all runs and directions of a trial) at once.
+
+    Methods:
+        - first_dip: k at the first maximum of the integral (first zero of HCACF)
+        - slope: Average k in the first window after the first dip in which the change of k over the window
+                 (slope x window duration) is less than tol x mean k in the window.
+                 The flattest window is selected if no window satisfies the tolerance.
+
+    Args:
+        - k (ndarray): Thermal conductivity integral with shape (..., timesteps)
+        - time (list): Simulation time (ps)
+        - method (str): Plateau detection method ('first_dip' | 'slope')
+        - window (float): Window duration for slope method (ps)
+        - tol (float): Relative tolerance of change in k within a window for slope method
+
+    Returns:
+        - ndarray: Thermal conductivity estimate for each series
+        - ndarray: Start and end time of the selected window for each series with shape (..., 2)
+    """
+    k, time = np.asarray(k, dtype=float), np.asarray(time, dtype=float)
+    dip = first_dip(k)
+    if method == 'first_dip':
+        k_est = np.take_along_axis(k, dip[..., np.newaxis], axis=-1)[..., 0]
+        return k_est, np.stack([time[dip], time[dip]], axis=-1)
+    elif method == 'slope':
+        n_window = int(np.clip(time_indices(time, [time[0] + window])[0] + 1, 2, len(time)))
+        k_mean, slope = running_slope(k, time, n_window)
+        change = np.abs(slope) * (time[n_window - 1] - time[0])
+        starts = np.arange(np.shape(k_mean)[-1])
+        after_dip = starts >= np.minimum(dip, starts[-1])[..., np.newaxis]
+        flat = (change <= tol * np.abs(k_mean)) & after_dip
+        flattest = np.argmin(np.where(after_dip, change / np.maximum(np.abs(k_mean), 1e-300), np.inf), axis=-1)
+        start = np.where(np.any(flat, axis=-1), np.argmax(flat, axis=-1), flattest)
+        k_est = np.take_along_axis(k_mean, start[..., np.newaxis], axis=-1)[..., 0]
+        return k_est, np.stack([time[start], time[start + n_window - 1]], axis=-1)
+    else:
+        raise PlateauMethodError('Plateau detection method not recognized: %s (first_dip | slope)' % method)
+
+
+class PlateauMethodError(Exception):
+    pass
@@ -0,0 +1,182 @@
+"""
+Follow Lammps simulations that are still running by parsing only the bytes appended to
+log and thermal flux autocorrelation files since the last poll.
+"""
+import os
+import time as timer
+import numpy as np
+from thermof.parameters import k_parameters
+from thermof.read import LogParser, get_thermo_headers, calculate_k, estimate_run_k, average_k
+
+
+class FileTail:
+    """
+    Keeps the byte offset of a growing file and returns complete lines appended since the last read.
+    Incomplete last lines are kept until the rest of the line is written.
+    """
+    def __init__(self, file_path):
+        self.path = file_path
+        self.offset = 0
+        self.partial = b''
+
+    def __repr__(self):
+        return "<FileTail: %s | offset: %i>" % (self.path, self.offset)
+
+    def read_lines(self):
+        """
+        Read lines appended since the last call.
+
+        Returns:
+            - list: New complete lines (empty if the file does not exist or has not changed)
+            - bool: True if the file was truncated or replaced and is read from the beginning
+        """
+        if not os.path.exists(self.path):
+            return [], False
+        reset = os.path.getsize(self.path) < self.offset
+        if reset:
+            self.offset, self.partial = 0, b''
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        return [line.decode(errors='replace') + '\n' for line in lines], reset
+
+
+class CorrelationParser:
+    """
+    Streaming parser for Lammps fix ave/correlate files keeping the last complete correlation block.
+    """
+    def __init__(self, j_index=3):
+        self.j_index = j_index
+        self.block = None
+        self.n_rows = 0
+        self.rows = []
+        self.n_blocks = 0
+
+    def feed(self, line):
+        """
+        Parse a single line of the correlation file.
+        """
+        ls = line.split()
+        if len(ls) == 0 or ls[0].startswith('#'):
+            return None
+        if len(ls) == 2:
+            self.n_rows, self.rows = int(ls[1]), []
+        elif len(self.rows) < self.n_rows:
+            self.rows.append((float(ls[0]), float(ls[self.j_index])))
+            if len(self.rows) == self.n_rows:
+                self.block = np.array(self.rows)
+                self.n_blocks += 1
+
+
+class RunFollower:
+    """
+    Follow a running Lammps simulation: thermo data from the log file and thermal conductivity
+    from the last complete block of each thermal flux autocorrelation file.
+    """
+    def __init__(self, run_dir, k_par=k_parameters):
+        """
+        Create a run follower.
+
+        Args:
+            - run_dir (str): Lammps simulation directory for single run
+            - k_par (dict): Dictionary of calculation parameters
+        """
+        self.run_dir = run_dir
+        self.name = os.path.basename(run_dir)
+        self.k_par = k_par
+        self.log_tail = FileTail(os.path.join(run_dir, k_par['log_file']))
+        self.new_log_parser()
+        self.flux = {}
+
+    def __repr__(self):
+        return "<RunFollower: %s | directions: %i>" % (self.name, len(self.flux))
+
+    def new_log_parser(self):
+        """
+        Start parsing the log file from the beginning.
+        """
+        self.log_parser = LogParser(headers=get_thermo_headers(self.k_par['thermo_style']),
+                                    thermo_style=self.k_par['thermo_style'])
+
+    def poll(self):
+        """
+        Parse data appended to log and thermal flux files since the last poll.
+
+        Returns:
+            - dict: Run name, thermo (including unfinished thermo block), loop, walltime, finished,
+                    time, directions and k, k_est for each direction read so far
+        """
+        lines, reset = self.log_tail.read_lines()
+        if reset:
+            self.new_log_parser()
+        for line in lines:
+            self.log_parser.feed(line)
+        for f in sorted(os.listdir(self.run_dir)):
+            if self.k_par['prefix'] in f:
+                direction = f.split('.')[0].split(self.k_par['prefix'])[1]
+                if direction not in self.flux:
+                    self.flux[direction] = (FileTail(os.path.join(self.run_dir, f)), CorrelationParser())
+        for direction, (flux_tail, flux_parser) in self.flux.items():
+            lines, reset = flux_tail.read_lines()
+            if reset:
+                self.flux[direction] = (flux_tail, CorrelationParser())
+                flux_parser = self.flux[direction][1]
+            for line in lines:
+                flux_parser.feed(line)
+        return self.result()
+
+    def result(self):
+        """
+        Returns data read so far (see poll).
+        """
+        log_data = self.log_parser.result(running=True)
+        fix = self.k_par['fix'] if self.k_par['fix'] is not None else []
+        thermo = {}
+        for i, block in enumerate(log_data['thermo'].values()):
+            thermo[fix[i] if i < len(fix) else i] = block
+        run_data = dict(name=self.name, thermo=thermo, loop=log_data['loop'], walltime=log_data['walltime'],
+                        finished=log_data['walltime'] is not None, directions=[], k={}, k_est={}, time=[])
+        for direction, (flux_tail, flux_parser) in self.flux.items():
+            if flux_parser.block is not None:
+                flux = flux_parser.block[:, 1]
+                run_data['time'] = ((flux_parser.block[:, 0] - 1) * self.k_par['dt'] / 1000.0).tolist()
+                run_data['k'][direction] = calculate_k(flux.tolist(), k_par=self.k_par)
+                run_data['directions'].append(direction)
+        if self.k_par['isotropic'] and len(run_data['directions']) > 0:
+            k_runs = [run_data['k'][d] for d in run_data['directions']]
+            if len(set([len(k) for k in k_runs])) == 1:
+                run_data['k']['iso'] = average_k(k_runs)
+        for direction, k in run_data['k'].items():
+            run_data['k_est'][direction] = self.estimate(k, run_data['time'])
+        return run_data
+
+    def estimate(self, k, time):
+        """
+        Running thermal conductivity estimate (None if the correlation is shorter than the averaging window).
+        """
+        if self.k_par.get('k_est_method', 'window') == 'window' and (len(time) == 0 or time[-1] < self.k_par['t1']):
+            return None
+        return estimate_run_k(k, time, k_par=self.k_par)[0]
+
+    def follow(self, interval=60, max_polls=None):
+        """
+        Poll the run repeatedly and yield updated data until the simulation is finished.
+
+        Args:
+            - interval (float): Seconds to wait between polls
+            - max_polls (int): Maximum number of polls (default: None -> until finished)
+
+        Yields:
+            - dict: Run data after each poll (see poll)
+        """
+        n_polls = 0
+        while max_polls is None or n_polls < max_polls:
+            run_data = self.poll()
+            n_polls += 1
+            yield run_data
+            if run_data['finished']:
+                break
+            timer.sleep(interval)
@@ -4,6 +4,7 @@
 Functions to help initialize Lammps simulations
 """
 import os
+from functools import lru_cache
 
 
 def read_lines(file_name):
@@ -13,6 +14,18 @@ def read_lines(file_name):
     return lines
 
 
+def read_template(file_name):
+    """ Read lines from given file once per process (until the file is modified) and return as a new list """
+    stat = os.stat(file_name)
+    return list(cached_lines(os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=64)
+def cached_lines(file_name, mtime, size):
+    """ Read lines from given file, cached for file path, modification time and size """
+    return tuple(read_lines(file_name))
+
+
 def write_lines(file_name, lines):
     """ Write given list of lines to given file """
     if os.path.exists(file_name):
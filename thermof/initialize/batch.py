@@ -0,0 +1,115 @@
+"""
+Initialize Lammps simulations for many MOFs and simulation parameters in parallel
+"""
+import os
+import glob
+import json
+import time
+import itertools
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor
+from thermof.parameters import Parameters
+
+
+def batch_initialize(cif_files, simdir, parameters=None, grid=None, n_runs=1, workers=None, cache_dir=None,
+                     share_data=None, verbose=True):
+    """
+    Initialize Lammps simulations for a list of CIF files and a grid of simulation parameters.
+    Simulations are initialized in a process pool and Lammps files written by lammps_interface are cached
+    for each (CIF file, lammps parameters) pair so that simulations that only differ in thermof or job
+    parameters (seed, temperature, fixes, ...) skip topology analysis and force field typing.
+    A summary of all simulations is written to <simdir>/manifest.json.
+
+    Args:
+        - cif_files (list / str): List of CIF files or a glob pattern (ex: 'cifs/*.cif')
+        - simdir (str): Directory to create simulation directories in
+        - parameters (Parameters): Base simulation parameters (default: None -> default parameters)
+        - grid (dict): Parameter values to combine, keys are 'group.parameter' (ex: {'lammps.force_field': ['UFF', 'UFF4MOF'],
+                       'thermof.temperature': [300, 400]})
+        - n_runs (int): Number of runs for each simulation (different seed number is used for each run)
+        - workers (int): Number of processes (default: None -> number of processors)
+        - cache_dir (str): Directory to cache lammps_interface files (default: None -> <simdir>/.lammps-cache)
+        - share_data (str): Share a single data file between runs ('link' | 'relative', see Simulation.initialize_runs).
+                            'link' still places the data file in each run directory (hard link, or a copy if hard
+                            links are not supported). 'relative' keeps one data file in the simulation directory and
+                            can not be used with the slurm-scratch scheduler (only run directory files are copied to scratch)
+        - verbose (bool): Print progress
+
+    Returns:
+        - list: Summary of each simulation (CIF file, simulation directory, grid parameters, status, error, time)
+    """
+    if isinstance(cif_files, str):
+        cif_files = sorted(glob.glob(cif_files))
+    if parameters is None:
+        parameters = Parameters()
+    if cache_dir is None:
+        cache_dir = os.path.join(simdir, '.lammps-cache')
+    os.makedirs(simdir, exist_ok=True)
+    tasks = get_tasks(cif_files, simdir, parameters, grid=grid, n_runs=n_runs, cache_dir=cache_dir,
+                      share_data=share_data)
+    print('Initializing %i simulations for %i CIF files...' % (len(tasks), len(cif_files))) if verbose else None
+    manifest = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, summary in enumerate(executor.map(initialize_task, tasks), start=1):
+            manifest.append(summary)
+            print('%i / %i | %-8s | %s' % (i, len(tasks), summary['status'], summary['simdir'])) if verbose else None
+    with open(os.path.join(simdir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def get_tasks(cif_files, simdir, parameters, grid=None, n_runs=1, cache_dir=None, share_data=None):
+    """
+    Create an initialization task for each CIF file and combination of grid parameters.
+    Simulation directories are named as <mof>-<value1>-<value2>... for grid parameters.
+    """
+    grid = {} if grid is None else grid
+    tasks = []
+    for cif_file in cif_files:
+        mof_name = os.path.splitext(os.path.basename(cif_file))[0]
+        for values in itertools.product(*grid.values()):
+            grid_point = dict(zip(grid.keys(), values))
+            sim_name = '-'.join([mof_name] + [str(v) for v in values])
+            tasks.append(dict(cif_file=os.path.abspath(cif_file), simdir=os.path.join(simdir, sim_name),
+                              parameters=parameters, grid=grid_point, n_runs=n_runs, cache_dir=cache_dir,
+                              share_data=share_data))
+    return tasks
+
+
+def initialize_task(task):
+    """
+    Initialize a single simulation (runs in a worker process). Errors are captured in the summary.
+
+    Args:
+        - task (dict): Task created by get_tasks
+
+    Returns:
+        - dict: Summary with cif_file, simdir, grid, n_runs, status ('initialized' | 'error'), error, time (s)
+                and cached (lammps_interface files were copied from cache)
+    """
+    from thermof.simulation import Simulation
+    from thermof.initialize.lammps import lammps_files_key
+
+    start = time.time()
+    summary = dict(cif_file=task['cif_file'], simdir=task['simdir'], grid=task['grid'], n_runs=task['n_runs'],
+                   status='initialized', error=None, cached=False)
+    try:
+        parameters = Parameters(deepcopy(vars(task['parameters'])))
+        for par, value in task['grid'].items():
+            group, name = par.split('.', 1)
+            getattr(parameters, group)[name] = value
+        if 'lammps.force_field' in task['grid'] and 'lammps.mol_ff' not in task['grid']:
+            parameters.lammps['mol_ff'] = task['grid']['lammps.force_field']
+        sim = Simulation(mof=task['cif_file'], parameters=parameters)
+        sim.verbose = False
+        cached_dir = os.path.join(task['cache_dir'], lammps_files_key(sim.parameters.lammps))
+        summary['cached'] = os.path.isdir(cached_dir)
+        sim.simdir = task['simdir']
+        if task['n_runs'] > 1:
+            sim.initialize_runs(task['n_runs'], cache_dir=task['cache_dir'], share_data=task.get('share_data'))
+        else:
+            sim.initialize(cache_dir=task['cache_dir'])
+    except Exception as e:
+        summary['status'], summary['error'] = 'error', '%s: %s' % (type(e).__name__, e)
+    summary['time'] = time.time() - start
+    return summary
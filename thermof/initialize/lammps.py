@@ -5,25 +5,43 @@ Initialize Lammps simulation using lammps_interface
 """
 import os
 import glob
+import json
+import shutil
+import hashlib
+import tempfile
 from lammps_interface.lammps_main import LammpsSimulation
 from lammps_interface.structure_data import from_CIF
-from . import read_lines, write_lines
+from functools import lru_cache
+from . import read_template, write_lines
+from .template import render_template
 from thermof.sample import lammps_input
 from thermof.parameters import Parameters
 
 
-def write_lammps_files(simdir, parameters, verbose=True):
+def write_lammps_files(simdir, parameters, verbose=True, cache_dir=None):
     """
     Write Lammps files using lammps_interface.
+    If a cache directory is given, files written by lammps_interface are stored for each
+    (CIF file, lammps parameters) pair and copied from the cache for simulations with the same structure
+    and force field parameters, which skips topology analysis and force field typing.
 
     Args:
         - simdir (str): Directory to write Lammps simulation files
         - parameters (Parameters): Lammps simulation parameters
+        - cache_dir (str): Directory to cache Lammps files (default: None -> no cache)
 
     Returns:
-        - None: Writes Lammps simulation files to simulation directory
+        - bool: True if Lammps files were copied from the cache
     """
     print('I. Writing Lammps input and data files...') if verbose else None
+    if cache_dir is not None:
+        cached_dir = os.path.join(cache_dir, lammps_files_key(parameters.lammps))
+        if os.path.isdir(cached_dir):
+            for f in os.listdir(cached_dir):
+                shutil.copy(os.path.join(cached_dir, f), simdir)
+            print('Lammps files copied from cache -> %s' % cached_dir) if verbose else None
+            return True
+        existing_files = set(os.listdir(simdir))
     lammpspar = Parameters(parameters.lammps)
     sim = LammpsSimulation(lammpspar)
     cell, graph = from_CIF(lammpspar.cif_file)
@@ -34,39 +52,64 @@ def write_lammps_files(simdir, parameters, verbose=True):
     sim.compute_simulation_size()
     sim.merge_graphs()
     sim.write_lammps_files(simdir)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=cache_dir)
+        for f in set(os.listdir(simdir)) - existing_files:
+            shutil.copy(os.path.join(simdir, f), tmp_dir)
+        try:
+            os.rename(tmp_dir, cached_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir)          # Written by another process in the meantime
+    return False
+
+
+def lammps_files_key(lammpspar):
+    """
+    Cache key for Lammps files written by lammps_interface: hash of CIF file name, contents and lammps parameters.
+    """
+    with open(lammpspar['cif_file'], 'rb') as cif:
+        cif_hash = hashlib.sha1(cif.read()).hexdigest()
+    par = {p: v for p, v in lammpspar.items() if p != 'cif_file'}
+    key = [os.path.basename(lammpspar['cif_file']), cif_hash, par]
+    return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
 
 
-def write_lammps_input(simdir, parameters, lammps_input=lammps_input, verbose=True):
+def write_lammps_input(simdir, parameters, lammps_input=lammps_input, verbose=True, base_input=None, data_file=None):
     """
     Write Lammps simulation input file.
 
     Args:
         - simdir (str): Directory to write Lammps input file
         - parameters (Parameters): Lammps simulation parameters
+        - base_input (str): Lammps input file written by lammps_interface (default: None -> in.* file in simdir)
+        - data_file (str): Lammps data file read by the simulation, read_data command is set to its path relative
+                           to simdir (default: None -> data.* file in simdir)
 
     Returns:
         - None: Rewrites Lammps simulation input file to simulation directory
     """
     simpar = parameters.thermof
-    inp_file = glob.glob(os.path.join(simdir, 'in.*'))[0]
+    if base_input is None:
+        base_input = glob.glob(os.path.join(simdir, 'in.*'))[0]
+    inp_file = os.path.join(simdir, os.path.basename(base_input))
     print('II. Updating Lammps input file -> %s' % inp_file) if verbose else None
-    input_lines = read_lines(inp_file)
-    data_file = glob.glob(os.path.join(simdir, 'data.*'))[0]
+    input_lines = read_template(base_input)
+    if data_file is None:
+        data_file = glob.glob(os.path.join(simdir, 'data.*'))[0]
+    else:
+        input_lines = set_data_file(input_lines, os.path.relpath(data_file, simdir))
     simpar['atom_list'] = get_atom_list(data_file)
-    simpar_lines = get_simpar_lines(simpar, simpar_file=lammps_input['simpar'])
-    input_lines += '\n'
-    input_lines += simpar_lines
     print('Adding fixes: %s' % ' | '.join(simpar['fix'])) if verbose else None
-    for fix in simpar['fix']:
-        fix_lines = get_fix_lines(fix, simpar, lammps_input=lammps_input)
-        input_lines += '\n'
-        input_lines += fix_lines
+    input_lines += render_input_lines([simpar], lammps_input=lammps_input)[0]
     write_lines(inp_file, input_lines)
     print('Updating simulation parameters...') if verbose else None
     parameters.thermof['kpar']['log_file'] = 'log.%s' % parameters.thermof['mof']['name']
     parameters.thermof['kpar']['fix'] = None
     parameters.thermof['kpar']['temp'] = parameters.thermof['temperature']
     parameters.thermof['kpar']['thermo_style'] = parameters.thermof['thermo_style']
+    if 'NVE_FLUX' in simpar['fix']:
+        parameters.thermof['kpar']['flux_series'] = 'J_t.dat'
 
 
 def get_fix_lines(fix, simpar, lammps_input=lammps_input):
@@ -87,6 +130,8 @@ def get_fix_lines(fix, simpar, lammps_input=lammps_input):
         fix_lines = get_thexp_lines(simpar, thexp_file=lammps_input['thermal_expansion'])
     elif fix == 'NVE_ANGLE':
         fix_lines = get_nve_improved_angle_lines(simpar, nve_file=lammps_input['nve_improved_angle'])
+    elif fix == 'NVE_FLUX':
+        fix_lines = get_nve_flux_lines(simpar, nve_file=lammps_input['nve_flux'])
     return fix_lines
 
 
@@ -94,90 +139,50 @@ def get_simpar_lines(simpar, simpar_file=lammps_input['simpar']):
     """
     Get input lines for Lammps simulation parameters using thermof_parameters.
     """
-    simpar_lines = read_lines(simpar_file)
-    simpar_lines[1] = 'variable        T equal %i\n' % simpar['temperature']
-    simpar_lines[2] = 'variable        dt equal %.1f\n' % simpar['dt']
-    simpar_lines[3] = 'variable        seed equal %i\n' % simpar['seed']
-    simpar_lines[4] = 'variable        p equal %i\n' % simpar['correlation_length']
-    simpar_lines[5] = 'variable        s equal %i\n' % simpar['sample_interval']
-    simpar_lines[12] = 'thermo          %i\n' % simpar['thermo']
-    simpar_lines[13] = 'thermo_style    custom %s\n' % ' '.join(simpar['thermo_style'])
-    if simpar['dump_xyz'] != 0:
-        simpar_lines[7] = 'variable        txyz equal %i\n' % simpar['dump_xyz']
-        simpar_lines[9] = 'dump_modify     1 element %s\n' % ' '.join(simpar['atom_list'])
-    else:
-        del simpar_lines[7:10]
-    return simpar_lines
+    return render_template(simpar_file, simpar)
 
 
 def get_npt_lines(simpar, npt_file=lammps_input['npt']):
     """
     Get input lines for NPT simulation using thermof_parameters.
     """
-    npt_lines = read_lines(npt_file)
-    npt_lines[1] = 'variable        pdamp      equal %i*${dt}\n' % simpar['npt']['pdamp']
-    npt_lines[2] = 'variable        tdamp      equal %i*${dt}\n' % simpar['npt']['tdamp']
-    npt_lines[4] = 'run             %i\n' % simpar['npt']['steps']
-    if simpar['npt']['restart']:
-        npt_lines.append('write_restart   restart.npt\n')
-    return npt_lines
+    return render_template(npt_file, simpar)
 
 
 def get_nvt_lines(simpar, nvt_file=lammps_input['nvt']):
     """
     Get input lines for NVT simulation using thermof_parameters.
     """
-    nvt_lines = read_lines(nvt_file)
-    nvt_lines[2] = 'run             %i\n' % simpar['nvt']['steps']
-    if simpar['nvt']['restart']:
-        nvt_lines.append('write_restart   restart.nvt\n')
-    return nvt_lines
+    return render_template(nvt_file, simpar)
 
 
 def get_nve_lines(simpar, nve_file=lammps_input['nve']):
     """
     Get input lines for NVE simulation (including thermal conductivity calc.) using thermof_parameters.
     """
-    nve_lines = read_lines(nve_file)
-    if simpar['nve']['equilibration'] >= 0:
-        nve_lines[2] = 'run             %i\n' % simpar['nve']['equilibration']
-    else:
-        nve_lines = nve_lines[4:]
-    nve_lines[42] = 'run             %i\n' % simpar['nve']['steps']
-    if simpar['nve']['restart']:
-        nve_lines.append('write_restart   restart.nve\n')
-    return nve_lines
+    return render_template(nve_file, dict(simpar, nve_equilibration=simpar['nve']['equilibration'] >= 0))
 
 
 def get_nve_improved_angle_lines(simpar, nve_file=lammps_input['nve_improved_angle']):
     """
     Get input lines for NVE simulation (including thermal conductivity calc.) using thermof_parameters.
     """
-    nve_lines = read_lines(nve_file)
-    if simpar['nve']['equilibration'] >= 0:
-        nve_lines[2] = 'run             %i\n' % simpar['nve']['equilibration']
-    else:
-        nve_lines = nve_lines[4:]
-    nve_lines[29] = 'run             %i\n' % simpar['nve']['steps']
-    if simpar['nve']['restart']:
-        nve_lines.append('write_restart   restart.nve\n')
-    return nve_lines
+    return render_template(nve_file, dict(simpar, nve_equilibration=simpar['nve']['equilibration'] >= 0))
+
+
+def get_nve_flux_lines(simpar, nve_file=lammps_input['nve_flux']):
+    """
+    Get input lines for NVE simulation writing raw heat flux time series (J_t.dat) using thermof_parameters.
+    Heat current autocorrelation is calculated after the simulation (see thermof.read.calculate_hcacf).
+    """
+    return render_template(nve_file, dict(simpar, nve_equilibration=simpar['nve']['equilibration'] >= 0))
 
 
 def get_min_lines(simpar, min_file=lammps_input['min']):
     """
     Get input lines for minimization using thermof_parameters.
     """
-    mof = simpar['mof']['name']
-    min_lines = read_lines(min_file)
-    min_lines[2] = 'print           "MinStep,CellMinStep,AtomMinStep,FinalStep,Energy,EDiff" file %s.min.csv screen no\n' % mof
-    min_lines[3] = 'variable        min_eval   equal %.1e\n' % simpar['min']['edif']
-    min_lines[9] = 'minimize        %.1e %.1e %i %i\n' % (simpar['min']['etol'], simpar['min']['ftol'], simpar['min']['maxiter'], simpar['min']['maxeval'])
-    min_lines[14] = 'minimize        %.1e %.1e %i %i\n' % (simpar['min']['etol'], simpar['min']['ftol'], simpar['min']['maxiter'], simpar['min']['maxeval'])
-    min_lines[18] = 'print           "${iter},${CellMinStep},${AtomMinStep},${AtomMinStep},$(pe),${min_E}" append %s.min.csv screen no\n' % mof
-    if simpar['min']['restart']:
-        nve_lines.append('write_restart   restart.min\n')
-    return min_lines
+    return render_template(min_file, simpar)
 
 
 def get_tc_lines(simpar, tc_file=lammps_input['thermal_conductivity']):
@@ -191,11 +196,7 @@ def get_tc_lines(simpar, tc_file=lammps_input['thermal_conductivity']):
     Returns:
         - list: List of Lammps input lines for thermal conductivity calculations
     """
-    tc_lines = read_lines(tc_file)
-    tc_lines[1] = 'variable        T equal %.1f\n' % simpar['temperature']
-    tc_lines[2] = 'variable        dt equal %.1f\n' % simpar['dt']
-    tc_lines[3] = 'variable        seed equal %i\n' % simpar['seed']
-    return tc_lines
+    return render_template(tc_file, simpar)
 
 
 def get_thexp_lines(simpar, thexp_file=lammps_input['thermal_expansion']):
@@ -209,20 +210,90 @@ def get_thexp_lines(simpar, thexp_file=lammps_input['thermal_expansion']):
     Returns:
         - list: List of Lammps input lines for thermal expansion calculation
     """
-    thexp_lines = read_lines(thexp_file)
-    thexp_lines[1] = 'variable        pdamp      equal %i*${dt}\n' % simpar['thexp']['pdamp']
-    thexp_lines[2] = 'variable        tdamp      equal %i*${dt}\n' % simpar['thexp']['tdamp']
-    thexp_lines[4] = 'fix             thexp all print %i "$(step),$(vol),$(enthalpy)" file %s screen no title "Step,Volume,Enthalpy"\n' % (simpar['thexp']['print'], simpar['thexp']['file'])
-    thexp_lines[5] = 'run             %i\n' % simpar['thexp']['steps']
-    return thexp_lines
+    return render_template(thexp_file, simpar)
+
+
+def render_input_lines(simpar_list, lammps_input=lammps_input):
+    """
+    Render simulation parameter and fix lines for many sets of thermof parameters in one call.
+    Templates are compiled once per process and only rendered for each parameter set.
+
+    Args:
+        - simpar_list (list): List of thermof parameters (with atom_list)
+        - lammps_input (dict): Lammps input templates (see thermof.sample.lammps_input)
+
+    Returns:
+        - list: Lammps input lines (appended to lammps_interface input) for each parameter set
+    """
+    input_lines = []
+    for simpar in simpar_list:
+        lines = ['\n'] + get_simpar_lines(simpar, simpar_file=lammps_input['simpar'])
+        for fix in simpar['fix']:
+            lines += ['\n'] + get_fix_lines(fix, simpar, lammps_input=lammps_input)
+        input_lines.append(lines)
+    return input_lines
 
 
 def get_atom_list(data_file):
     """
     Reads list of atoms from the data file created by lammps_interface for dump_modify command.
+    Atom list is read once per process for each data file (until the file is modified).
+    """
+    stat = os.stat(data_file)
+    return list(read_atom_list(os.path.abspath(data_file), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=64)
+def read_atom_list(data_file, mtime, size):
+    """
+    Reads list of atoms from the data file, cached for file path, modification time and size.
     """
     with open(data_file, 'r') as ld:
         ld_lines = ld.readlines()
     atom_lines = ld_lines[ld_lines.index('Masses\n') + 2:ld_lines.index('Bond Coeffs\n') - 1]
     atoms = [line.split()[3][:2].replace('_', '') for line in atom_lines]
-    return atoms
+    return tuple(atoms)
+
+
+def set_data_file(input_lines, data_file):
+    """
+    Set data file path of read_data command in Lammps input lines.
+    """
+    return ['read_data       %s\n' % data_file if line.startswith('read_data') else line for line in input_lines]
+
+
+def share_data_file(data_file, run_dir, share_data=None, scheduler=None):
+    """
+    Make Lammps data file available to a run directory.
+    The 'relative' mode can not be used with the slurm-scratch scheduler as its job script only copies
+    files in the run directory ({data,in,job,simpar}.*) to scratch.
+
+    Args:
+        - data_file (str): Lammps data file in simulation directory
+        - run_dir (str): Run directory
+        - share_data (str): None -> copy data file | 'link' -> hard link data file (copied if hard links are
+                            not supported) | 'relative' -> data file is not copied and read from simulation directory
+        - scheduler (str): Job scheduler of the run (pbs | slurm | slurm-scratch)
+
+    Returns:
+        - str: Data file to be read by the run
+    """
+    if share_data == 'relative':
+        if scheduler == 'slurm-scratch':
+            raise ShareDataError('Relative data file is not copied to scratch by slurm-scratch jobs (use link)')
+        return data_file
+    elif share_data not in [None, 'link']:
+        raise ShareDataError('Data file sharing mode not recognized: %s (link | relative)' % share_data)
+    run_data_file = os.path.join(run_dir, os.path.basename(data_file))
+    if share_data == 'link':
+        try:
+            os.link(data_file, run_data_file)
+            return run_data_file
+        except OSError:
+            pass
+    shutil.copy(data_file, run_data_file)
+    return run_data_file
+
+
+class ShareDataError(Exception):
+    pass
@@ -0,0 +1,158 @@
+"""
+Render Lammps input and job submission files from templates with named placeholders
+
+Template syntax:
+    - {{name}} / {{name:%fmt}}: Value of name in context formatted with printf style format (default: %s).
+      Nested values are accessed with dots (ex: {{npt.steps:%i}}) and lists are joined with spaces.
+    - #@if name / #@if not name ... #@endif: Lines in between are rendered only if value of name is true (false).
+"""
+import os
+import re
+from functools import lru_cache
+
+
+placeholder = re.compile(r'\{\{\s*([\w.]+)\s*(?::\s*(%[^}]*?))?\s*\}\}')
+
+
+class Template:
+    """
+    Template compiled into literal text and placeholders once, which can be rendered for many contexts.
+    """
+    def __init__(self, text, name='<template>'):
+        """
+        Compile template text.
+
+        Args:
+            - text (str): Template text
+            - name (str): Template name (used in error messages)
+        """
+        self.name = name
+        self.nodes = self.compile(text.splitlines(keepends=True))
+
+    def __repr__(self):
+        return "<Template: %s>" % self.name
+
+    def compile(self, lines):
+        """
+        Parse template lines into nodes: str (literal line), list (line with placeholders)
+        and tuple (name, negate, nodes) for conditional blocks.
+        """
+        blocks = [[]]
+        for line_number, line in enumerate(lines, start=1):
+            tokens = line.split()
+            if len(tokens) > 0 and tokens[0] == '#@if':
+                negate = len(tokens) == 3 and tokens[1] == 'not'
+                if len(tokens) != 2 + negate:
+                    raise TemplateSyntaxError('%s line %i: expected "#@if [not] name"' % (self.name, line_number))
+                block = (tokens[-1].split('.'), negate, [])
+                blocks[-1].append(block)
+                blocks.append(block[2])
+            elif len(tokens) > 0 and tokens[0] == '#@endif':
+                if len(blocks) == 1:
+                    raise TemplateSyntaxError('%s line %i: #@endif without #@if' % (self.name, line_number))
+                blocks.pop()
+            elif '{{' in line:
+                parts, start = [], 0
+                for match in placeholder.finditer(line):
+                    parts.append(line[start:match.start()])
+                    parts.append((match.group(1).split('.'), match.group(2) or '%s'))
+                    start = match.end()
+                parts.append(line[start:])
+                blocks[-1].append(parts)
+            else:
+                blocks[-1].append(line)
+        if len(blocks) > 1:
+            raise TemplateSyntaxError('%s: #@if without #@endif' % self.name)
+        return blocks[0]
+
+    def render(self, context):
+        """
+        Render template for given context.
+
+        Args:
+            - context (dict): Values for placeholders and conditions
+
+        Returns:
+            - list: Rendered lines
+        """
+        lines = []
+        self.render_nodes(self.nodes, context, lines)
+        return lines
+
+    def render_all(self, contexts):
+        """
+        Render template for many contexts at once.
+
+        Args:
+            - contexts (list): List of contexts (dict)
+
+        Returns:
+            - list: Rendered lines for each context
+        """
+        return [self.render(context) for context in contexts]
+
+    def render_nodes(self, nodes, context, lines):
+        for node in nodes:
+            if isinstance(node, str):
+                lines.append(node)
+            elif isinstance(node, list):
+                lines.append(''.join([part if isinstance(part, str) else self.format(context, *part) for part in node]))
+            elif bool(self.lookup(context, node[0])) != node[1]:
+                self.render_nodes(node[2], context, lines)
+
+    def lookup(self, context, keys):
+        """
+        Get value of a (nested) placeholder name from context.
+        """
+        value = context
+        try:
+            for key in keys:
+                value = value[key]
+        except (KeyError, TypeError):
+            raise TemplateKeyError('%s: no value for "%s"' % (self.name, '.'.join(keys)))
+        return value
+
+    def format(self, context, keys, fmt):
+        value = self.lookup(context, keys)
+        if isinstance(value, (list, tuple)):
+            return ' '.join([fmt % v for v in value])
+        return fmt % value
+
+
+def load_template(file_name):
+    """
+    Load compiled template from file. Templates are compiled once per process (until the file is modified).
+    """
+    stat = os.stat(file_name)
+    return compile_template(os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=64)
+def compile_template(file_name, mtime, size):
+    """
+    Compile template file, cached for file path, modification time and size.
+    """
+    with open(file_name, 'r') as f:
+        return Template(f.read(), name=os.path.basename(file_name))
+
+
+def render_template(file_name, context):
+    """
+    Render template file for given context.
+
+    Args:
+        - file_name (str): Template file
+        - context (dict): Values for placeholders and conditions
+
+    Returns:
+        - list: Rendered lines
+    """
+    return load_template(file_name).render(context)
+
+
+class TemplateSyntaxError(Exception):
+    pass
+
+
+class TemplateKeyError(Exception):
+    pass
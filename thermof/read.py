@@ -5,53 +5,209 @@ Read Lammps output files for thermal conductivity calculations
 """
 import os
 import math
+import json
 import yaml
 import csv
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from thermof.reldist import reldist
+from thermof.cache import RunCache, get_run_cache
+from thermof.correlation import block_autocorrelation, block_cross_correlation
+from thermof.stats import batch_statistics, bootstrap_runs, block_bootstrap
+from thermof.cepstral import cepstral_flux
+from thermof.spectrum import hcacf_spectrum, cumulative_spectrum
+from thermof.estimate import time_window, estimate_plateau, prefix_sums, window_average, window_scan
 from thermof.parameters import k_parameters, thermo_headers
 
 
-def read_thermal_flux(file_path, dt=k_parameters['dt'], start=200014, j_index=3):
+def read_thermal_flux(file_path, dt=k_parameters['dt'], start=None, j_index=3, array=False):
     """Read thermal flux autocorellation vs time data from Lammps simulation output file
 
     Args:
         - file_path (str): Thermal flux autocorellation file generated by Lammps
         - dt (int): Sampling interval (fs). Can be calculated by multiplying timestep with sampling interval ($s) used for autocorrelation
-        - start (int): Index of the line to start reading flux autocorrelation (corresponds to last function)
+        - start (int): Index of the line to start reading flux autocorrelation (default: None -> last correlation block)
         - j_index (int): Index of thermal flux in file
+        - array (bool): Return numpy arrays instead of lists
 
     Returns:
         - list: thermal flux autocorrelation function
         - list: time
     """
     with open(file_path, 'r') as f:
-        flux_lines = f.readlines()
-    flux, time = [], []
-    for line in flux_lines[start:]:
-        ls = line.split()
-        t = (float(ls[0]) - 1) * dt / 1000.0
-        flux.append(float(ls[j_index]))
-        time.append(t)
-    return flux, time
+        if start is None:
+            block_start, n_rows = find_last_block(file_path)
+            f.seek(block_start)
+            flux_data = np.loadtxt(f, usecols=(0, j_index), ndmin=2, max_rows=n_rows)
+        else:
+            flux_data = np.loadtxt(f, skiprows=start, usecols=(0, j_index), ndmin=2)
+    time = (flux_data[:, 0] - 1) * dt / 1000.0
+    flux = flux_data[:, 1]
+    if array:
+        return flux, time
+    return flux.tolist(), time.tolist()
+
+
+def read_flux_series(file_path, directions=['x', 'y', 'z']):
+    """Read raw heat flux time series written by Lammps fix ave/time (see thermof/sample/in.nve_flux)
+
+    Args:
+        - file_path (str): Heat flux time series file with timestep and flux columns for each direction
+        - directions (list): Direction name for each flux column
+
+    Returns:
+        - dict: Heat flux time series (ndarray) for each direction
+        - ndarray: Timesteps
+    """
+    data = np.loadtxt(file_path, comments='#', ndmin=2)
+    return {d: data[:, i + 1] for i, d in enumerate(directions)}, data[:, 0]
+
+
+def calculate_hcacf(file_path, dt=k_parameters['dt'], correlation_length=None, n_blocks=1, directions=['x', 'y', 'z'],
+                    return_blocks=False, flux=None):
+    """Calculate heat current autocorrelation function from raw heat flux time series using FFT
+
+    Args:
+        - file_path (str): Heat flux time series file (see read_flux_series)
+        - dt (int): Sampling interval (fs) of the time series
+        - correlation_length (int): Number of correlation time lags (default: None -> length of a block)
+        - n_blocks (int): Number of blocks to average the autocorrelation over
+        - directions (list): Direction name for each flux column
+        - return_blocks (bool): Also return autocorrelation function of each block
+        - flux (ndarray): Heat flux with shape (samples, directions) if already read (default: None -> read file)
+
+    Returns:
+        - dict: Thermal flux autocorrelation function (list) for each direction
+        - dict: Standard error of the block averaged autocorrelation function (list) for each direction
+        - list: time
+        - dict: Autocorrelation function of each block (ndarray with shape (blocks, lags)) for each direction
+                (only if return_blocks)
+    """
+    if flux is None:
+        series, timesteps = read_flux_series(file_path, directions=directions)
+        flux = np.array([series[d] for d in directions]).T
+    hcacf, hcacf_err, blocks = block_autocorrelation(flux, n_lags=correlation_length, n_blocks=n_blocks,
+                                                     return_blocks=True)
+    time = np.arange(len(hcacf)) * dt / 1000.0
+    flux = {d: hcacf[:, i].tolist() for i, d in enumerate(directions)}
+    flux_err = {d: hcacf_err[:, i].tolist() for i, d in enumerate(directions)}
+    if return_blocks:
+        return flux, flux_err, time.tolist(), {d: blocks[:, :, i] for i, d in enumerate(directions)}
+    return flux, flux_err, time.tolist()
+
+
+def calculate_hcacf_tensor(file_path, dt=k_parameters['dt'], correlation_length=None, n_blocks=1,
+                           directions=['x', 'y', 'z'], return_blocks=False, flux=None):
+    """Calculate all heat current cross-correlations <J_i(0) J_j(t)> from raw heat flux time series
+    in a single FFT pass (diagonal elements are the heat current autocorrelation functions)
+
+    Args:
+        - file_path (str): Heat flux time series file (see read_flux_series)
+        - dt (int): Sampling interval (fs) of the time series
+        - correlation_length (int): Number of correlation time lags (default: None -> length of a block)
+        - n_blocks (int): Number of blocks to average the correlation over
+        - directions (list): Direction name for each flux column
+        - return_blocks (bool): Also return correlation of each block
+        - flux (ndarray): Heat flux with shape (samples, directions) if already read (default: None -> read file)
+
+    Returns:
+        - ndarray: Heat current correlation with shape (lags, directions, directions)
+        - ndarray: Standard error of the block averaged correlation
+        - list: time
+        - ndarray: Correlation of each block with shape (blocks, lags, directions, directions) (only if return_blocks)
+    """
+    if flux is None:
+        series, timesteps = read_flux_series(file_path, directions=directions)
+        flux = np.array([series[d] for d in directions]).T
+    correlation, correlation_err, blocks = block_cross_correlation(flux, n_lags=correlation_length, n_blocks=n_blocks,
+                                                                   return_blocks=True)
+    time = (np.arange(len(correlation)) * dt / 1000.0).tolist()
+    if return_blocks:
+        return correlation, correlation_err, time, blocks
+    return correlation, correlation_err, time
+
+
+def calculate_k_tensor(correlation, time, k_par=k_parameters, directions=['x', 'y', 'z']):
+    """Calculate thermal conductivity tensor from heat current cross-correlations (see calculate_hcacf_tensor).
+    Each element is estimated with the method selected in calculation parameters (see estimate_run_k) and
+    principal conductivities and directions are found from the symmetric part of the tensor.
+
+    Args:
+        - correlation (ndarray): Heat current correlation with shape (lags, directions, directions)
+        - time (list): Simulation time
+        - k_par (dict): Dictionary of calculation parameters
+        - directions (list): Direction names
+
+    Returns:
+        - dict: k_est (thermal conductivity tensor), eigenvalues (principal conductivities in ascending order),
+                principal_directions (unit vector for each eigenvalue) and directions
+    """
+    k = calculate_k(correlation, k_par=k_par, array=True)
+    n_directions = len(directions)
+    k_est = np.array([[float(estimate_run_k(k[:, i, j], time, k_par=k_par)[0]) for j in range(n_directions)]
+                      for i in range(n_directions)])
+    eigenvalues, eigenvectors = np.linalg.eigh((k_est + k_est.T) / 2)
+    return dict(k_est=k_est.tolist(), eigenvalues=eigenvalues.tolist(), principal_directions=eigenvectors.T.tolist(),
+                directions=list(directions))
+
 
+def find_last_block(file_path, chunk_size=65536):
+    """Find the last correlation block written by Lammps fix ave/correlate by scanning the file from the end.
+    Each block starts with a "timestep n_rows" line followed by n_rows lines of correlation data.
+
+    Args:
+        - file_path (str): Thermal flux autocorellation file generated by Lammps
+        - chunk_size (int): Number of bytes read at a time while scanning backwards
 
-def calculate_k(flux, k_par=k_parameters):
+    Returns:
+        - int: Byte offset of the first data line of the last block
+        - int: Number of rows in the last block
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail, n_checked = b'', 0
+        while position > 0:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            tail = f.read(read_size) + tail
+            lines = tail.split(b'\n')
+            # The first line might be cut by the chunk boundary unless the beginning of the file is reached
+            first_line = 0 if position == 0 else 1
+            line_ends = np.cumsum([len(line) + 1 for line in lines]) + position
+            for line_index in range(len(lines) - 1 - n_checked, first_line - 1, -1):
+                line = lines[line_index]
+                if line.startswith(b'#'):
+                    continue
+                ls = line.split()
+                if len(ls) == 2:
+                    return int(line_ends[line_index]), int(ls[1])
+            n_checked = len(lines) - first_line
+    raise FluxFileNotFoundError('No correlation block found in flux file: %s' % file_path)
+
+
+def calculate_k(flux, k_par=k_parameters, array=False):
     """Calculate thermal conductivity (W/mK) from thermal flux autocorrelation function
 
     Args:
         - flux (list): Thermal flux autocorellation read by read_thermal_flux method
+                       (or array of correlations with time along the first axis)
         - k_par (dict): Dictionary of calculation parameters
+        - array (bool): Return numpy array instead of list
 
     Returns:
         - list: Thermal conductivity autocorrelation function
     """
-    k = flux[0] / 2 * k_par['volume'] * k_par['dt'] / (k_par['kb'] * math.pow(k_par['temp'], 2)) * k_par['conv']
-    k_data = [k]
-    for J in flux[1:]:
-        k = k + J * k_par['volume'] * k_par['dt'] / (k_par['kb'] * math.pow(k_par['temp'], 2)) * k_par['conv']
-        k_data.append(k)
-    return k_data
+    # Scaling is applied element-wise in the same order as the running sum so the results
+    # are identical (bit by bit) to integrating the flux one value at a time.
+    k_terms = np.array(flux, dtype=float)
+    k_terms[0] = k_terms[0] / 2
+    k_terms = k_terms * k_par['volume'] * k_par['dt'] / (k_par['kb'] * math.pow(k_par['temp'], 2)) * k_par['conv']
+    k_data = np.cumsum(k_terms, axis=0)
+    if array:
+        return k_data
+    return k_data.tolist()
 
 
 def estimate_k(k_data, time, t0=5, t1=10):
@@ -67,10 +223,95 @@ def estimate_k(k_data, time, t0=5, t1=10):
     Returns:
         - float: Estimate thermal conductivity
     """
-    start, end = time.index(t0), time.index(t1)
+    start, end = time_window(time, t0, t1)
     return (sum(k_data[start:end]) / len(k_data[start:end]))
 
 
+def estimate_run_k(k_data, time, k_par=k_parameters):
+    """ Estimate thermal conductivity with the method selected in calculation parameters (k_est_method).
+    'window' averages k between t0 and t1 (see estimate_k), 'first_dip' and 'slope' detect the plateau
+    of k automatically (see thermof.estimate.estimate_plateau). 'cepstral' needs the raw heat flux
+    (see estimate_cepstral_k), integrated k is averaged between t0 and t1 instead.
+
+    Args:
+        - k_data (list): Thermal conductivity autocorrelation function
+        - time (list): Simulation timestep
+        - k_par (dict): Dictionary of calculation parameters
+
+    Returns:
+        - float: Estimate thermal conductivity
+        - list: Start and end time of the window used for the estimate
+    """
+    method = k_par.get('k_est_method', 'window')
+    if method in ['window', 'cepstral']:
+        return estimate_k(k_data, time, t0=k_par['t0'], t1=k_par['t1']), [k_par['t0'], k_par['t1']]
+    k_est, window = estimate_plateau(k_data, time, method=method, window=k_par.get('plateau_window', 1.0),
+                                     tol=k_par.get('plateau_tol', 0.01))
+    return float(k_est), window.tolist()
+
+
+def estimate_cepstral_k(flux, k_par=k_parameters, directions=['x', 'y', 'z']):
+    """ Estimate thermal conductivity and its statistical error from heat flux time series
+    using cepstral analysis of the flux power spectrum (see thermof.cepstral).
+
+    Args:
+        - flux (ndarray): Heat flux with shape (samples, directions)
+        - k_par (dict): Dictionary of calculation parameters
+        - directions (list): Heat flux directions
+
+    Returns:
+        - dict: k_est, k_err and n_coefficients (number of cepstral coefficients) for each direction and iso
+    """
+    cepstral = cepstral_flux(flux, cutoff=k_par.get('cepstral_cutoff', 1.0),
+                             max_coefficients=k_par.get('cepstral_max_coefficients'))
+    # calculate_k integrates HCACF(0) / 2 + HCACF(1) + ... which is half of the zero frequency spectrum
+    scale = k_par['volume'] * k_par['dt'] / (k_par['kb'] * math.pow(k_par['temp'], 2)) * k_par['conv'] / 2
+    keys = directions + ['iso']
+    return dict(k_est=dict(zip(keys, (cepstral['s0'] * scale).tolist())),
+                k_err=dict(zip(keys, (cepstral['s0_err'] * scale).tolist())),
+                n_coefficients=dict(zip(keys, cepstral['n_coefficients'].tolist())))
+
+
+def estimate_block_k(hcacf_blocks, time, k_par=k_parameters):
+    """ Estimate thermal conductivity for each block of the heat current autocorrelation function
+    calculated from a flux series (see calculate_hcacf), used for block bootstrap uncertainty.
+
+    Args:
+        - hcacf_blocks (dict): Autocorrelation function of each block (ndarray with shape (blocks, lags)) for each direction
+        - time (list): Simulation time
+        - k_par (dict): Dictionary of calculation parameters
+
+    Returns:
+        - dict: Thermal conductivity estimate of each block (list) for each direction (and 'iso' if isotropic)
+    """
+    k_blocks = {d: [calculate_k(block, k_par=k_par) for block in blocks] for d, blocks in hcacf_blocks.items()}
+    if k_par['isotropic']:
+        directions = list(hcacf_blocks.keys())
+        n_blocks = len(k_blocks[directions[0]])
+        k_blocks['iso'] = [average_k([k_blocks[d][i] for d in directions]) for i in range(n_blocks)]
+    return {d: [float(estimate_run_k(k, time, k_par=k_par)[0]) for k in k_blocks[d]] for d in k_blocks}
+
+
+def estimate_window_k(run_data, t0=5, t1=10, direction='iso'):
+    """ Estimate thermal conductivity of a run between t0 and t1 in constant time using prefix sums
+    stored in run data (k_prefix, see prefix_sums calculation parameter) or calculated from k.
+
+    Args:
+        - run_data (dict): Run data read by read_run
+        - t0 (float): Time to start taking average of k values
+        - t1 (float): Time to end taking average of k values
+        - direction (str): Thermal flux direction
+
+    Returns:
+        - float: Estimate thermal conductivity
+    """
+    if 'k_prefix' in run_data:
+        k_prefix = run_data['k_prefix'][direction]
+    else:
+        k_prefix = prefix_sums(run_data['k'][direction])
+    return float(window_average(k_prefix, run_data['time'], t0, t1))
+
+
 def average_k(k_runs):
     """Calculate average thermal conductivity for multiple runs
 
@@ -86,10 +327,7 @@ def average_k(k_runs):
         if run_frames != n_frames:
             raise TimestepsMismatchError('Number of timesteps for inital run not equal to run %i (%i != %i)'
                                          % (run_index, n_frames, run_frames))
-    avg_k_data = []
-    for timestep in range(n_frames):
-        avg_k_data.append(sum([k[timestep] for k in k_runs]) / len(k_runs))
-    return avg_k_data
+    return (np.sum(np.array(k_runs, dtype=float), axis=0) / len(k_runs)).tolist()
 
 
 def get_flux_directions(run_dir, k_par=k_parameters, verbose=True):
@@ -118,48 +356,93 @@ def get_flux_directions(run_dir, k_par=k_parameters, verbose=True):
     return flux_files, directions
 
 
-def read_run(run_dir, k_par=k_parameters, t0=5, t1=10, verbose=True):
+def read_run(run_dir, k_par=k_parameters, t0=5, t1=10, verbose=True, return_key=False):
     """Read single Lammps simulation run
     Args:
         - run_dir (str): Lammps simulation directory for single run
         - k_par (dict): Dictionary of calculation parameters
         - verbose (bool): Print information about the run
+        - return_key (bool): Also return the cache key used for the run (None if caching is not selected)
 
     Returns:
         - dict: Run data containing thermal conductivity, estimate, timesteps, run name
     """
     run_data = dict(name=os.path.basename(run_dir), k={}, k_est={}, time=[], directions=[], hcacf={})
-    trial_data = []
-    runs_id = []
+    run_cache, cache_key = get_run_cache(k_par), None
+    if run_cache is not None and os.path.isdir(run_dir):
+        cache_key = run_cache.key(run_dir, k_par)
+        cached_run_data = run_cache.load(cache_key)
+        if cached_run_data is not None:
+            if k_par['read_thermo'] and 'vol' in k_par['thermo_style']:
+                update_volume(cached_run_data['thermo'], k_par, verbose=verbose)
+                cached_run_data['volume'] = k_par['volume']
+            print('%-9s -> Read from cache' % run_data['name']) if verbose else None
+            return (cached_run_data, cache_key) if return_key else cached_run_data
     if os.path.isdir(run_dir):
         if k_par['read_thermo']:
             print('Reading log file -> %s' % k_par['log_file']) if verbose else None
-            headers = get_thermo_headers(k_par['thermo_style'])
-            thermo_data = read_log(os.path.join(run_dir, '%s' % k_par['log_file']), headers=headers)
-            fix = k_par['fix']
-            run_data['thermo'] = read_thermo(thermo_data, headers=k_par['thermo_style'], fix=fix)
+            log_data = parse_log(os.path.join(run_dir, '%s' % k_par['log_file']),
+                                 thermo_style=k_par['thermo_style'], fix=k_par['fix'])
+            run_data['thermo'] = {f: {h: log_data['thermo'][f][h].tolist() for h in log_data['thermo'][f]}
+                                  for f in log_data['thermo']}
+            run_data['loop'] = log_data['loop']
             if 'vol' in k_par['thermo_style']:
-                if fix is None:
-                    fix = list(range(len(thermo_data)))
-                    k_par['fix'] = fix
-                k_par['initial_volume'] = k_par['volume']
-                k_par['volume'] = run_data['thermo'][fix[-1]]['vol'][-1]
-                k_par['deltaV'] = (k_par['volume'] - k_par['initial_volume']) / k_par['initial_volume'] * 100
-                print('Volume read as: %.3f | Delta V: %.2f %%' % (k_par['volume'], k_par['deltaV'])) if verbose else None
-        flux_files, directions = get_flux_directions(run_dir, k_par=k_par, verbose=verbose)
+                update_volume(run_data['thermo'], k_par, verbose=verbose)
+                run_data['volume'] = k_par['volume']
+        series_file = os.path.join(run_dir, str(k_par.get('flux_series')))
+        if k_par.get('flux_series') is not None and os.path.exists(series_file):
+            print('Calculating HCACF from flux series -> %s' % k_par['flux_series']) if verbose else None
+            series, timesteps = read_flux_series(series_file)
+            flux_series = np.array([series[d] for d in ['x', 'y', 'z']]).T
+            if k_par.get('k_est_method', 'window') == 'cepstral':
+                cepstral = estimate_cepstral_k(flux_series, k_par=k_par)
+                run_data['k_err'], run_data['n_cepstral'] = cepstral['k_err'], cepstral['n_coefficients']
+            if k_par.get('k_tensor'):
+                correlation, correlation_err, time, blocks = calculate_hcacf_tensor(series_file, dt=k_par['dt'],
+                                                                                    correlation_length=k_par.get('correlation_length'),
+                                                                                    n_blocks=k_par.get('n_blocks', 1),
+                                                                                    return_blocks=True, flux=flux_series)
+                directions = ['x', 'y', 'z']
+                hcacf = {d: correlation[:, i, i].tolist() for i, d in enumerate(directions)}
+                run_data['hcacf_err'] = {d: correlation_err[:, i, i].tolist() for i, d in enumerate(directions)}
+                hcacf_blocks = {d: blocks[:, :, i, i] for i, d in enumerate(directions)}
+                run_data['k_tensor'] = calculate_k_tensor(correlation, time, k_par=k_par, directions=directions)
+            else:
+                hcacf, run_data['hcacf_err'], time, hcacf_blocks = calculate_hcacf(series_file, dt=k_par['dt'],
+                                                                                   correlation_length=k_par.get('correlation_length'),
+                                                                                   n_blocks=k_par.get('n_blocks', 1),
+                                                                                   return_blocks=True, flux=flux_series)
+                directions = list(hcacf.keys())
+            if k_par.get('bootstrap') and k_par.get('n_blocks', 1) > 1:
+                run_data['k_est_blocks'] = estimate_block_k(hcacf_blocks, time, k_par=k_par)
+        else:
+            flux_files, directions = get_flux_directions(run_dir, k_par=k_par, verbose=verbose)
+            hcacf = {}
+            for direction, flux_file in zip(directions, flux_files):
+                hcacf[direction], time = read_thermal_flux(flux_file, dt=k_par['dt'])
         run_message = '%-9s ->' % run_data['name']
-        for direction, flux_file in zip(directions, flux_files):
-            flux, time = read_thermal_flux(flux_file, dt=k_par['dt'])
+        for direction in directions:
+            flux = hcacf[direction]
             run_data['hcacf'][direction] = flux
             k = calculate_k(flux, k_par=k_par)
             run_data['k'][direction] = k
-            run_data['k_est'][direction] = estimate_k(k, time, t0=k_par['t0'], t1=k_par['t1'])
+            if 'n_cepstral' in run_data:
+                run_data['k_est'][direction] = cepstral['k_est'][direction]
+            else:
+                run_data['k_est'][direction], window = estimate_run_k(k, time, k_par=k_par)
+                if k_par.get('k_est_method', 'window') not in ['window', 'cepstral']:
+                    run_data.setdefault('k_window', {})[direction] = window
             run_message += ' k: %.3f W/mK (%s) |' % (run_data['k_est'][direction], direction)
         if k_par['read_walltime']:
-            run_data['walltime'] = read_walltime(os.path.join(run_dir, '%s' % k_par['log_file']))
+            if k_par['read_thermo'] and log_data['walltime'] is not None:
+                run_data['walltime'] = log_data['walltime']
+            else:
+                run_data['walltime'] = read_walltime(os.path.join(run_dir, '%s' % k_par['log_file']))
         if k_par['read_thexp']:
             run_data['thexp'] = read_thermal_expansion(os.path.join(run_dir, '%s' % k_par['thexp_file']))
             print('Thermal expansion read') if verbose else None
+        if k_par['read_info'] and os.path.exists(os.path.join(run_dir, 'run_info.yaml')):
+            run_data['info'] = read_run_info(run_dir)
         run_data['time'] = time
         run_data['directions'] = directions
         print(run_message) if verbose else None
@@ -168,33 +451,199 @@ def read_run(run_dir, k_par=k_parameters, t0=5, t1=10, verbose=True):
     if k_par['isotropic']:
         run_data['k']['iso'] = average_k([run_data['k'][d] for d in directions])
         run_data['hcacf']['iso'] = average_k([run_data['hcacf'][d] for d in directions])
-        run_data['k_est']['iso'] = estimate_k(run_data['k']['iso'], run_data['time'], t0=k_par['t0'], t1=k_par['t1'])
+        if 'n_cepstral' in run_data:
+            run_data['k_est']['iso'] = cepstral['k_est']['iso']
+        else:
+            run_data['k_est']['iso'], window = estimate_run_k(run_data['k']['iso'], run_data['time'], k_par=k_par)
+            if k_par.get('k_est_method', 'window') not in ['window', 'cepstral']:
+                run_data['k_window']['iso'] = window
         print('Isotropic -> k: %.3f W/mK from %i directions' % (run_data['k_est']['iso'], len(directions))) if verbose else None
+    if k_par.get('prefix_sums'):
+        run_data['k_prefix'] = {direction: prefix_sums(k).tolist() for direction, k in run_data['k'].items()}
+    if cache_key is not None:
+        run_cache.save(cache_key, run_data)
+    return (run_data, cache_key) if return_key else run_data
+
+
+def update_volume(thermo, k_par, verbose=True):
+    """Update volume in calculation parameters with the final volume read from thermo data
+
+    Args:
+        - thermo (dict): Thermo data for all fixes read by read_thermo
+        - k_par (dict): Dictionary of calculation parameters
 
-    return run_data
+    Returns:
+        - None: Updates volume, initial_volume and deltaV in k_par
+    """
+    fix = k_par['fix']
+    if fix is None:
+        fix = list(range(len(thermo)))
+        k_par['fix'] = fix
+    k_par['initial_volume'] = k_par['volume']
+    k_par['volume'] = thermo[fix[-1]]['vol'][-1]
+    k_par['deltaV'] = (k_par['volume'] - k_par['initial_volume']) / k_par['initial_volume'] * 100
+    print('Volume read as: %.3f | Delta V: %.2f %%' % (k_par['volume'], k_par['deltaV'])) if verbose else None
 
 
-def read_trial(trial_dir, k_par=k_parameters, verbose=True):
+def read_trial(trial_dir, k_par=k_parameters, verbose=True, workers=None, incremental=False):
     """Read Lammps simulation trial with any number of runs
 
     Args:
         - trial_dir (str): Lammps simulation directory including directories for multiple runs
         - k_par (dict): Dictionary of calculation parameters
         - verbose (bool): Print information about the run
+        - workers (int): Number of processes to read runs in parallel (default: None -> serial)
+        - incremental (bool): Only parse new or modified runs (see read_runs_incremental)
 
     Returns:
         - dict: Trial data containing thermal conductivity, estimate, timesteps, run name for each run
     """
     trial = dict(runs=[], data={}, name=os.path.basename(trial_dir))
     print('\n------ %s ------' % trial['name']) if verbose else None
-    run_list = [os.path.join(trial_dir, run) for run in os.listdir(trial_dir)
-                if os.path.isdir(os.path.join(trial_dir, run))]
-    for run in run_list:
-        run_data = read_run(run, k_par=k_par, verbose=verbose)
-        trial['data'][run_data['name']] = run_data
-        trial['runs'].append(run_data['name'])
-    if k_par['average']:
+    run_list = get_run_list(trial_dir)
+    if incremental:
+        runs, errors = read_runs_incremental(run_list, trial_dir, k_par=k_par, verbose=verbose, workers=workers)
+    else:
+        runs, errors = read_runs(run_list, k_par=k_par, verbose=verbose, workers=workers)
+    return collect_trial(trial, run_list, runs, errors, k_par=k_par)
+
+
+def get_run_list(trial_dir):
+    """Return list of run directories in a trial directory (hidden directories are ignored)"""
+    return [os.path.join(trial_dir, run) for run in sorted(os.listdir(trial_dir))
+            if os.path.isdir(os.path.join(trial_dir, run)) and not run.startswith('.')]
+
+
+def read_runs(run_list, k_par=k_parameters, verbose=True, workers=None, return_keys=False):
+    """Read multiple Lammps simulation runs either serially or in parallel using a process pool.
+    When read in parallel exceptions are captured per run so a broken run does not stop the others.
+
+    Args:
+        - run_list (list): List of Lammps simulation run directories
+        - k_par (dict): Dictionary of calculation parameters
+        - verbose (bool): Print information about the run
+        - workers (int): Number of processes to read runs in parallel (default: None -> serial)
+        - return_keys (bool): Also return the cache key used for each run (see read_run)
+
+    Returns:
+        - list: Run data for each run in the same order as run_list (None if the run could not be read)
+        - list: Error message for each run (None if the run was read, or if runs are read serially)
+    """
+    if workers is None:
+        results, errors = [read_run(run, k_par=k_par, verbose=verbose, return_key=True) for run in run_list], None
+    else:
+        results, errors = [], []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(read_run, run, k_par=k_par, verbose=verbose, return_key=True) for run in run_list]
+            for run, future in zip(run_list, futures):
+                try:
+                    results.append(future.result())
+                    errors.append(None)
+                except Exception as e:
+                    results.append((None, None))
+                    errors.append('%s: %s' % (type(e).__name__, e))
+                    print('%-9s -> Could not be read (%s)' % (os.path.basename(run), errors[-1])) if verbose else None
+    runs = [run_data for run_data, cache_key in results]
+    if workers is not None and k_par['read_thermo'] and 'vol' in k_par['thermo_style']:
+        # Volume updated by read_run in worker processes is applied to k_par in run order (same as serial read)
+        for run_data in runs:
+            if run_data is not None:
+                update_volume(run_data['thermo'], k_par, verbose=False)
+    if return_keys:
+        return runs, errors, [cache_key for run_data, cache_key in results]
+    return runs, errors
+
+
+def read_runs_incremental(run_list, sim_dir, k_par=k_parameters, verbose=True, workers=None):
+    """Read multiple Lammps simulation runs parsing only new or modified runs.
+    Parsed runs are kept in a run cache (k_par['cache'] or <sim_dir>/.thermof-cache) and a manifest
+    records the signature (file modification times, sizes and calculation parameters) of each parsed run.
+    Runs with unchanged signatures are loaded from the cache and entries of modified or removed runs are deleted.
+
+    Args:
+        - run_list (list): List of Lammps simulation run directories
+        - sim_dir (str): Simulation directory (trial or trial set) to keep the cache and manifest in
+        - k_par (dict): Dictionary of calculation parameters
+        - verbose (bool): Print information about the run
+        - workers (int): Number of processes to read runs in parallel (default: None -> serial)
+
+    Returns:
+        - list: Run data for each run in the same order as run_list (see read_runs)
+        - list: Error message for each run (see read_runs)
+    """
+    if k_par.get('cache') is None:
+        k_par = dict(k_par, cache=os.path.join(sim_dir, '.thermof-cache'))
+    run_cache = get_run_cache(k_par)
+    manifest_file = os.path.join(run_cache.cache_dir, 'manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+    cached = {run_path: os.path.exists(run_cache.path(key)) for run_path, key in manifest.items()}
+    # Manifest records the keys read_run actually used (calculation parameters may change while reading runs)
+    runs, errors, keys = read_runs(run_list, k_par=k_par, verbose=verbose, workers=workers, return_keys=True)
+    runs_manifest, status = {}, dict(new=0, modified=0, unchanged=0, removed=0)
+    for run, run_data, key in zip(run_list, runs, keys):
+        run_path = os.path.abspath(run)
+        if run_path not in manifest:
+            status['new'] += 1
+        elif manifest[run_path] == key and cached[run_path]:
+            status['unchanged'] += 1
+        else:
+            status['modified'] += 1
+            if manifest[run_path] != key:
+                remove_file(run_cache.path(manifest[run_path]))
+        if run_data is not None:
+            runs_manifest[run_path] = key
+    run_paths = [os.path.abspath(run) for run in run_list]
+    for run_path in manifest:
+        if run_path not in run_paths and run_path.startswith(os.path.join(os.path.abspath(sim_dir), '')):
+            status['removed'] += 1
+            remove_file(run_cache.path(manifest[run_path]))
+        elif run_path not in run_paths:
+            runs_manifest[run_path] = manifest[run_path]       # Runs of other trials sharing the cache
+    print('Runs -> new: %i | modified: %i | unchanged: %i | removed: %i'
+          % (status['new'], status['modified'], status['unchanged'], status['removed'])) if verbose else None
+    with open(manifest_file, 'w') as f:
+        json.dump(runs_manifest, f, indent=1, sort_keys=True)
+    return runs, errors
+
+
+def remove_file(file_path):
+    """Remove file if it exists"""
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+
+def collect_trial(trial, run_list, runs, errors=None, k_par=k_parameters):
+    """Add run data to trial dictionary and average runs
+
+    Args:
+        - trial (dict): Trial dictionary with runs, data and name keys
+        - run_list (list): List of Lammps simulation run directories
+        - runs (list): List of run data read by read_run (None for runs that could not be read)
+        - errors (list): Error message for each run read by read_runs (None if not captured)
+        - k_par (dict): Dictionary of calculation parameters
+
+    Returns:
+        - dict: Trial data containing thermal conductivity, estimate, timesteps, run name for each run
+    """
+    for run_data in runs:
+        if run_data is not None:
+            trial['data'][run_data['name']] = run_data
+            trial['runs'].append(run_data['name'])
+    if errors is not None:
+        trial['errors'] = {os.path.basename(run): err for run, err in zip(run_list, errors) if err is not None}
+    if k_par['average'] and len(trial['runs']) > 0:
         trial['avg'] = average_trial(trial, isotropic=k_par['isotropic'])
+    if k_par.get('batch_stats') and len(trial['runs']) > 0:
+        trial['stats'] = trial_statistics(trial, isotropic=k_par['isotropic'])
+    if k_par.get('bootstrap') and len(trial['runs']) > 0:
+        trial['uncertainty'] = trial_uncertainty(trial, n_resamples=k_par.get('n_resamples', 2000),
+                                                 confidence=k_par.get('confidence', 0.95), seed=k_par.get('bootstrap_seed'))
+    if k_par.get('spectrum') and len(trial['runs']) > 0:
+        trial['spectrum'] = trial_spectrum(trial, k_par=k_par, window=k_par.get('spectrum_window', 'hann'),
+                                           padding=k_par.get('spectrum_padding', 1), isotropic=k_par['isotropic'])
     return trial
 
 
@@ -208,44 +657,221 @@ def average_trial(trial, isotropic=False):
     Returns:
         - dict: Trial data average for thermal conductivity and estimate
     """
+    directions = list(trial['data'][trial['runs'][0]]['directions'])
+    if isotropic:
+        directions.append('iso')
+    k_stack, directions = stack_runs(trial, key='k', directions=directions)
+    k_avg = np.sum(k_stack, axis=0) / len(k_stack)
     trial_avg = dict(k={}, k_est={'stats': {}})
-    for direction in trial['data'][trial['runs'][0]]['directions']:
+    for direction_index, direction in enumerate(directions):
         # Take average of k for each direction
-        trial_avg['k'][direction] = average_k([trial['data'][run]['k'][direction] for run in trial['runs']])
+        trial_avg['k'][direction] = k_avg[direction_index].tolist()
         k_est_runs = [trial['data'][run]['k_est'][direction] for run in trial['runs']]
         trial_avg['k_est'][direction] = sum(k_est_runs) / len(trial['runs'])
         trial_avg['k_est']['stats'][direction] = dict(std=np.std(k_est_runs),
                                                       max=max(k_est_runs),
                                                       min=min(k_est_runs))
-    if isotropic:
-        # Take average of isotropic k and k_estimate
-        trial_avg['k']['iso'] = average_k([trial['data'][run]['k']['iso'] for run in trial['runs']])
-        k_est_iso_runs = [trial['data'][run]['k_est']['iso'] for run in trial['runs']]
-        trial_avg['k_est']['iso'] = sum(k_est_iso_runs) / len(trial['runs'])
-        trial_avg['k_est']['stats']['iso'] = dict(std=np.std(k_est_iso_runs),
-                                                  max=max(k_est_iso_runs),
-                                                  min=min(k_est_iso_runs))
     return trial_avg
 
 
-def read_trial_set(trial_set_dir, k_par=k_parameters, verbose=True):
+def stack_runs(trial, key='k', directions=None):
+    """Stack data of all runs in a trial into a single array.
+
+    Args:
+        - trial (dict): Trial data read by read_trial
+        - key (str): Run data to stack ('k' or 'hcacf')
+        - directions (list): Directions to stack (default: None -> directions of the first run and 'iso' if available)
+
+    Returns:
+        - ndarray: Run data with shape (runs, directions, timesteps)
+        - list: Directions
+    """
+    if directions is None:
+        first_run = trial['data'][trial['runs'][0]]
+        directions = list(first_run['directions']) + (['iso'] if 'iso' in first_run[key] else [])
+    n_frames = len(trial['data'][trial['runs'][0]][key][directions[0]])
+    k_stack = np.zeros((len(trial['runs']), len(directions), n_frames))
+    for run_index, run in enumerate(trial['runs']):
+        for direction_index, direction in enumerate(directions):
+            k = trial['data'][run][key][direction]
+            if len(k) != n_frames:
+                raise TimestepsMismatchError('Number of timesteps for inital run not equal to run %i (%i != %i)'
+                                             % (run_index, n_frames, len(k)))
+            k_stack[run_index, direction_index] = k
+    return k_stack, directions
+
+
+def trial_statistics(trial, key='k', isotropic=True, confidence=0.95):
+    """Calculate mean, std, min, max, standard error and confidence band across runs for each direction and timestep.
+
+    Args:
+        - trial (dict): Trial data read by read_trial
+        - key (str): Run data to calculate statistics for ('k' or 'hcacf')
+        - isotropic (bool): Include isotropic average ('iso') if available
+        - confidence (float): Confidence level of the confidence band
+
+    Returns:
+        - dict: Statistics arrays with shape (directions, timesteps), directions and runs
+    """
+    directions = list(trial['data'][trial['runs'][0]]['directions'])
+    if isotropic and 'iso' in trial['data'][trial['runs'][0]][key]:
+        directions.append('iso')
+    k_stack, directions = stack_runs(trial, key=key, directions=directions)
+    stats = batch_statistics(k_stack, confidence=confidence)
+    stats['directions'], stats['runs'] = directions, list(trial['runs'])
+    return stats
+
+
+def trial_spectrum(trial, k_par=k_parameters, window='hann', padding=1, isotropic=True):
+    """Frequency resolved thermal conductivity k(w) for all runs and directions of a trial from stacked HCACF
+    (see thermof.spectrum) with cumulative k(w) curves and statistics across runs.
+    Each run is scaled with its own volume (read from the log file, see update_volume) so that k(0) of a run
+    with a rectangular window is equal to its integrated k at the end of the HCACF.
+    The HCACF only determines thermal conductivity at zero frequency, so cumulative curves are given as the
+    fraction of k(w) below each frequency (not in W/mK).
+
+    Args:
+        - trial (dict): Trial data read by read_trial
+        - k_par (dict): Dictionary of calculation parameters
+        - window (str): Window function applied to the HCACF ('rectangular' | 'bartlett' | 'hann' | 'hamming' | 'blackman')
+        - padding (int): Zero padding factor of the FFT
+        - isotropic (bool): Include isotropic average ('iso') if available
+
+    Returns:
+        - dict: frequency (THz), k_omega (W/mK) and cumulative (fraction) with shape (runs, directions, frequencies),
+                mean k_omega and cumulative across runs, stats of k_omega across runs (see batch_statistics),
+                directions and runs
+    """
+    first_run = trial['data'][trial['runs'][0]]
+    directions = list(first_run['directions'])
+    if isotropic and 'iso' in first_run['hcacf']:
+        directions.append('iso')
+    hcacf_stack, directions = stack_runs(trial, key='hcacf', directions=directions)
+    volume = np.array([trial['data'][run].get('volume', k_par['volume']) for run in trial['runs']], dtype=float)
+    scale = volume * k_par['dt'] / (k_par['kb'] * math.pow(k_par['temp'], 2)) * k_par['conv']
+    frequency, k_omega = hcacf_spectrum(hcacf_stack, first_run['time'][1] - first_run['time'][0],
+                                        scale=scale[:, np.newaxis, np.newaxis],
+                                        window=window, padding=padding)
+    cumulative = cumulative_spectrum(frequency, k_omega)
+    stats = batch_statistics(k_omega, confidence=k_par.get('confidence', 0.95))
+    return dict(frequency=frequency, k_omega=k_omega, cumulative=cumulative, stats=stats,
+                mean=dict(k_omega=stats['mean'], cumulative=np.sum(cumulative, axis=0) / len(cumulative)),
+                directions=directions, runs=list(trial['runs']))
+
+
+def trial_uncertainty(trial, n_resamples=2000, confidence=0.95, seed=None, directions=None):
+    """Bootstrap confidence intervals of the trial thermal conductivity estimate (average of run estimates).
+    Runs are resampled with replacement and, if block estimates of runs are available (flux series read with
+    n_blocks > 1 and bootstrap calculation parameter), HCACF blocks are resampled within each run.
+
+    Args:
+        - trial (dict): Trial data read by read_trial
+        - n_resamples (int): Number of bootstrap resamples
+        - confidence (float): Confidence level of the intervals
+        - seed (int): Random seed
+        - directions (list): Directions (default: None -> all k estimate directions of the first run)
+
+    Returns:
+        - dict: runs and blocks (None if not available) containing mean, se, ci_low and ci_high for each direction
+    """
+    first_run = trial['data'][trial['runs'][0]]
+    if directions is None:
+        directions = list(first_run['k_est'].keys())
+    k_est = np.array([[trial['data'][run]['k_est'][d] for d in directions] for run in trial['runs']])
+    uncertainty = dict(runs=bootstrap_runs(k_est, n_resamples=n_resamples, confidence=confidence, seed=seed),
+                       blocks=None, directions=directions)
+    if all(['k_est_blocks' in trial['data'][run] for run in trial['runs']]):
+        k_est_blocks = np.array([[trial['data'][run]['k_est_blocks'][d] for d in directions] for run in trial['runs']])
+        uncertainty['blocks'] = block_bootstrap(np.swapaxes(k_est_blocks, 1, 2), n_resamples=n_resamples,
+                                                confidence=confidence, seed=seed)
+    for level in ['runs', 'blocks']:
+        if uncertainty[level] is not None:
+            uncertainty[level] = {d: {stat: float(value[i]) for stat, value in uncertainty[level].items()}
+                                  for i, d in enumerate(directions)}
+    return uncertainty
+
+
+def estimate_trial_k(trial, method='slope', window=1.0, tol=0.01):
+    """Detect plateau of thermal conductivity for all runs and directions of a trial at once.
+
+    Args:
+        - trial (dict): Trial data read by read_trial
+        - method (str): Plateau detection method ('first_dip' | 'slope', see thermof.estimate.estimate_plateau)
+        - window (float): Window duration for slope method (ps)
+        - tol (float): Relative tolerance of change in k within a window for slope method
+
+    Returns:
+        - dict: k_est with shape (runs, directions), window with shape (runs, directions, 2), directions and runs
+    """
+    k_stack, directions = stack_runs(trial, key='k')
+    k_est, k_window = estimate_plateau(k_stack, trial['data'][trial['runs'][0]]['time'],
+                                       method=method, window=window, tol=tol)
+    return dict(k_est=k_est, window=k_window, directions=directions, runs=list(trial['runs']))
+
+
+def scan_trial_k(trial, t0, t1, directions=None):
+    """Estimate thermal conductivity for every combination of window start and end times for all runs of a trial.
+    Prefix sums stored in run data (k_prefix) are used if available so that k is not summed again.
+
+    Args:
+        - trial (dict): Trial data read by read_trial
+        - t0 (list): Window start times (ps)
+        - t1 (list): Window end times (ps)
+        - directions (list): Directions to scan (default: None -> directions of the first run and 'iso' if available)
+
+    Returns:
+        - dict: k_est with shape (runs, directions, len(t0), len(t1)) (nan for empty windows), t0, t1, directions and runs
+    """
+    if 'k_prefix' in trial['data'][trial['runs'][0]]:
+        k_prefix, directions = stack_runs(trial, key='k_prefix', directions=directions)
+    else:
+        k_stack, directions = stack_runs(trial, key='k', directions=directions)
+        k_prefix = prefix_sums(k_stack)
+    k_est = window_scan(k_prefix, trial['data'][trial['runs'][0]]['time'], t0, t1)
+    return dict(k_est=k_est, t0=np.asarray(t0, dtype=float), t1=np.asarray(t1, dtype=float),
+                directions=directions, runs=list(trial['runs']))
+
+
+def read_trial_set(trial_set_dir, k_par=k_parameters, verbose=True, workers=None, incremental=False):
     """Read multiple trials with multiple runs
 
     Args:
         - trial_set_dir (str): Lammps simulation directory including directories for multiple trials
         - k_par (dict): Dictionary of calculation parameters
         - verbose (bool): Print information about the run
+        - workers (int): Number of processes to read runs of all trials in parallel (default: None -> serial)
+        - incremental (bool): Only parse new or modified runs, other runs are loaded from the cache
+                              kept in the trial set directory (see read_runs_incremental)
 
     Returns:
         - dict: Trial set data containing thermal conductivity, estimate, timesteps, trial name for each trial
     """
     trial_set = dict(trials=[], data={}, name=os.path.basename(trial_set_dir))
-    trial_list = [os.path.join(trial_set_dir, t) for t in os.listdir(trial_set_dir)
-                  if os.path.isdir(os.path.join(trial_set_dir, t))]
-    for trial_dir in trial_list:
-        trial = read_trial(trial_dir, k_par=k_par, verbose=verbose)
-        trial_set['trials'].append(os.path.basename(trial_dir))
-        trial_set['data'][trial['name']] = trial
+    trial_list = [os.path.join(trial_set_dir, t) for t in sorted(os.listdir(trial_set_dir))
+                  if os.path.isdir(os.path.join(trial_set_dir, t)) and not t.startswith('.')]
+    if workers is None and not incremental:
+        for trial_dir in trial_list:
+            trial = read_trial(trial_dir, k_par=k_par, verbose=verbose)
+            trial_set['trials'].append(os.path.basename(trial_dir))
+            trial_set['data'][trial['name']] = trial
+    else:
+        # Runs of all trials are read in a single pool to keep all workers busy
+        run_lists = [get_run_list(trial_dir) for trial_dir in trial_list]
+        all_runs = [run for run_list in run_lists for run in run_list]
+        if incremental:
+            runs, errors = read_runs_incremental(all_runs, trial_set_dir, k_par=k_par, verbose=verbose, workers=workers)
+        else:
+            runs, errors = read_runs(all_runs, k_par=k_par, verbose=verbose, workers=workers)
+        if errors is None:
+            errors = [None] * len(runs)
+        run_index = 0
+        for trial_dir, run_list in zip(trial_list, run_lists):
+            trial = dict(runs=[], data={}, name=os.path.basename(trial_dir))
+            trial_slice = slice(run_index, run_index + len(run_list))
+            trial = collect_trial(trial, run_list, runs[trial_slice], errors[trial_slice], k_par=k_par)
+            run_index += len(run_list)
+            trial_set['trials'].append(os.path.basename(trial_dir))
+            trial_set['data'][trial['name']] = trial
     return trial_set
 
 
@@ -306,6 +932,129 @@ def read_thermo(thermo_data, headers=['step', 'temp', 'epair', 'emol', 'etotal',
     return thermo
 
 
+def parse_log(log_file, thermo_style=['step', 'temp', 'epair', 'emol', 'etotal', 'press'], fix=None, headers=None,
+              chunk_size=10000):
+    """Read log.lammps file in a single streaming pass and return thermo data as numpy arrays for each fix
+    together with loop time, performance and wall time information.
+
+    Args:
+        - log_file (str): Lammps simulation log file path
+        - thermo_style (list): The headers for thermo data
+        - fix (list): Name of the separate fixes in thermo
+        - headers (str): Thermo header line in log file (default: None -> generated from thermo_style)
+        - chunk_size (int): Number of thermo lines kept in memory before converting to arrays
+
+    Returns:
+        - dict: Log data with thermo (thermo['fix1']['header1'] = ...), loop, performance, and walltime keys
+    """
+    if headers is None:
+        headers = get_thermo_headers(thermo_style)
+    log_parser = LogParser(headers=headers, thermo_style=thermo_style, chunk_size=chunk_size)
+    with open(log_file, 'r') as log:
+        for line in log:
+            log_parser.feed(line)
+    return log_parser.result(fix=fix)
+
+
+class LogParser:
+    """
+    Streaming Lammps log file parser. Lines are fed one at a time and thermo lines are converted to
+    numpy arrays in chunks so that memory use does not depend on the size of the log file.
+    """
+    def __init__(self, headers='Step Temp E_pair E_mol TotEng Press', thermo_style=None, chunk_size=10000):
+        """
+        Create a log parser.
+
+        Args:
+            - headers (str): Thermo header line in log file
+            - thermo_style (list): The headers for thermo data (default: None -> lowercase headers)
+            - chunk_size (int): Number of thermo lines kept in memory before converting to arrays
+        """
+        self.headers = headers
+        self.thermo_style = thermo_style if thermo_style is not None else headers.lower().split()
+        self.chunk_size = chunk_size
+        self.thermo = []
+        self.loop = dict(time=[], procs=[], steps=[], atoms=[])
+        self.performance = []
+        self.walltime = None
+        self.in_thermo = False
+        self.chunks, self.lines = [], []
+
+    def feed(self, line):
+        """
+        Parse a single line of the log file.
+        """
+        if self.in_thermo:
+            if line.startswith('Loop time'):
+                self.thermo.append(self.end_block())
+                self.read_loop_time(line)
+            elif line.lstrip()[:1] in '0123456789-+.' and line.strip():
+                self.lines.append(line)
+                if len(self.lines) >= self.chunk_size:
+                    self.flush()
+        elif self.headers in line:
+            self.in_thermo = True
+        elif line.startswith('Performance:'):
+            self.performance.append(line.split(':', 1)[1].strip())
+        elif 'Total wall time' in line:
+            h, m, s = line.split()[-1].split(':')
+            self.walltime = [int(h), int(m), int(s)]
+
+    def flush(self):
+        """
+        Convert buffered thermo lines to an array.
+        """
+        if len(self.lines) > 0:
+            self.chunks.append(np.loadtxt(self.lines, usecols=range(len(self.thermo_style)), ndmin=2))
+            self.lines = []
+
+    def end_block(self):
+        """
+        Finish current thermo block and return thermo data as a 2D array (n_lines x n_columns).
+        """
+        self.flush()
+        if len(self.chunks) > 0:
+            block = np.concatenate(self.chunks)
+        else:
+            block = np.zeros((0, len(self.thermo_style)))
+        self.chunks, self.in_thermo = [], False
+        return block
+
+    def read_loop_time(self, line):
+        """
+        Read 'Loop time of 73.0042 on 8 procs for 300000 steps with 3584 atoms' line.
+        """
+        ls = line.split()
+        self.loop['time'].append(float(ls[3]))
+        self.loop['procs'].append(int(ls[5]))
+        self.loop['steps'].append(int(ls[8]))
+        self.loop['atoms'].append(int(ls[11]))
+
+    def result(self, fix=None, running=False):
+        """
+        Returns log data read so far.
+
+        Args:
+            - fix (list): Name of the separate fixes in thermo
+            - running (bool): Include thermo block that is not finished yet
+
+        Returns:
+            - dict: Log data with thermo, loop, performance, and walltime keys
+        """
+        blocks = list(self.thermo)
+        if running and self.in_thermo:
+            self.flush()
+            blocks.append(np.concatenate(self.chunks) if len(self.chunks) > 0 else np.zeros((0, len(self.thermo_style))))
+        if fix is None:
+            fix = list(range(len(blocks)))
+        if len(fix) != len(blocks):
+            raise ThermoFixDataMatchError('Fixes: %s do not match fixes read in log file' % ' | '.join(fix))
+        thermo = {}
+        for f, block in zip(fix, blocks):
+            thermo[f] = {h: block[:, i] for i, h in enumerate(self.thermo_style)}
+        return dict(thermo=thermo, loop=self.loop, performance=self.performance, walltime=self.walltime)
+
+
 def read_walltime(log_file):
     """Read log.lammps file and return lines for multiple thermo data
 
@@ -315,9 +1064,7 @@ def read_walltime(log_file):
     Returns:
         - list: Wall time in hours, minutes, and seconds -> [h, m, s]
     """
-    with open(log_file, 'r') as log:
-        log_lines = log.readlines()
-
+    log_lines = read_tail(log_file)
     if 'Total wall time' in log_lines[-1]:
         walltime = log_lines[-1].split()[-1]
         h, m, s = walltime.split(':')
@@ -328,6 +1075,100 @@ def read_walltime(log_file):
     return [int(h), int(m), int(s)]
 
 
+def read_tail(file_path, size=4096):
+    """Read last lines of a file by seeking to the end instead of reading the whole file
+
+    Args:
+        - file_path (str): File path
+        - size (int): Number of bytes to read from the end of the file
+
+    Returns:
+        - list: Lines in the last <size> bytes of the file (partial first line is removed)
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        f.seek(max(0, file_size - size))
+        tail = f.read().decode(errors='replace')
+    lines = tail.splitlines(keepends=True)
+    if file_size > size:
+        lines = lines[1:]
+    return lines
+
+
+def read_run_status(run_dir, file_name='lammps_out.txt', tail_size=4096):
+    """Check status of a Lammps simulation by reading only the end of the Lammps output file.
+
+    Args:
+        - run_dir (str): Lammps simulation directory
+        - file_name (str): Lammps output file name (screen output or log file)
+        - tail_size (int): Number of bytes to read from the end of the output file
+
+    Returns:
+        - dict: Run name, path, status ('finished' | 'running' | 'not started' | 'error' | 'not found'),
+                walltime ([h, m, s] or None), and last line of the output file
+    """
+    status = dict(name=os.path.basename(run_dir), path=run_dir, status='not found', walltime=None, last_line=None)
+    out_file = os.path.join(run_dir, file_name)
+    if not os.path.isfile(out_file):
+        return status
+    lines = read_tail(out_file, size=tail_size)
+    if len(lines) == 0:
+        status['status'] = 'not started'
+        return status
+    status['last_line'] = lines[-1].strip()
+    if 'Total wall time' in lines[-1]:
+        h, m, s = lines[-1].split()[-1].split(':')
+        status['walltime'] = [int(h), int(m), int(s)]
+        status['status'] = 'finished'
+    elif any(['log' in f for f in os.listdir(run_dir)]):
+        status['status'] = 'running'
+    else:
+        status['status'] = 'error'
+    return status
+
+
+def scan_run_status(sim_dir, file_name='lammps_out.txt', tail_size=4096, workers=16):
+    """Check status of all Lammps simulations in a directory tree using a thread pool.
+    Directories containing the Lammps output file, or Lammps input (in.*) or job submission (job.*) files
+    written by Simulation.initialize are considered runs (other directories are searched for runs).
+
+    Args:
+        - sim_dir (str): Directory containing Lammps simulations
+        - file_name (str): Lammps output file name (screen output or log file)
+        - tail_size (int): Number of bytes to read from the end of the output file
+        - workers (int): Number of threads used to check runs
+
+    Returns:
+        - list: Status dictionary (see read_run_status) for each run sorted by path
+    """
+    run_list = []
+    for root, dirs, files in os.walk(sim_dir):
+        if file_name in files or any([f.startswith(('in.', 'job.')) for f in files]):
+            run_list.append(root)
+            dirs[:] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        status_list = list(executor.map(lambda run: read_run_status(run, file_name=file_name, tail_size=tail_size),
+                                        sorted(run_list)))
+    return status_list
+
+
+def read_run_info(run_dir, info_file='run_info.yaml'):
+    """
+    Read run information (simulation parameters such as sigma, epsilon, seed) for a Lammps run.
+
+    Args:
+        - run_dir (str): Lammps simulation directory for single run
+        - info_file (str): Run information yaml file name
+
+    Returns:
+        - dict: Run information
+    """
+    with open(os.path.join(run_dir, info_file), 'r') as f:
+        run_info = yaml.load(f)
+    return run_info
+
+
 def read_thermal_expansion(thexp_file):
     """
     Read thermal expansion csv file.
@@ -8,8 +8,9 @@ import yaml
 import shutil
 import glob
 from thermof.parameters import Parameters, plot_parameters
-from thermof.read import read_run, read_trial, read_trial_set
-from thermof.initialize.lammps import write_lammps_files, write_lammps_input
+from thermof.read import read_run, read_trial, read_trial_set, trial_statistics, scan_trial_k, trial_spectrum
+from thermof.estimate import prefix_sums, window_scan
+from thermof.initialize.lammps import write_lammps_files, write_lammps_input, share_data_file
 from thermof.initialize.job import job_submission_file
 from thermof.mof import MOF
 from .plot import plot_simulation
@@ -63,9 +64,11 @@ class Simulation:
                 n_runs += len(self.trial_set['data'][trial]['runs'])
         return n_runs
 
-    def read(self, simdir, setup, read_parameters=False):
+    def read(self, simdir, setup, read_parameters=False, workers=None, incremental=False):
         """
         Read Lammps simulation results from given directory.
+        Runs of trials and trial sets are read in parallel if number of workers (processes) is given.
+        In incremental mode only new or modified runs of trials and trial sets are parsed.
         """
         self.setup = setup
         self.simdir = simdir
@@ -75,49 +78,121 @@ class Simulation:
         if setup == 'run':
             self.run = read_run(simdir, k_par=self.parameters.thermof['kpar'])
         elif setup == 'trial':
-            self.trial = read_trial(simdir, k_par=self.parameters.thermof['kpar'])
+            self.trial = read_trial(simdir, k_par=self.parameters.thermof['kpar'], workers=workers,
+                                    incremental=incremental)
         elif setup == 'trial_set':
-            self.trial_set = read_trial_set(simdir, k_par=self.parameters.thermof['kpar'])
+            self.trial_set = read_trial_set(simdir, k_par=self.parameters.thermof['kpar'], workers=workers,
+                                            incremental=incremental)
         else:
             print('Select setup: "run" | "trial" | "trial_set"')
 
-    def initialize(self):
+    def statistics(self, key='k', confidence=0.95):
+        """
+        Calculate statistics across runs (mean, std, min, max, sem, confidence band) for each direction and timestep.
+        Assigns results to self.stats (dictionary of trials for trial sets).
+        """
+        isotropic = self.parameters.thermof['kpar']['isotropic']
+        if self.setup == 'trial':
+            self.stats = trial_statistics(self.trial, key=key, isotropic=isotropic, confidence=confidence)
+        elif self.setup == 'trial_set':
+            self.stats = {}
+            for trial in self.trial_set['trials']:
+                trial_data = self.trial_set['data'][trial]
+                if len(trial_data['runs']) > 0:
+                    self.stats[trial] = trial_statistics(trial_data, key=key, isotropic=isotropic, confidence=confidence)
+        else:
+            self.stats = None
+            print('Statistics are only available for "trial" | "trial_set" setups')
+        return self.stats
+
+    def spectrum(self, window='hann', padding=1):
+        """
+        Calculate frequency resolved thermal conductivity k(w) and cumulative k(w) curves averaged across runs
+        (see read.trial_spectrum). Assigns results to self.k_spectrum (dictionary of trials for trial sets).
+        """
+        k_par = self.parameters.thermof['kpar']
+        if self.setup == 'trial':
+            self.k_spectrum = trial_spectrum(self.trial, k_par=k_par, window=window, padding=padding,
+                                             isotropic=k_par['isotropic'])
+        elif self.setup == 'trial_set':
+            self.k_spectrum = {}
+            for trial in self.trial_set['trials']:
+                trial_data = self.trial_set['data'][trial]
+                if len(trial_data['runs']) > 0:
+                    self.k_spectrum[trial] = trial_spectrum(trial_data, k_par=k_par, window=window, padding=padding,
+                                                            isotropic=k_par['isotropic'])
+        else:
+            self.k_spectrum = None
+            print('Spectrum is only available for "trial" | "trial_set" setups')
+        return self.k_spectrum
+
+    def scan_k(self, t0, t1):
+        """
+        Estimate thermal conductivity for every combination of window start (t0) and end (t1) times
+        to check sensitivity of k estimates to the averaging window (see read.scan_trial_k).
+        Assigns results to self.k_scan (dictionary of trials for trial sets).
+        """
+        if self.setup == 'run':
+            directions = list(self.run['k'].keys())
+            if 'k_prefix' in self.run:
+                k_prefix = [self.run['k_prefix'][d] for d in directions]
+            else:
+                k_prefix = prefix_sums([self.run['k'][d] for d in directions])
+            self.k_scan = dict(k_est=window_scan(k_prefix, self.run['time'], t0, t1), t0=t0, t1=t1, directions=directions)
+        elif self.setup == 'trial':
+            self.k_scan = scan_trial_k(self.trial, t0, t1)
+        elif self.setup == 'trial_set':
+            self.k_scan = {}
+            for trial in self.trial_set['trials']:
+                if len(self.trial_set['data'][trial]['runs']) > 0:
+                    self.k_scan[trial] = scan_trial_k(self.trial_set['data'][trial], t0, t1)
+        return self.k_scan
+
+    def initialize(self, cache_dir=None):
         """
         Initialize input files for a Lammps simulation.
+        Lammps files written by lammps_interface are reused from cache directory if given (see write_lammps_files).
         """
         self.setup = '|'.join(self.parameters.thermof['fix'])
         self.set_dir(self.simdir)
-        write_lammps_files(self.simdir, self.parameters, verbose=self.verbose)
+        write_lammps_files(self.simdir, self.parameters, verbose=self.verbose, cache_dir=cache_dir)
         write_lammps_input(self.simdir, self.parameters, verbose=self.verbose)
         job_submission_file(self.simdir, self.parameters, verbose=self.verbose)
         self.save_parameters()
         print('Done!') if self.verbose else None
 
-    def initialize_runs(self, n_runs, run_parameters=None):
+    def initialize_runs(self, n_runs, run_parameters=None, cache_dir=None, share_data=None):
         """
         Initialize input files for a Lammps simulation with multiple runs.
+        Lammps files written by lammps_interface are reused from cache directory if given (see write_lammps_files).
+        Input and data files are read once and only the input of each run is rendered (seed, job name and run parameters).
+        The data file is copied to each run directory unless share_data is given:
+            - 'link': runs hard link a single data file
+            - 'relative': data file is kept in simulation directory and read from '../data.*' by each run
+                          (not supported by the slurm-scratch scheduler, see share_data_file)
         """
         self.setup = '|'.join(self.parameters.thermof['fix'])
         self.set_dir(self.simdir)
-        write_lammps_files(self.simdir, self.parameters, verbose=self.verbose)
+        write_lammps_files(self.simdir, self.parameters, verbose=self.verbose, cache_dir=cache_dir)
         inp_file = glob.glob(os.path.join(self.simdir, 'in.*'))[0]
         data_file = glob.glob(os.path.join(self.simdir, 'data.*'))[0]
         jobname = self.parameters.job['name']
         for run in range(1, n_runs + 1):
             rundir = os.path.join(self.simdir, '%i' % run)
             os.makedirs(rundir)
-            shutil.copy(inp_file, rundir)
-            shutil.copy(data_file, rundir)
+            run_data_file = share_data_file(data_file, rundir, share_data=share_data,
+                                            scheduler=self.parameters.job['scheduler'])
             self.parameters.thermof['seed'] += 1
             self.parameters.job['name'] = '%s-%i' % (jobname, run)
             if run_parameters is not None:
                 for par_key, par_val in run_parameters.items():
                     self.parameters.thermof[par_key] = par_val[run - 1]
-            write_lammps_input(rundir, self.parameters, verbose=self.verbose)
+            write_lammps_input(rundir, self.parameters, verbose=self.verbose, base_input=inp_file, data_file=run_data_file)
             job_submission_file(rundir, self.parameters, verbose=self.verbose)
             self.save_parameters(simdir=rundir)
         os.remove(inp_file)
-        os.remove(data_file)
+        if share_data != 'relative':
+            os.remove(data_file)
         print('Done!') if self.verbose else None
 
     def set_dir(self, simdir):
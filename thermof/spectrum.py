@@ -0,0 +1,83 @@
+"""
+Frequency resolved thermal conductivity from Fourier transform of heat current autocorrelation function
+
+The frequency dependent thermal conductivity k(w) = Re integral(HCACF(t) exp(iwt) dt) (Volz, PRL 87, 074301 (2001))
+is calculated for stacked HCACF arrays with a single real FFT along the time axis. k(0) is equal to
+the integrated thermal conductivity at the end of the HCACF (rectangular window) and peaks of k(w) show
+vibrational frequencies that carry the heat current fluctuations.
+"""
+import numpy as np
+
+
+WINDOWS = ['rectangular', 'bartlett', 'hann', 'hamming', 'blackman']
+
+
+def lag_window(n_lags, window='hann'):
+    """
+    One sided window that decays from 1 at zero time lag to the end of the HCACF.
+
+    Args:
+        - n_lags (int): Number of HCACF time lags
+        - window (str): Window function ('rectangular' | 'bartlett' | 'hann' | 'hamming' | 'blackman')
+
+    Returns:
+        - ndarray: Window weight for each time lag
+    """
+    if window not in WINDOWS:
+        raise SpectrumError('Unknown window: %s (select from %s)' % (window, ' | '.join(WINDOWS)))
+    if window == 'rectangular':
+        return np.ones(n_lags)
+    return getattr(np, 'hanning' if window == 'hann' else window)(2 * n_lags - 1)[n_lags - 1:]
+
+
+def hcacf_spectrum(hcacf, time_step, scale=1.0, window='hann', padding=1):
+    """
+    Frequency dependent thermal conductivity for any number of HCACF curves in one pass.
+    The HCACF is integrated with the same trapezoid weights as read.calculate_k (HCACF(0) / 2).
+
+    Args:
+        - hcacf (ndarray): Heat current autocorrelation with shape (..., timesteps) (ex: (runs, directions, timesteps))
+        - time_step (float): Time between HCACF lags (ps -> frequencies in THz)
+        - scale (float / ndarray): Conversion factor of the HCACF sum to thermal conductivity
+                                  (volume * dt / (kb * temp^2) * conv, see read.calculate_k), an array is broadcast
+                                  with shape (..., 1) to scale each curve separately (ex: volume of each run)
+        - window (str): Window function applied to the HCACF (see lag_window)
+        - padding (int): Zero padding factor, FFT length is padding x twice the number of lags
+
+    Returns:
+        - ndarray: Frequencies
+        - ndarray: Thermal conductivity for each frequency with shape (..., frequencies)
+    """
+    if int(padding) < 1:
+        raise SpectrumError('Padding factor must be a positive integer: %s' % padding)
+    hcacf = np.asarray(hcacf, dtype=float)
+    n_lags = np.shape(hcacf)[-1]
+    weights = lag_window(n_lags, window=window)
+    weights[0] = weights[0] / 2
+    n_fft = 2 * int(padding) * n_lags
+    k_omega = np.fft.rfft(hcacf * weights, n=n_fft, axis=-1).real * scale
+    return np.fft.rfftfreq(n_fft, d=time_step), k_omega
+
+
+def cumulative_spectrum(frequency, k_omega):
+    """
+    Cumulative distribution of k(w) over frequency (trapezoid rule) normalized to 1 at the highest frequency.
+    Integral of k(w) over frequency is not the thermal conductivity (which is k(0)), so the cumulative curve
+    is a fraction that shows which frequencies carry the heat current fluctuations.
+
+    Args:
+        - frequency (ndarray): Frequencies
+        - k_omega (ndarray): Thermal conductivity for each frequency with shape (..., frequencies)
+
+    Returns:
+        - ndarray: Fraction of the spectrum below each frequency with shape (..., frequencies)
+    """
+    k_omega = np.asarray(k_omega, dtype=float)
+    area = (k_omega[..., 1:] + k_omega[..., :-1]) / 2 * np.diff(frequency)
+    cumulative = np.concatenate([np.zeros(np.shape(k_omega)[:-1] + (1, )), np.cumsum(area, axis=-1)], axis=-1)
+    total = cumulative[..., -1:]
+    return np.divide(cumulative, total, out=np.zeros(np.shape(cumulative)), where=total != 0)
+
+
+class SpectrumError(Exception):
+    pass
@@ -0,0 +1,111 @@
+"""
+Batch statistics and bootstrap uncertainty for thermal conductivity of multiple runs stacked into arrays
+"""
+import math
+import numpy as np
+
+
+def batch_statistics(k_stack, confidence=0.95):
+    """
+    Calculate statistics across runs for each direction and timestep in one pass.
+
+    Args:
+        - k_stack (ndarray): Stacked run data with shape (runs, directions, timesteps) (see read.stack_runs)
+        - confidence (float): Confidence level for the confidence band of the mean (normal approximation)
+
+    Returns:
+        - dict: mean, std, min, max, sem, ci_low and ci_high arrays with shape (directions, timesteps)
+    """
+    k_stack = np.asarray(k_stack, dtype=float)
+    n_runs = len(k_stack)
+    mean = np.sum(k_stack, axis=0) / n_runs
+    std = np.std(k_stack, axis=0)
+    sem = np.std(k_stack, axis=0, ddof=1) / np.sqrt(n_runs) if n_runs > 1 else np.zeros(np.shape(mean))
+    z = normal_quantile(0.5 + confidence / 2)
+    return dict(mean=mean, std=std, min=np.min(k_stack, axis=0), max=np.max(k_stack, axis=0),
+                sem=sem, ci_low=mean - z * sem, ci_high=mean + z * sem)
+
+
+def normal_quantile(p):
+    """
+    Quantile of the standard normal distribution (inverse of the cumulative distribution function) found by bisection.
+
+    Args:
+        - p (float): Probability (0 < p < 1)
+
+    Returns:
+        - float: Value with cumulative probability p
+    """
+    if not 0 < p < 1:
+        raise ValueError('Probability must be between 0 and 1: %s' % p)
+    low, high = -40.0, 40.0
+    for i in range(100):
+        mid = (low + high) / 2
+        if math.erfc(-mid / math.sqrt(2)) / 2 < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def bootstrap_runs(k_est, n_resamples=2000, confidence=0.95, seed=None):
+    """
+    Bootstrap confidence interval of the mean thermal conductivity estimate by resampling runs with replacement.
+    All resamples are drawn at once as the number of times each run is selected and averaged in a single
+    matrix product (no loop over resamples).
+
+    Args:
+        - k_est (ndarray): Thermal conductivity estimates with shape (runs, directions)
+        - n_resamples (int): Number of bootstrap resamples
+        - confidence (float): Confidence level of the interval
+        - seed (int): Random seed
+
+    Returns:
+        - dict: mean, se (bootstrap standard error), ci_low and ci_high arrays with shape (directions, )
+    """
+    k_est = np.asarray(k_est, dtype=float)
+    n_runs = len(k_est)
+    rng = np.random.RandomState(seed)
+    counts = rng.multinomial(n_runs, np.full(n_runs, 1.0 / n_runs), size=n_resamples)
+    resampled = counts @ k_est / n_runs
+    return bootstrap_interval(np.mean(k_est, axis=0), resampled, confidence=confidence)
+
+
+def block_bootstrap(k_est_blocks, n_resamples=2000, confidence=0.95, seed=None):
+    """
+    Stratified block bootstrap confidence interval of the mean thermal conductivity estimate.
+    Blocks of the heat current autocorrelation are resampled with replacement within each run (stratum)
+    and block averages of all runs are averaged, for all resamples at once.
+
+    Args:
+        - k_est_blocks (ndarray): Thermal conductivity estimate of each block with shape (runs, blocks, directions)
+        - n_resamples (int): Number of bootstrap resamples
+        - confidence (float): Confidence level of the interval
+        - seed (int): Random seed
+
+    Returns:
+        - dict: mean, se (bootstrap standard error), ci_low and ci_high arrays with shape (directions, )
+    """
+    k_est_blocks = np.asarray(k_est_blocks, dtype=float)
+    n_runs, n_blocks = np.shape(k_est_blocks)[:2]
+    rng = np.random.RandomState(seed)
+    counts = rng.multinomial(n_blocks, np.full(n_blocks, 1.0 / n_blocks), size=(n_resamples, n_runs))
+    resampled = np.einsum('srb,rbd->sd', counts, k_est_blocks) / (n_runs * n_blocks)
+    return bootstrap_interval(np.mean(k_est_blocks, axis=(0, 1)), resampled, confidence=confidence)
+
+
+def bootstrap_interval(estimate, resampled, confidence=0.95):
+    """
+    Percentile confidence interval and standard error from bootstrap resamples.
+
+    Args:
+        - estimate (ndarray): Estimate from the original sample with shape (directions, )
+        - resampled (ndarray): Estimates of bootstrap resamples with shape (resamples, directions)
+        - confidence (float): Confidence level of the interval
+
+    Returns:
+        - dict: mean, se, ci_low and ci_high arrays with shape (directions, )
+    """
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.percentile(resampled, [100 * alpha, 100 * (1 - alpha)], axis=0)
+    return dict(mean=estimate, se=np.std(resampled, axis=0, ddof=1), ci_low=ci_low, ci_high=ci_high)
@@ -0,0 +1,305 @@
+"""
+Columnar results store for screening many simulations.
+Results are stored as a directory of .npz segments (one array per column) with a json index,
+new results are appended as new segments and columns are read only when queried.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+
+class ResultsStore:
+    """
+    Append-only table of simulation results stored in columns.
+    Each row is a flat dictionary (see run_record and trial_record) and is identified by a key column
+    so that results that are already stored are skipped (or replaced) when appending.
+    Replaced rows are marked as deleted and removed from segments when the store is compacted.
+    """
+    def __init__(self, store_dir, key='path'):
+        """
+        Open or create a results store.
+
+        Args:
+            - store_dir (str): Directory of the results store
+            - key (str): Column that uniquely identifies each row
+        """
+        self.store_dir = os.path.abspath(store_dir)
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.index_file = os.path.join(self.store_dir, 'index.json')
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r') as f:
+                self.index = json.load(f)
+        else:
+            self.index = dict(key=key, columns={}, segments=[], keys=[])
+        self.index.setdefault('deleted', [])
+
+    def __repr__(self):
+        return "<ResultsStore: %s | rows: %i | columns: %i>" % (self.store_dir, len(self), len(self.columns))
+
+    def __len__(self):
+        return sum([segment['rows'] for segment in self.index['segments']]) - len(self.index['deleted'])
+
+    def __contains__(self, key):
+        return key in self.row_positions()
+
+    @property
+    def columns(self):
+        """
+        Returns list of column names.
+        """
+        return list(self.index['columns'].keys())
+
+    def row_positions(self):
+        """
+        Returns positions of stored rows (that are not deleted) for each key.
+        """
+        deleted = set(self.index['deleted'])
+        positions = {}
+        for position, key in enumerate(self.index['keys']):
+            if position not in deleted:
+                positions.setdefault(key, []).append(position)
+        return positions
+
+    def append(self, rows, overwrite=False):
+        """
+        Append rows as a new segment. Rows with keys that are already stored are skipped.
+
+        Args:
+            - rows (list): List of row dictionaries
+            - overwrite (bool): Replace stored rows with the same key (last row is kept for repeated keys)
+
+        Returns:
+            - int: Number of rows appended
+        """
+        key, stored = self.index['key'], self.row_positions()
+        new_rows, new_keys = [], {}
+        for row in rows:
+            if key not in row:
+                raise MissingKeyError('Row is missing key column: %s' % key)
+            if row[key] in new_keys:
+                if overwrite:
+                    new_rows[new_keys[row[key]]] = row
+            elif overwrite or row[key] not in stored:
+                new_keys[row[key]] = len(new_rows)
+                new_rows.append(row)
+        if len(new_rows) == 0:
+            return 0
+        columns = []
+        for row in new_rows:
+            columns += [c for c in row if c not in columns]
+        arrays = {}
+        for column in columns:
+            arrays[column] = to_column([row.get(column) for row in new_rows])
+            kind = 'str' if arrays[column].dtype.kind == 'U' else 'float'
+            if self.index['columns'].get(column, kind) != kind:
+                self.index['columns'][column] = 'str'
+            else:
+                self.index['columns'][column] = kind
+        segment = 'segment-%05i.npz' % (len(self.index['segments']) + 1)
+        fd, tmp_file = tempfile.mkstemp(suffix='.tmp', dir=self.store_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_file, os.path.join(self.store_dir, segment))
+        self.index['segments'].append(dict(file=segment, rows=len(new_rows), columns=columns))
+        self.index['keys'] += [row[key] for row in new_rows]
+        replaced = [position for row in new_rows for position in stored.get(row[key], [])]
+        self.index['deleted'] = sorted(set(self.index['deleted'] + replaced))
+        self.save_index()
+        return len(new_rows)
+
+    def save_index(self):
+        """
+        Write index file.
+        """
+        fd, tmp_file = tempfile.mkstemp(suffix='.tmp', dir=self.store_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_file, self.index_file)
+
+    def query(self, columns=None, where=None):
+        """
+        Read selected columns for all rows (deleted rows are left out). Only the requested columns are loaded
+        from each segment.
+
+        Args:
+            - columns (list): Columns to read (default: None -> all columns)
+            - where (dict): Select rows where column values are equal to given values (ex: {'level': 'trial'})
+
+        Returns:
+            - dict: Array of values for each column (missing values are nan for numbers and '' for strings)
+        """
+        if columns is None:
+            columns = self.columns
+        where = {} if where is None else where
+        read_columns = list(columns) + [c for c in where if c not in columns]
+        data = {c: [] for c in read_columns}
+        for segment in self.index['segments']:
+            with np.load(os.path.join(self.store_dir, segment['file']), allow_pickle=False) as npz:
+                for column in read_columns:
+                    if column in segment['columns']:
+                        data[column].append(npz[column])
+                    else:
+                        data[column].append(missing_column(self.index['columns'].get(column), segment['rows']))
+        for column in read_columns:
+            kind = self.index['columns'].get(column)
+            if len(data[column]) == 0:
+                data[column] = np.array([], dtype=str if kind == 'str' else float)
+            elif kind == 'str':
+                data[column] = np.concatenate([np.asarray(c).astype(str) for c in data[column]])
+            else:
+                data[column] = np.concatenate(data[column])
+        n_rows = len(self.index['keys'])
+        if n_rows > 0 and (len(where) > 0 or len(self.index['deleted']) > 0):
+            mask = np.ones(n_rows, dtype=bool)
+            mask[self.index['deleted']] = False
+            if len(where) > 0:
+                mask &= np.all([data[c] == v for c, v in where.items()], axis=0)
+            data = {c: data[c][mask] for c in columns}
+        return {c: data[c] for c in columns}
+
+    def compact(self):
+        """
+        Merge all segments into a single segment and remove deleted rows.
+        """
+        if len(self.index['segments']) < 2 and len(self.index['deleted']) == 0:
+            return None
+        data = self.query()
+        old_segments = [segment['file'] for segment in self.index['segments']]
+        segment = 'segment-%05i.npz' % (int(old_segments[-1][8:13]) + 1)
+        fd, tmp_file = tempfile.mkstemp(suffix='.tmp', dir=self.store_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **data)
+        os.replace(tmp_file, os.path.join(self.store_dir, segment))
+        deleted = set(self.index['deleted'])
+        self.index['keys'] = [k for i, k in enumerate(self.index['keys']) if i not in deleted]
+        self.index['segments'] = [dict(file=segment, rows=len(self.index['keys']), columns=self.columns)]
+        self.index['deleted'] = []
+        self.save_index()
+        for old_segment in old_segments:
+            os.remove(os.path.join(self.store_dir, old_segment))
+
+
+def to_column(values):
+    """
+    Convert list of values to a numeric (None -> nan) or string array.
+    """
+    if all([v is None or isinstance(v, (bool, int, float, np.number)) for v in values]):
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    return np.array(['' if v is None else str(v) for v in values])
+
+
+def missing_column(kind, n_rows):
+    """
+    Column of missing values for segments written before the column was added.
+    """
+    if kind == 'str':
+        return np.full(n_rows, '')
+    return np.full(n_rows, np.nan)
+
+
+def run_record(run_data, run_dir, trial=None):
+    """
+    Flatten run data read by read_run into a row of scalars for the results store.
+    Thermo data is averaged for each fix and run info parameters are prefixed with 'info_'.
+
+    Args:
+        - run_data (dict): Run data read by read_run
+        - run_dir (str): Run directory (used as key)
+        - trial (str): Trial name
+
+    Returns:
+        - dict: Results store row
+    """
+    record = dict(path=os.path.abspath(run_dir), level='run', name=run_data['name'], trial=trial)
+    for direction, k_est in run_data['k_est'].items():
+        record['k_est_%s' % direction] = k_est
+    for direction, window in run_data.get('k_window', {}).items():
+        record['k_t0_%s' % direction], record['k_t1_%s' % direction] = window
+    for i, eigenvalue in enumerate(run_data.get('k_tensor', {}).get('eigenvalues', []), start=1):
+        record['k_eig_%i' % i] = eigenvalue
+    if run_data.get('walltime') is not None:
+        record['walltime'] = run_data['walltime'][0] * 3600 + run_data['walltime'][1] * 60 + run_data['walltime'][2]
+    for fix, thermo in run_data.get('thermo', {}).items():
+        for var, values in thermo.items():
+            if len(values) > 0:
+                record['thermo_%s_%s' % (fix, var)] = float(np.mean(values))
+    for par, value in run_data.get('info', {}).items():
+        if value is None or isinstance(value, (bool, int, float, str)):
+            record['info_%s' % par] = value
+    record['signature'] = record_signature(record)
+    return record
+
+
+def trial_record(trial, trial_dir):
+    """
+    Flatten trial average, statistics and bootstrap confidence intervals of k estimates into a row for the results store.
+
+    Args:
+        - trial (dict): Trial data read by read_trial (with average)
+        - trial_dir (str): Trial directory (used as key)
+
+    Returns:
+        - dict: Results store row
+    """
+    record = dict(path=os.path.abspath(trial_dir), level='trial', name=trial['name'], n_runs=len(trial['runs']),
+                  runs=' '.join(trial['runs']))
+    for direction, k_est in trial.get('avg', {}).get('k_est', {}).items():
+        if direction != 'stats':
+            record['k_est_%s' % direction] = k_est
+            for stat, value in trial['avg']['k_est']['stats'][direction].items():
+                record['k_%s_%s' % (stat, direction)] = float(value)
+    for level, uncertainty in trial.get('uncertainty', {}).items():
+        if level in ['runs', 'blocks'] and uncertainty is not None:
+            for direction, stats in uncertainty.items():
+                record['k_%s_ci_low_%s' % (level, direction)] = stats['ci_low']
+                record['k_%s_ci_high_%s' % (level, direction)] = stats['ci_high']
+    if len(trial['runs']) > 0:
+        first_run = trial['data'][trial['runs'][0]]
+        for par, value in first_run.get('info', {}).items():
+            if value is None or isinstance(value, (bool, int, float, str)):
+                record['info_%s' % par] = value
+    record['signature'] = record_signature(record)
+    return record
+
+
+def record_signature(record):
+    """
+    Hash of record contents used to detect results that changed since the record was stored.
+
+    Args:
+        - record (dict): Results store row (without signature)
+
+    Returns:
+        - str: sha1 hex digest of record
+    """
+    contents = json.dumps({c: v for c, v in record.items() if c != 'signature'}, sort_keys=True, default=str)
+    return hashlib.sha1(contents.encode()).hexdigest()
+
+
+def store_trial(store, trial, trial_dir, runs=True):
+    """
+    Append trial and run records to results store. Rows that are already stored are skipped unless their
+    contents changed since they were stored (see record_signature), in which case the stored rows are replaced.
+
+    Args:
+        - store (ResultsStore): Results store
+        - trial (dict): Trial data read by read_trial
+        - trial_dir (str): Trial directory
+        - runs (bool): Also append a row for each run
+
+    Returns:
+        - int: Number of rows appended
+    """
+    rows = [trial_record(trial, trial_dir)]
+    if runs:
+        rows += [run_record(trial['data'][run], os.path.join(trial_dir, run), trial=trial['name']) for run in trial['runs']]
+    key = store.index['key']
+    stored = store.query([key, 'signature'])
+    signatures = dict(zip(stored[key], stored['signature']))
+    return store.append([row for row in rows if signatures.get(row[key]) != row['signature']], overwrite=True)
+
+
+class MissingKeyError(Exception):
+    pass
@@ -4,3 +4,4 @@
 Reading and analyzing Lammps .xyz trajectory files
 """
 from .trajectory import Trajectory
+from .binary import convert_trajectory
@@ -0,0 +1,121 @@
+"""
+Convert xyz trajectories to a binary columnar format that can be read lazily with memory mapping.
+
+Binary trajectory is a directory containing:
+    - coordinates.npy: Atomic coordinates with shape (n_frames, n_atoms, 3)
+    - atoms.npy: Atom type index of each atom with shape (n_atoms, )
+    - types.npy: Atom type names
+    - timestep.npy: Timestep of each frame with shape (n_frames, )
+"""
+import os
+import numpy as np
+
+
+def convert_trajectory(traj_path, binary_path=None, dtype='float32'):
+    """
+    Convert xyz trajectory to binary trajectory format one frame at a time.
+
+    Args:
+        - traj_path (str): xyz trajectory path to read
+        - binary_path (str): Binary trajectory directory to write (default: None -> <traj_path>.bin)
+        - dtype (str): Data type for coordinates ('float32' or 'float64')
+
+    Returns:
+        - str: Binary trajectory directory
+    """
+    if binary_path is None:
+        binary_path = '%s.bin' % traj_path
+    os.makedirs(binary_path, exist_ok=True)
+    with open(traj_path, 'rb') as traj:
+        n_atoms = int(traj.readline().strip())
+        traj.seek(0)
+        n_lines, last = 0, b'\n'
+        for chunk in iter(lambda: traj.read(2 ** 20), b''):
+            n_lines, last = n_lines + chunk.count(b'\n'), chunk[-1:]
+        n_lines += 0 if last == b'\n' else 1       # Last line without newline character
+    n_frames = int(n_lines / (n_atoms + 2))      # Assuming n_atoms is constant
+
+    coordinates = np.lib.format.open_memmap(os.path.join(binary_path, 'coordinates.npy'), mode='w+',
+                                            dtype=dtype, shape=(n_frames, n_atoms, 3))
+    timestep = np.zeros(n_frames, dtype=np.int64)
+    with open(traj_path, 'r') as traj:
+        for frame in range(n_frames):
+            frame_lines = [traj.readline() for i in range(n_atoms + 2)]
+            timestep[frame] = int(frame_lines[1].split()[2])
+            frame_atoms = [line.split(None, 1)[0] for line in frame_lines[2:]]
+            if frame == 0:
+                types = sorted(set(frame_atoms))
+                atoms = np.array([types.index(atom) for atom in frame_atoms], dtype=np.int32)
+                ref_atoms = frame_atoms
+            elif frame_atoms != ref_atoms:
+                raise AtomsMismatchError('Atoms in frame %i are different from first frame' % frame)
+            coordinates[frame] = np.loadtxt(frame_lines[2:], usecols=(1, 2, 3), ndmin=2)
+    coordinates.flush()
+    del coordinates
+    np.save(os.path.join(binary_path, 'atoms.npy'), atoms)
+    np.save(os.path.join(binary_path, 'types.npy'), np.array(types))
+    np.save(os.path.join(binary_path, 'timestep.npy'), timestep)
+    return binary_path
+
+
+def read_binary_trajectory(binary_path, mmap_mode='r'):
+    """
+    Read binary trajectory with memory mapped coordinates.
+
+    Args:
+        - binary_path (str): Binary trajectory directory
+        - mmap_mode (str): Memory map mode for coordinates ('r', 'r+', 'c' or None to load into memory)
+
+    Returns:
+        - dict: Trajectory dictionary with atoms, coordinates and timestep keys
+    """
+    coordinates = np.load(os.path.join(binary_path, 'coordinates.npy'), mmap_mode=mmap_mode)
+    types = np.load(os.path.join(binary_path, 'types.npy')).tolist()
+    atom_types = np.load(os.path.join(binary_path, 'atoms.npy'))
+    timestep = np.load(os.path.join(binary_path, 'timestep.npy'))
+    frame_atoms = [types[i] for i in atom_types]
+    return dict(coordinates=coordinates, atoms=FrameAtoms(frame_atoms, len(coordinates)),
+                timestep=[str(ts) for ts in timestep])
+
+
+def is_binary_trajectory(traj_path):
+    """
+    Check if given path is a binary trajectory directory.
+    """
+    return os.path.isdir(traj_path) and os.path.exists(os.path.join(traj_path, 'coordinates.npy'))
+
+
+class FrameAtoms:
+    """
+    Atom names for each frame of a trajectory with constant atoms.
+    Behaves like a 2D list (n_frames x n_atoms) without storing the names for each frame.
+    """
+    def __init__(self, atoms, n_frames):
+        self.atoms = atoms
+        self.n_frames = n_frames
+
+    def __repr__(self):
+        return "<FrameAtoms atoms: %i | frames: %i>" % (len(self.atoms), self.n_frames)
+
+    def __len__(self):
+        return self.n_frames
+
+    def __getitem__(self, frame):
+        if isinstance(frame, slice):
+            return [list(self.atoms) for i in range(*frame.indices(self.n_frames))]
+        if frame < -self.n_frames or frame >= self.n_frames:
+            raise IndexError('Frame index out of range')
+        return list(self.atoms)
+
+    def __iter__(self):
+        for frame in range(self.n_frames):
+            yield list(self.atoms)
+
+    def __eq__(self, other):
+        if isinstance(other, FrameAtoms):
+            return self.n_frames == other.n_frames and self.atoms == other.atoms
+        return len(other) == self.n_frames and all([list(frame) == self.atoms for frame in other])
+
+
+class AtomsMismatchError(Exception):
+    pass
@@ -4,6 +4,7 @@
 Read, write Lammps trajectory in xyz format.
 """
 import os
+import numpy as np
 
 
 def read_trajectory(traj_path):
@@ -33,6 +34,85 @@ def read_trajectory(traj_path):
     return trajectory
 
 
+def index_trajectory(traj_path, index_path=None, chunk_size=2 ** 22):
+    """ Find byte offset of each frame in xyz trajectory in a single pass.
+    The index is saved next to the trajectory file and reused as long as the trajectory is not modified.
+
+    Args:
+        - traj_path (str): xyz trajectory path to index
+        - index_path (str): Index file path (default: None -> <traj_path>.idx.npz)
+        - chunk_size (int): Number of bytes read at a time
+
+    Returns:
+        - dict: Trajectory index with offsets (byte offset of each frame and end of file) and n_atoms keys
+    """
+    if index_path is None:
+        index_path = '%s.idx.npz' % traj_path
+    stat = os.stat(traj_path)
+    if os.path.exists(index_path):
+        with np.load(index_path) as idx:
+            if int(idx['size']) == stat.st_size and int(idx['mtime']) == stat.st_mtime_ns:
+                return dict(offsets=idx['offsets'], n_atoms=int(idx['n_atoms']))
+    with open(traj_path, 'rb') as traj:
+        n_atoms = int(traj.readline().strip())
+        traj.seek(0)
+        newlines, position, chunk = [], 0, b''
+        for chunk in iter(lambda: traj.read(chunk_size), b''):
+            newlines.append(np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord('\n')) + position)
+            position += len(chunk)
+    if not chunk.endswith(b'\n'):
+        newlines.append(np.array([position]))     # Last line without newline character
+    newlines = np.concatenate(newlines)
+    frame_lines = n_atoms + 2
+    n_frames = int(len(newlines) / frame_lines)           # Assuming n_atoms is constant
+    # Frame i starts after the last newline of frame i - 1
+    offsets = np.concatenate([[0], newlines[frame_lines - 1::frame_lines][:n_frames] + 1]).astype(np.int64)
+    try:
+        np.savez(index_path, offsets=offsets, n_atoms=n_atoms, size=stat.st_size, mtime=stat.st_mtime_ns)
+    except OSError:
+        pass
+    return dict(offsets=offsets, n_atoms=n_atoms)
+
+
+def read_frames(traj_path, frames, atoms=None, index=None):
+    """ Read selected frames and atoms from xyz trajectory by seeking to the start of each frame
+
+    Args:
+        - traj_path (str): xyz trajectory path to read
+        - frames (list): List of frames to read
+        - atoms (list): List of atoms to read (default: None -> all atoms, negative indices count from the last atom)
+        - index (dict): Trajectory index (default: None -> see index_trajectory)
+
+    Returns:
+        - dict: Trajectory dictionary with atoms, coordinates, timestep and xyz keys
+                (xyz lines are only included when all atoms are read)
+    """
+    if index is None:
+        index = index_trajectory(traj_path)
+    offsets = index['offsets']
+    if atoms is not None:
+        if any([atom < -index['n_atoms'] or atom >= index['n_atoms'] for atom in atoms]):
+            raise IndexError('Atom index out of range for %i atoms' % index['n_atoms'])
+        atoms = [atom % index['n_atoms'] for atom in atoms]
+    trajectory = {'atoms': [], 'coordinates': np.zeros((len(frames), index['n_atoms'] if atoms is None else len(atoms), 3)),
+                  'xyz': [], 'timestep': []}
+    with open(traj_path, 'rb') as traj:
+        for frame_idx, frame in enumerate(frames):
+            traj.seek(offsets[frame])
+            frame_lines = traj.read(offsets[frame + 1] - offsets[frame]).decode().splitlines(keepends=True)
+            if atoms is None:
+                atom_lines = frame_lines[2:]
+                trajectory['xyz'].append(frame_lines)
+            else:
+                atom_lines = [frame_lines[atom + 2] for atom in atoms]
+            trajectory['timestep'].append(frame_lines[1].strip().split()[2])
+            trajectory['atoms'].append([line.split(None, 1)[0] for line in atom_lines])
+            trajectory['coordinates'][frame_idx] = np.loadtxt(atom_lines, usecols=(1, 2, 3), ndmin=2)
+    if atoms is not None:
+        del trajectory['xyz']
+    return trajectory
+
+
 def write_trajectory(trajectory_xyz, traj_path, frames=None):
     """ Write xyz trajectory to a file
 
@@ -5,6 +5,7 @@ Mean squared displacement calculation for Lammps trajectory.
 """
 import numpy as np
 import periodictable
+from .binary import FrameAtoms
 
 
 def center_of_mass(atoms, coordinates):
@@ -67,40 +68,147 @@ def time_avg_squared_displacement(coordinates, normalize=True, reference_frame=0
     return np.sum(coor ** 2, axis=0) / len(coor)
 
 
-def calculate_distances(coordinates, unit_cell, reference_frame=0):
+def calculate_distances(coordinates, unit_cell, reference_frame=0, chunk_size=None):
     """
     Calculate distance of each atom from it's reference position for each frame in the coordinates (3D list).
-    ---------- ORTHORHOMBIC ONLY ----------
+    Displacements are wrapped with minimum image convention by a single cell shift in each direction.
 
     Args:
         - coordinates (list): A list of frames containing coordinates for multiple/single atom(s)
-        - unit_cell (list): Orthorhombic unit cell dimensions
+        - unit_cell (list): Orthorhombic unit cell dimensions or 3x3 cell matrix (rows are cell vectors) for triclinic cells
         - reference_frame (int): Reference frame to calculate the distances from
+        - chunk_size (int): Number of frames processed at a time to limit memory usage (default: None -> all frames)
 
     Returns:
-        - list: Distance of each atom in each frame to it's position in the reference frame
+        - ndarray: Distance of each atom in each frame to it's position in the reference frame
     """
     if len(np.shape(coordinates)) != 3:
         raise CoordinatesDimensionError('Coordinates list must be 3 dimensional with shape: (n_frames, n_atoms, axis)')
     n_frames, n_atoms = np.shape(coordinates)[:2]
-    ref_coordinates = coordinates[reference_frame]
+    ref_coordinates = np.asarray(coordinates[reference_frame], dtype=float)
+    if chunk_size is None:
+        chunk_size = max(n_frames, 1)
     distances = np.zeros((n_frames, n_atoms))
-    for frame_idx, frame in enumerate(coordinates):
-        for atom_idx, (atom, ref_atom) in enumerate(zip(frame, ref_coordinates)):
-            d = [0, 0, 0]
-            for i in range(3):
-                d[i] = atom[i] - ref_atom[i]
-                if d[i] > unit_cell[i] * 0.5:
-                    d[i] = d[i] - unit_cell[i]
-                elif d[i] <= -unit_cell[i] * 0.5:
-                    d[i] = d[i] + unit_cell[i]
-            distances[frame_idx][atom_idx] = np.sqrt((d[0] ** 2 + d[1] ** 2 + d[2] ** 2))
+    for start in range(0, n_frames, chunk_size):
+        d = minimum_image(np.asarray(coordinates[start:start + chunk_size], dtype=float) - ref_coordinates, unit_cell)
+        distances[start:start + chunk_size] = np.sqrt(d[..., 0] ** 2 + d[..., 1] ** 2 + d[..., 2] ** 2)
     return distances
 
 
+def minimum_image(d, unit_cell):
+    """
+    Apply minimum image convention to displacements for orthorhombic or triclinic cells.
+    Triclinic displacements are wrapped in fractional coordinates.
+
+    Args:
+        - d (ndarray): Displacements with last axis of size 3
+        - unit_cell (list): Orthorhombic unit cell dimensions or 3x3 cell matrix (rows are cell vectors)
+
+    Returns:
+        - ndarray: Wrapped displacements
+    """
+    cell = np.asarray(unit_cell, dtype=float)
+    if np.shape(cell) == (3, 3):
+        return wrap_displacements(d @ np.linalg.inv(cell), np.ones(3)) @ cell
+    elif np.shape(cell) == (3, ):
+        return wrap_displacements(d, cell)
+    else:
+        raise CellDimensionError('Unit cell must be a list of 3 dimensions or a 3x3 cell matrix')
+
+
+def wrap_displacements(d, cell):
+    """
+    Wrap displacements into the unit cell by shifting one cell length in each direction (minimum image convention).
+
+    Args:
+        - d (ndarray): Displacements with last axis of size 3
+        - cell (ndarray): Cell length in each direction
+
+    Returns:
+        - ndarray: Wrapped displacements
+    """
+    d = np.where(d > cell * 0.5, d - cell, d)
+    return np.where(d <= -cell * 0.5, d + cell, d)
+
+
+def unwrap_coordinates(coordinates, unit_cell):
+    """
+    Remove periodic jumps from coordinates by accumulating minimum image displacements between consecutive frames.
+    Atoms are assumed to move less than half a cell length between frames.
+
+    Args:
+        - coordinates (ndarray): Coordinates with shape (n_frames, n_atoms, 3)
+        - unit_cell (list): Orthorhombic unit cell dimensions or 3x3 cell matrix (rows are cell vectors)
+
+    Returns:
+        - ndarray: Unwrapped coordinates
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    steps = minimum_image(np.diff(coordinates, axis=0), unit_cell)
+    return np.concatenate([coordinates[:1], coordinates[:1] + np.cumsum(steps, axis=0)])
+
+
+def msd_fft(coordinates):
+    """
+    Calculate mean squared displacement averaged over all time origins for each atom using FFT autocorrelation.
+    MSD(m) = S1(m) - 2 * S2(m) where S2 is the position autocorrelation and S1 is calculated recursively
+    from squared positions (O(N log N) per atom).
+
+    Args:
+        - coordinates (ndarray): Unwrapped coordinates with shape (n_frames, n_atoms, 3)
+
+    Returns:
+        - ndarray: MSD for each time lag (in frames) and atom with shape (n_frames, n_atoms)
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    n_frames = len(coordinates)
+    lag_count = (n_frames - np.arange(n_frames))[:, np.newaxis]
+    # S2: Autocorrelation of positions summed over dimensions (zero padded to avoid circular correlation)
+    f = np.fft.rfft(coordinates, n=2 * n_frames, axis=0)
+    s2 = np.fft.irfft(np.sum(f * f.conjugate(), axis=2).real, n=2 * n_frames, axis=0)[:n_frames] / lag_count
+    # S1: Sum of squared positions excluding first m and last m frames
+    d = np.sum(np.square(coordinates), axis=2)
+    zero = np.zeros((1, d.shape[1]))
+    head = np.concatenate([zero, np.cumsum(d, axis=0)])[:n_frames]
+    tail = np.concatenate([zero, np.cumsum(d[::-1], axis=0)])[:n_frames]
+    s1 = (2 * np.sum(d, axis=0) - head - tail) / lag_count
+    return s1 - 2 * s2
+
+
+def calculate_msd(coordinates, unit_cell=None, groups=None, chunk_size=1000):
+    """
+    Calculate mean squared displacement vs time lag averaged over all time origins and atoms.
+
+    Args:
+        - coordinates (list): Coordinates with shape (n_frames, n_atoms, 3)
+        - unit_cell (list): Unit cell used to unwrap periodic jumps (default: None -> coordinates are already unwrapped)
+        - groups (dict): Atom groups to average separately (ex: {'box1': [0, 1, 2], 'box2': [3, 4, 5]})
+        - chunk_size (int): Number of atoms processed at a time to limit memory usage
+
+    Returns:
+        - ndarray / dict: MSD for each time lag (in frames), or dictionary of MSD for each group if groups are given
+    """
+    coordinates = np.asarray(coordinates)
+    if coordinates.ndim != 3:
+        raise CoordinatesDimensionError('Coordinates list must be 3 dimensional with shape: (n_frames, n_atoms, axis)')
+    if groups is None:
+        return calculate_msd(coordinates, unit_cell, {'all': list(range(coordinates.shape[1]))}, chunk_size)['all']
+    msd = {}
+    for group, atoms in groups.items():
+        msd_sum = np.zeros(coordinates.shape[0])
+        for start in range(0, len(atoms), chunk_size):
+            chunk = np.take(coordinates, atoms[start:start + chunk_size], axis=1).astype(float)
+            if unit_cell is not None:
+                chunk = unwrap_coordinates(chunk, unit_cell)
+            msd_sum += np.sum(msd_fft(chunk), axis=1)
+        msd[group] = msd_sum / len(atoms)
+    return msd
+
+
 def subdivide_coordinates(coordinates, frames, atoms, dimensions):
     """
     Subdivide coordinates by selecting frames, atoms and dimensions.
+    Selections that are evenly spaced (or None) are applied as slices and return views of the coordinates array.
 
     Args:
         - coordinates (list): Trajectory coordinates to be subdivided
@@ -109,27 +217,42 @@ def subdivide_coordinates(coordinates, frames, atoms, dimensions):
         - dimensions (list): List of dimensions to be included in the subdivision
 
     Returns:
-        - list: 3D list of coordinates subdivision
+        - ndarray: 3D array of coordinates subdivision
     """
-    traj_shape = np.shape(coordinates)
-    if len(traj_shape) != 3:
+    coordinates = np.asarray(coordinates)
+    if coordinates.ndim != 3:
         raise CoordinatesDimensionError('Coordinates list must be 3 dimensional with shape: (n_frames, n_atoms, axis)')
-
-    if frames is None:
-        frames = list(range(traj_shape[0]))
-    if atoms is None:
-        atoms = list(range(traj_shape[1]))
-    if dimensions is None:
-        dimensions = list(range(traj_shape[2]))
-
-    div_coordinates = np.zeros((len(frames), len(atoms), len(dimensions)))
-    for frame_idx, frame in enumerate(frames):
-        for atom_idx, atom in enumerate(atoms):
-            for dim_idx, dim in enumerate(dimensions):
-                div_coordinates[frame_idx][atom_idx][dim_idx] = coordinates[frame][atom][dim]
+    selection = [get_index(i, n) for i, n in zip([frames, atoms, dimensions], coordinates.shape)]
+    div_coordinates = coordinates[tuple([i if isinstance(i, slice) else slice(None) for i in selection])]
+    for axis, index in enumerate(selection):
+        if not isinstance(index, slice):
+            div_coordinates = np.take(div_coordinates, index, axis=axis)
     return div_coordinates
 
 
+def get_index(selection, size):
+    """
+    Convert list of indices to a slice if indices are evenly increasing, otherwise to an integer array.
+
+    Args:
+        - selection (list): List of indices (None selects all)
+        - size (int): Size of the axis
+
+    Returns:
+        - slice / ndarray: Index for the axis
+    """
+    if selection is None:
+        return slice(None)
+    index = np.asarray(selection, dtype=int).reshape(-1)
+    index = np.where(index < 0, index + size, index)
+    if len(index) == 0:
+        return slice(0, 0)
+    step = index[1] - index[0] if len(index) > 1 else 1
+    if step > 0 and index[0] >= 0 and index[-1] < size and np.all(np.diff(index) == step):
+        return slice(int(index[0]), int(index[-1]) + 1, int(step))
+    return index
+
+
 def subdivide_atoms(traj_atoms, frames, atoms):
     """
     Subdivide coordinates by selecting frames, atoms and dimensions.
@@ -142,19 +265,19 @@ def subdivide_atoms(traj_atoms, frames, atoms):
     Returns:
         - list: 2D list of atoms subdivision
     """
-    traj_shape = np.shape(traj_atoms)
     if frames is None:
-        frames = list(range(traj_shape[0]))
+        frames = range(len(traj_atoms))
+    if isinstance(traj_atoms, FrameAtoms):
+        frame_atoms = traj_atoms.atoms if atoms is None else [traj_atoms.atoms[atom] for atom in atoms]
+        return FrameAtoms(frame_atoms, len(frames))
     if atoms is None:
-        atoms = list(range(traj_shape[1]))
-
-    div_atoms = []
-    for frame_idx, frame in enumerate(frames):
-        div_atoms.append([])
-        for atom in atoms:
-            div_atoms[frame_idx].append(traj_atoms[frame][atom])
-    return div_atoms
+        return [list(traj_atoms[frame]) for frame in frames]
+    return [[traj_atoms[frame][atom] for atom in atoms] for frame in frames]
 
 
 class CoordinatesDimensionError(Exception):
     pass
+
+
+class CellDimensionError(Exception):
+    pass
@@ -4,20 +4,23 @@
 Read, manipulate and analyze Lammps trajectory output files of thermal conductivity measurements
 """
 import numpy as np
-from .io import read_trajectory, write_trajectory, generate_xyz
-from .tools import center_of_mass, calculate_distances, subdivide_coordinates, subdivide_atoms
+from .io import read_trajectory, write_trajectory, generate_xyz, index_trajectory, read_frames
+from .binary import convert_trajectory, read_binary_trajectory, is_binary_trajectory, FrameAtoms
+from .tools import center_of_mass, calculate_distances, calculate_msd, subdivide_coordinates, subdivide_atoms
 
 
 class Trajectory:
     """
     Reading and analyzing Lammps simulation trajectories in xyz format
     """
-    def __init__(self, read=None):
+    def __init__(self, read=None, lazy=False):
         """
         Create a trajectory object.
+        If lazy is True only the frame index of the xyz trajectory is read and frames are read when requested.
         """
+        self.lazy = False
         if read is not None:
-            self.read(read)
+            self.read(read, lazy=lazy)
 
     def __repr__(self):
         """
@@ -37,41 +40,115 @@ class Trajectory:
         """
         return self.n_frames
 
+    def __getitem__(self, frames):
+        """
+        Returns coordinates for a single frame (int) or a new trajectory for selected frames (slice or list).
+
+        Examples:
+
+            >>> traj = Trajectory(read='traj.xyz', lazy=True)
+            >>> traj[1000:2000:10]
+            <Trajectory atoms: 3584 | frames: 100 | dimensions: 3>
+        """
+        if isinstance(frames, (int, np.integer)):
+            frame = range(self.n_frames)[frames]
+            if self.lazy:
+                return read_frames(self.path, [frame], index=self.index)['coordinates'][0]
+            return np.asarray(self.coordinates[frame])
+        if isinstance(frames, slice):
+            frames = range(self.n_frames)[frames]
+        return self.subdivide(frames=list(frames))
+
+    def __iter__(self):
+        """
+        Iterate coordinates of each frame.
+        """
+        for frame in range(self.n_frames):
+            yield self[frame]
+
     def __eq__(self, other):
+        """
+        Compare atoms and coordinates one chunk of frames at a time (see frame_chunks) so that lazy and
+        memory mapped trajectories are not read into memory.
+        """
         if isinstance(other, self.__class__):
-            check1 = (self.n_frames, self.n_atoms, self.n_dimensions) == (other.n_frames, other.n_atoms, other.n_dimensions)
-            check2 = np.allclose(self.coordinates, other.coordinates) and self.atoms == other.atoms
-            return check1 and check2
+            if (self.n_frames, self.n_atoms, self.n_dimensions) != (other.n_frames, other.n_atoms, other.n_dimensions):
+                return False
+            for (start, atoms, coordinates), (_, other_atoms, other_coordinates) in zip(self.frame_chunks(),
+                                                                                     other.frame_chunks()):
+                if not np.allclose(coordinates, other_coordinates):
+                    return False
+                if [list(frame) for frame in atoms] != [list(frame) for frame in other_atoms]:
+                    return False
+            return True
         else:
             return False
 
-    def read(self, traj_path):
+    def read(self, traj_path, lazy=False):
         """
-        Read xyz trajectory file.
+        Read xyz trajectory file or binary trajectory directory (see convert method).
+        Coordinates of binary trajectories are memory mapped and read from disk only when accessed.
 
         Args:
-            - traj_path (str): xyz trajectory file path to read
+            - traj_path (str): xyz trajectory file path or binary trajectory directory to read
+            - lazy (bool): Only index frames of xyz trajectory (see index_trajectory), frames are read when
+                           selected by indexing, subdivide or iteration
 
         Returns:
             - None: Assigns path, xyz, timestep, atoms, coordinates, n_frames, n_atoms variables
         """
-        traj = read_trajectory(traj_path)
+        if lazy and not is_binary_trajectory(traj_path):
+            self.lazy = True
+            self.path = traj_path
+            self.index = index_trajectory(traj_path)
+            self.n_frames, self.n_atoms, self.n_dimensions = len(self.index['offsets']) - 1, self.index['n_atoms'], 3
+            return None
+        self.lazy = False
+        if is_binary_trajectory(traj_path):
+            traj = read_binary_trajectory(traj_path)
+        else:
+            traj = read_trajectory(traj_path)
+            self.xyz = traj['xyz']
         self.path = traj_path
-        self.xyz = traj['xyz']
         self.timestep = traj['timestep']
         self.atoms = traj['atoms']
         self.coordinates = traj['coordinates']
         self.n_frames, self.n_atoms, self.n_dimensions = np.shape(traj['coordinates'])
 
+    def convert(self, binary_path=None, dtype='float32'):
+        """
+        Convert xyz trajectory file to binary trajectory and read it with memory mapping.
+
+        Args:
+            - binary_path (str): Binary trajectory directory to write (default: None -> <traj_path>.bin)
+            - dtype (str): Data type for coordinates ('float32' or 'float64')
+
+        Returns:
+            - str: Binary trajectory directory
+        """
+        binary_path = convert_trajectory(self.path, binary_path=binary_path, dtype=dtype)
+        if hasattr(self, 'xyz'):
+            del self.xyz
+        self.read(binary_path)
+        return binary_path
+
     def write(self, traj_path, frames=None):
         """
         Write xyz trajectory file.
         """
-        write_trajectory(self.xyz, traj_path, frames)
+        if self.lazy:
+            frames = list(range(self.n_frames)) if frames is None else frames
+            write_trajectory(read_frames(self.path, frames, index=self.index)['xyz'], traj_path)
+        elif hasattr(self, 'xyz'):
+            write_trajectory(self.xyz, traj_path, frames)
+        else:
+            write_trajectory(generate_xyz(self.coordinates, self.atoms), traj_path, frames)
 
     def stretch(self, n_repeat, write=None):
         """
         Repeats each frame a given number of time.
+        Frame lines are read from the xyz file for lazy trajectories and generated from coordinates for
+        binary trajectories.
 
         Args:
             - n_repeat (int): Repeat each frame <n_repeat> number of times
@@ -80,8 +157,14 @@ class Trajectory:
         Returns:
             - list: List of lines for each frame of the stretched xyz trajectory
         """
+        if self.lazy:
+            trajectory_xyz = read_frames(self.path, list(range(self.n_frames)), index=self.index)['xyz']
+        elif hasattr(self, 'xyz'):
+            trajectory_xyz = self.xyz
+        else:
+            trajectory_xyz = generate_xyz(self.coordinates, self.atoms)
         xyz_stretch = []
-        for xyz in self.xyz:
+        for xyz in trajectory_xyz:
             for r in range(n_repeat):
                 xyz_stretch.append(xyz)
         if write is not None:
@@ -98,6 +181,8 @@ class Trajectory:
     def change_atoms(self, atom_map):
         """
         Changes atom names in trajectory (both self.atoms and self.xyz).
+        Only atom names are changed for binary trajectories (xyz lines are generated from coordinates when written).
+        Lazy trajectories must be read into memory first as atom names are read from the xyz file.
 
         Args:
             - atom_map (dict): Keys are atoms to be changed and values are new atoms (ex: {'1': 'C', '2': 'O'})
@@ -105,6 +190,11 @@ class Trajectory:
         Returns:
             - None (changes self.xyz and self.atoms to new atoms)
         """
+        if self.lazy:
+            raise LazyTrajectoryError('Atoms of lazy trajectory can not be changed, read with lazy=False')
+        if isinstance(self.atoms, FrameAtoms):
+            self.atoms = FrameAtoms([atom_map[atom] for atom in self.atoms.atoms], self.n_frames)
+            return None
         new_atoms = []
         for frame in self.atoms:
             frame_atoms = []
@@ -132,21 +222,40 @@ class Trajectory:
             >>> traj_div = traj.subdivide(atoms=list(range(5)), frames=[0], dimensions=[1])
             <Trajectory | frames: 1 | atoms: 5 | dimensions: 1>
         """
+        if self.lazy:
+            return self.subdivide_lazy(frames=frames, atoms=atoms, dimensions=dimensions)
         div_coor = subdivide_coordinates(self.coordinates, frames, atoms, dimensions)
         div_traj = Trajectory()
         div_traj.coordinates = div_coor
         div_traj.n_frames, div_traj.n_atoms, div_traj.n_dimensions = np.shape(div_coor)
         div_traj.atoms = subdivide_atoms(self.atoms, frames, atoms)
         if frames is None:
-            frames = list(range(self.n_frames))
+            frames = range(self.n_frames)
         if hasattr(self, 'timestep'):
-            div_traj.timestep = [ts for i, ts in enumerate(self.timestep) if i in frames]
+            div_traj.timestep = [self.timestep[i] for i in frames]
         if hasattr(self, 'xyz'):
-            div_traj.xyz = [xyz for i, xyz in enumerate(self.xyz) if i in frames]
+            div_traj.xyz = [self.xyz[i] for i in frames]      # Frame lines are shared with this trajectory
         if hasattr(self, 'path'):
             div_traj.path = self.path
         return div_traj
 
+    def subdivide_lazy(self, frames=None, atoms=None, dimensions=None):
+        """
+        Subdivide lazy trajectory by reading only selected frames from the xyz file (see subdivide).
+        """
+        if frames is None:
+            frames = list(range(self.n_frames))
+        frame_data = read_frames(self.path, frames, atoms=atoms, index=self.index)
+        div_coor = subdivide_coordinates(frame_data['coordinates'], None, None, dimensions)
+        div_traj = Trajectory()
+        div_traj.coordinates = div_coor
+        div_traj.n_frames, div_traj.n_atoms, div_traj.n_dimensions = np.shape(div_coor)
+        div_traj.atoms, div_traj.timestep = frame_data['atoms'], frame_data['timestep']
+        if 'xyz' in frame_data:
+            div_traj.xyz = frame_data['xyz']
+        div_traj.path = self.path
+        return div_traj
+
     def set_coordinates(self, coordinates):
         """
         Initialize Trajectory by setting coordinates.
@@ -164,34 +273,68 @@ class Trajectory:
         Set unit cell dimensions for the trajectory.
 
         Args:
-            - unit_cell (list): Unit cell dimensions for periodic boundary conditions (ORTHORHOMBIC ONLY)
+            - unit_cell (list): Orthorhombic unit cell dimensions or 3x3 cell matrix for periodic boundary conditions
 
         Returns:
             - None (assigns cell dimensons to self.cell)
         """
-        if len(unit_cell) == 3:
+        if np.shape(unit_cell) in [(3, ), (3, 3)]:
             self.cell = unit_cell
         else:
-            print('List dimension for the cell must be 3')
+            print('List dimension for the cell must be 3 or 3x3')
+
+    def frame_chunks(self, chunk_size=1000):
+        """
+        Iterate frames in chunks. Frames of lazy trajectories are read from the xyz file one chunk at a time.
+
+        Args:
+            - chunk_size (int): Number of frames in each chunk
 
-    def calculate_com(self):
+        Returns:
+            - generator: Index of the first frame, atoms and coordinates for each chunk
+        """
+        for start in range(0, self.n_frames, chunk_size):
+            frames = list(range(start, min(start + chunk_size, self.n_frames)))
+            if self.lazy:
+                frame_data = read_frames(self.path, frames, index=self.index)
+                yield start, frame_data['atoms'], frame_data['coordinates']
+            else:
+                yield start, self.atoms[start:frames[-1] + 1], self.coordinates[start:frames[-1] + 1]
+
+    def calculate_com(self, chunk_size=1000):
         """
         Get center of mass coordinates for the trajectory.
+
+        Args:
+            - chunk_size (int): Number of frames read at a time for lazy trajectories
         """
-        self.com = [center_of_mass(fa, fc) for fa, fc in zip(self.atoms, self.coordinates)]
+        if self.lazy:
+            self.com = [center_of_mass(fa, fc) for start, atoms, coordinates in self.frame_chunks(chunk_size)
+                        for fa, fc in zip(atoms, coordinates)]
+        else:
+            self.com = [center_of_mass(fa, fc) for fa, fc in zip(self.atoms, self.coordinates)]
 
-    def calculate_distances(self, reference_frame=0):
+    def calculate_distances(self, reference_frame=0, chunk_size=None):
         """
         Calculate distance of each atom from it's reference position for each frame in the trajectory.
-        ---------- ORTHORHOMBIC ONLY ----------
 
         Args:
             - reference_frame (int): Reference frame to calculate the distances from
+            - chunk_size (int): Number of frames processed at a time (default: None -> all frames, 1000 for lazy
+                                trajectories)
 
         Returns:
             - None (assigns distances to self.distances as a numpy array)
         """
-        self.distances = calculate_distances(self.coordinates, self.cell, reference_frame=reference_frame)
+        if self.lazy:
+            reference = self[reference_frame][np.newaxis]
+            self.distances = np.zeros((self.n_frames, self.n_atoms))
+            for start, atoms, coordinates in self.frame_chunks(1000 if chunk_size is None else chunk_size):
+                chunk = np.concatenate([reference, coordinates])
+                self.distances[start:start + len(coordinates)] = calculate_distances(chunk, self.cell)[1:]
+        else:
+            self.distances = calculate_distances(self.coordinates, self.cell, reference_frame=reference_frame,
+                                                 chunk_size=chunk_size)
 
     def calculate_mean_disp(self, reference_frame=0):
         """
@@ -208,13 +351,7 @@ class Trajectory:
                 self.calculate_distances(reference_frame=reference_frame)
             else:
                 print('Please define simulation cell size and calculate distances')
-        n_frames, n_atoms = np.shape(self.distances)
-        self.mean_disp = np.zeros((n_atoms, ))
-        for atom in range(n_atoms):
-            d_sum = 0
-            for frame in range(n_frames):
-                d_sum += self.distances[frame][atom]
-            self.mean_disp[atom] = d_sum / n_frames
+        self.mean_disp = np.sum(self.distances, axis=0) / len(self.distances)
 
     def calculate_mean_squared_disp(self, reference_frame=0):
         """
@@ -231,10 +368,41 @@ class Trajectory:
                 self.calculate_distances(reference_frame=reference_frame)
             else:
                 print('Please define simulation cell size and calculate distances')
-        n_frames, n_atoms = np.shape(self.distances)
-        self.mean_squared_disp = np.zeros((n_atoms, ))
-        for atom in range(n_atoms):
-            d_sum = 0
-            for frame in range(n_frames):
-                d_sum += self.distances[frame][atom] ** 2
-            self.mean_squared_disp[atom] = d_sum / n_frames
+        self.mean_squared_disp = np.sum(np.square(self.distances), axis=0) / len(self.distances)
+
+    def calculate_msd(self, groups=None, unwrap=True, chunk_size=1000):
+        """
+        Calculate mean squared displacement MSD(t) averaged over all time origins using FFT autocorrelation.
+        Unlike calculate_mean_squared_disp every frame is used as a time origin, so for lazy trajectories
+        all frames are read from the xyz file for one chunk of atoms at a time.
+
+        Args:
+            - groups (dict): Atom groups to average separately (ex: {'box1': [0, 1], 'box2': [2, 3]})
+            - unwrap (bool): Remove periodic jumps using self.cell before calculating MSD
+            - chunk_size (int): Number of atoms processed (and read for lazy trajectories) at a time
+
+        Returns:
+            - None (assigns MSD for each time lag in frames to self.msd as a numpy array, or a dictionary for groups)
+        """
+        unit_cell = None
+        if unwrap:
+            if hasattr(self, 'cell'):
+                unit_cell = self.cell
+            else:
+                print('Simulation cell is not defined, coordinates are not unwrapped')
+        if self.lazy:
+            msd, frames = {}, list(range(self.n_frames))
+            for group, atoms in ({'all': list(range(self.n_atoms))} if groups is None else groups).items():
+                msd_sum = np.zeros(self.n_frames)
+                for start in range(0, len(atoms), chunk_size):
+                    chunk = atoms[start:start + chunk_size]
+                    coordinates = read_frames(self.path, frames, atoms=chunk, index=self.index)['coordinates']
+                    msd_sum += calculate_msd(coordinates, unit_cell=unit_cell, chunk_size=chunk_size) * len(chunk)
+                msd[group] = msd_sum / len(atoms)
+            self.msd = msd['all'] if groups is None else msd
+        else:
+            self.msd = calculate_msd(self.coordinates, unit_cell=unit_cell, groups=groups, chunk_size=chunk_size)
+
+
+class LazyTrajectoryError(Exception):
+    pass